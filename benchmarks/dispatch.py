@@ -0,0 +1,121 @@
+"""Per-request overhead of the compiled dispatch compared with the baseline.
+
+The baseline is the frozen request path of ``benchmarks.frozen``: the
+parsers and the render the compiled dispatch replaced, not the current
+ones, so the speedup includes the parser and render changes as well.
+
+Usage: python -m benchmarks.dispatch [--number N]
+"""
+import argparse
+import asyncio
+import time
+from typing import Tuple
+
+import ujson
+from marshmallow import Schema, fields
+from starlette.requests import Request
+
+from star_resty import Method, json_payload, path, query
+from . import frozen
+
+
+class PathParams(Schema):
+    id = fields.Integer(required=True)
+
+
+class QueryParams(Schema):
+    q = fields.String()
+    limit = fields.Integer()
+
+
+class BodySchema(Schema):
+    name = fields.String()
+    email = fields.String()
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    email = fields.String()
+
+
+class Empty(Method):
+    serializer = None
+
+    async def execute(self):
+        return None
+
+
+class NoParams(Method):
+    async def execute(self):
+        return {'id': 1}
+
+
+class Params(Method):
+    response_schema = ItemSchema
+
+    async def execute(self, user: path(PathParams), params: query(QueryParams),
+                      body: json_payload(BodySchema)):
+        return {'id': user['id'], **body}
+
+
+def create_request(query_string=b'', body=b''):
+    scope = {
+        'type': 'http',
+        'method': 'POST',
+        'path': '/users/1',
+        'query_string': query_string,
+        'headers': [(b'content-type', b'application/json')],
+        'path_params': {'id': '1'},
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    return scope, receive
+
+
+def compiled(cls):
+    async def handle(request):
+        return await cls.__dispatch__(cls(request))
+
+    return handle
+
+
+async def measure(handle, scope, receive, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        await handle(Request(scope, receive))
+    return (time.perf_counter() - start) / number
+
+
+async def best_of(baseline, handle, scope, receive, number: int, repeat: int = 7) -> Tuple[float, float]:
+    """Best times of both handlers, measured in turns to spread the drift of the machine evenly."""
+    base, fast = [], []
+    for _ in range(repeat):
+        base.append(await measure(baseline, scope, receive, number))
+        fast.append(await measure(handle, scope, receive, number))
+    return min(base), min(fast)
+
+
+async def main(number: int):
+    body = ujson.dumps({'name': 'Name', 'email': 'email@mail.com'}).encode('utf-8')
+    cases = (
+        ('no params, no serializer', Empty, create_request()),
+        ('no params, no schema', NoParams, create_request()),
+        ('path+query+json, schema', Params, create_request(b'q=test&limit=10', body)),
+    )
+    print(f'{"endpoint":<28} {"baseline, us":>12} {"compiled, us":>13} {"speedup":>8}')
+    for name, cls, (scope, receive) in cases:
+        baseline, handle = frozen.endpoint(cls), compiled(cls)
+        await measure(baseline, scope, receive, number // 10)
+        await measure(handle, scope, receive, number // 10)
+        base, fast = await best_of(baseline, handle, scope, receive, number // 5)
+        print(f'{name:<28} {base * 1e6:>12.2f} {fast * 1e6:>13.2f} {base / fast:>7.2f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(main(args.number))
@@ -0,0 +1,82 @@
+"""Compare marshmallow ``Schema.dump`` with the compiled dumper.
+
+Usage: python -m benchmarks.dumper [--number N]
+"""
+import argparse
+import timeit
+from dataclasses import dataclass
+from typing import List
+
+from marshmallow import Schema, fields
+
+from star_resty.method.dumper import compile_dumper
+
+
+class OwnerSchema(Schema):
+    id = fields.Integer()
+    email = fields.String()
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    price = fields.Float()
+    available = fields.Boolean()
+    tags = fields.List(fields.String())
+    owner = fields.Nested(OwnerSchema)
+
+
+class ItemsSchema(Schema):
+    items = fields.List(fields.Nested(ItemSchema))
+
+
+@dataclass
+class Owner:
+    id: int
+    email: str
+
+
+@dataclass
+class Item:
+    id: int
+    name: str
+    price: float
+    available: bool
+    tags: List[str]
+    owner: Owner
+
+
+def create_payloads():
+    item = {
+        'id': 12345,
+        'name': 'Название товара',
+        'price': 1234.56,
+        'available': True,
+        'tags': ['new', 'sale', 'popular'],
+        'owner': {'id': 1, 'email': 'email@mail.com'},
+    }
+    obj = Item(12345, 'name', 1234.56, True, ['new', 'sale'], Owner(1, 'email@mail.com'))
+    return (
+        ('dict item', ItemSchema(), item, 1),
+        ('dataclass item', ItemSchema(), obj, 1),
+        ('1000 dict items', ItemsSchema(), {'items': [dict(item, id=i) for i in range(1000)]}, 1000),
+        ('1000 dataclass items', ItemsSchema(), {'items': [obj] * 1000}, 1000),
+    )
+
+
+def main(number: int):
+    print(f'{"payload":<22} {"marshmallow, us":>16} {"compiled, us":>13} {"speedup":>8}')
+    for name, schema, payload, size in create_payloads():
+        n = max(1, number // size)
+        dump = compile_dumper(schema)
+        assert dump(payload) == schema.dump(payload)
+        generic = min(timeit.repeat(lambda: schema.dump(payload), number=n, repeat=5)) / n
+        compiled = min(timeit.repeat(lambda: dump(payload), number=n, repeat=5)) / n
+        print(f'{name:<22} {generic * 1e6:>16.2f} {compiled * 1e6:>13.2f} {generic / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10000)
+    args = parser.parse_args()
+    main(args.number)
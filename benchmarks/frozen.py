@@ -0,0 +1,173 @@
+"""Frozen copy of the request path of star_resty before the compiled dispatch.
+
+The parser, the payload parsers and the render are copied from the first
+release of the tree, so benchmarks compare the current dispatch with the
+code it replaced rather than with the current parsers and renders. Only
+path, query and json parameters are supported.
+"""
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import ujson
+from marshmallow import EXCLUDE, Schema
+from marshmallow.exceptions import MarshmallowError
+from starlette.requests import Request
+from starlette.responses import Response
+
+from star_resty.exceptions import DecodeError, DumpError
+from star_resty.payload.query import iter_query_fields
+
+__all__ = ('endpoint',)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestParser:
+    __slots__ = ('_parsers', '_async_parsers')
+
+    def __init__(self, parsers: Sequence[Tuple[str, Any]] = (), async_parsers: Sequence[Tuple[str, Any]] = ()):
+        self._parsers = parsers
+        self._async_parsers = async_parsers
+
+    async def parse(self, request: Request) -> Dict:
+        params = {}
+        for (key, p) in self._parsers:
+            params[key] = p.parse(request)
+
+        for (key, p) in self._async_parsers:
+            params[key] = await p.parse(request)
+
+        return params
+
+
+class PathParser:
+    __slots__ = ('schema', 'unknown')
+
+    def __init__(self, schema: Schema, unknown=EXCLUDE):
+        self.schema = schema
+        self.unknown = unknown
+
+    def parse(self, request: Request):
+        return self.schema.load(request.path_params, unknown=self.unknown)
+
+
+class QueryParser:
+    __slots__ = ('schema', 'unknown', 'fields')
+
+    def __init__(self, schema: Schema, unknown=EXCLUDE):
+        self.schema = schema
+        self.unknown = unknown
+        self.fields = dict(iter_query_fields(schema))
+
+    def parse(self, request: Request):
+        query_params = request.query_params
+        getlist = request.query_params.getlist
+        query_fields = self.fields
+        data = ((key, query_fields[key](getlist(key)))
+                for key in query_params.keys() if key in query_fields)
+        data = {key: val for (key, val) in data if val is not None}
+        return self.schema.load(data, many=False, unknown=self.unknown)
+
+
+class JsonParser:
+    __slots__ = ('schema', 'unknown')
+
+    def __init__(self, schema: Schema, unknown=EXCLUDE):
+        self.schema = schema
+        self.unknown = unknown
+
+    async def parse(self, request: Request):
+        body = await request.body()
+        if body is None:
+            data = {}
+        else:
+            try:
+                data = ujson.loads(body)
+            except (TypeError, ValueError) as e:
+                raise DecodeError('Invalid json body') from e
+
+        return self.schema.load(data, unknown=self.unknown)
+
+
+_PARSERS = {'path': PathParser, 'query': QueryParser, 'body': JsonParser}
+
+
+def create_parser(cls) -> RequestParser:
+    parser = cls.__parser__
+    parsers: List[Tuple[str, Any]] = []
+    async_parsers: List[Tuple[str, Any]] = []
+    for (key, p) in (*parser.parsers, *parser.async_parsers):
+        factory = _PARSERS.get(getattr(p, 'location', None))
+        if factory is None:
+            raise TypeError(f'Unsupported parser {p!r}, method={cls.__qualname__}')
+
+        frozen = factory(p.schema, p.unknown)
+        (async_parsers if inspect.iscoroutinefunction(frozen.parse) else parsers).append((key, frozen))
+
+    return RequestParser(parsers, async_parsers)
+
+
+class Render:
+    __slots__ = ('_renders',)
+
+    def __init__(self, renders: Sequence):
+        self._renders = renders
+
+    def __call__(self, content: Any, method):
+        for r in self._renders:
+            content = r(content, method)
+
+        return content
+
+
+def create_render(cls) -> Render:
+    renders = []
+    response_schema = getattr(cls, 'response_schema', None)
+    if response_schema is not None:
+        if inspect.isclass(response_schema):
+            response_schema = response_schema()
+        renders.append(dump_content(response_schema))
+
+    serializer = getattr(cls, 'serializer', None)
+    if serializer is not None:
+        renders.append(render_bytes(serializer))
+
+    return Render(renders)
+
+
+def render_bytes(serializer):
+    def render(content, method):
+        return Response(serializer.render(content),
+                        media_type=serializer.media_type,
+                        status_code=method.status_code)
+
+    return render
+
+
+def dump_content(response_schema: Schema) -> Callable:
+    def dump(content, _):
+        try:
+            return response_schema.dump(content)
+        except MarshmallowError as e:
+            logger.error('Dump error: %s', e)
+            raise DumpError(e) from e
+        except (ValueError, TypeError) as e:
+            logger.error('Dump error: %s', e)
+            raise DumpError(e) from e
+
+    return dump
+
+
+def endpoint(cls) -> Callable[[Request], Any]:
+    """Request handler of the method class as dispatched before the compiled dispatch."""
+    parser = create_parser(cls)
+    render = create_render(cls)
+
+    async def wrapper(request: Request) -> Response:
+        method = cls(request)
+        params = await parser.parse(request)
+        content = await method.execute(**params)
+        return render(content, method)
+
+    return wrapper
@@ -0,0 +1,50 @@
+"""Compare json engines on representative payloads.
+
+Usage: python -m benchmarks.json_engines [--number N]
+"""
+import argparse
+import timeit
+
+from star_resty.serializers import get_engine
+
+ENGINES = ('ujson', 'json', 'orjson')
+
+
+def create_payloads():
+    item = {
+        'id': 12345,
+        'name': 'Название товара',
+        'price': 1234.56,
+        'available': True,
+        'tags': ['new', 'sale', 'popular'],
+        'owner': {'id': 1, 'email': 'email@mail.com', 'created_at': '2020-01-02T03:04:05'},
+    }
+    return (
+        ('small object', {'id': 1, 'q': 'test'}),
+        ('item', item),
+        ('list of 1000 items', {'items': [dict(item, id=i) for i in range(1000)]}),
+    )
+
+
+def main(number: int):
+    print(f'{"payload":<20} {"engine":<8} {"dumps, us":>10} {"loads, us":>10}')
+    for name, payload in create_payloads():
+        n = max(1, number // max(1, len(str(payload)) // 100))
+        for engine_name in ENGINES:
+            try:
+                engine = get_engine(engine_name)
+            except ImportError:
+                print(f'{name:<20} {engine_name:<8} {"not installed":>21}')
+                continue
+
+            body = engine.dumps(payload)
+            dumps = min(timeit.repeat(lambda: engine.dumps(payload), number=n, repeat=5)) / n
+            loads = min(timeit.repeat(lambda: engine.loads(body), number=n, repeat=5)) / n
+            print(f'{name:<20} {engine_name:<8} {dumps * 1e6:>10.2f} {loads * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10000)
+    args = parser.parse_args()
+    main(args.number)
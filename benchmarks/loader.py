@@ -0,0 +1,69 @@
+"""Compare marshmallow ``Schema.load`` with the compiled loader.
+
+Usage: python -m benchmarks.loader [--number N]
+"""
+import argparse
+import timeit
+
+from marshmallow import Schema, fields, validate
+
+from star_resty.payload.loader import compile_loader
+
+
+class QuerySchema(Schema):
+    q = fields.String(required=True)
+    limit = fields.Integer(load_default=20, validate=validate.Range(min=1, max=100))
+    offset = fields.Integer(load_default=0)
+    active = fields.Boolean()
+
+
+class OwnerSchema(Schema):
+    id = fields.Integer(required=True)
+    email = fields.String()
+
+
+class ItemSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String()
+    price = fields.Float()
+    available = fields.Boolean()
+    tags = fields.List(fields.String())
+    owner = fields.Nested(OwnerSchema)
+
+
+class ItemsSchema(Schema):
+    items = fields.List(fields.Nested(ItemSchema))
+
+
+def create_payloads():
+    item = {
+        'id': 12345,
+        'name': 'Название товара',
+        'price': 1234.56,
+        'available': True,
+        'tags': ['new', 'sale', 'popular'],
+        'owner': {'id': 1, 'email': 'email@mail.com'},
+    }
+    return (
+        ('query', QuerySchema(), {'q': 'search', 'limit': '10', 'active': True}, 1),
+        ('item', ItemSchema(), item, 1),
+        ('1000 items', ItemsSchema(), {'items': [dict(item, id=i) for i in range(1000)]}, 1000),
+    )
+
+
+def main(number: int):
+    print(f'{"payload":<12} {"marshmallow, us":>16} {"compiled, us":>13} {"speedup":>8}')
+    for name, schema, payload, size in create_payloads():
+        n = max(1, number // size)
+        load = compile_loader(schema)
+        assert load(payload) == schema.load(payload)
+        generic = min(timeit.repeat(lambda: schema.load(payload), number=n, repeat=5)) / n
+        compiled = min(timeit.repeat(lambda: load(payload), number=n, repeat=5)) / n
+        print(f'{name:<12} {generic * 1e6:>16.2f} {compiled * 1e6:>13.2f} {generic / compiled:>7.1f}x')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=10000)
+    args = parser.parse_args()
+    main(args.number)
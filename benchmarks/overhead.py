@@ -0,0 +1,365 @@
+"""Per-request overhead of star_resty endpoints compared with plain Starlette handlers.
+
+Both handlers of every case are driven through ASGI without network.
+Results are written as json with ops/s and latency percentiles, the run
+fails when the overhead ratio to the plain handler regresses against
+the committed baseline by more than the threshold. The ratio does not
+depend on the speed of the machine, ops/s are compared with
+``--check-ops`` only, on the machine of the baseline.
+
+Usage: python -m benchmarks.overhead [--number N] [--output results.json]
+                                     [--baseline baseline.json] [--save] [--threshold 0.25] [--check-ops]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from marshmallow import Schema, fields
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import request_response
+
+from star_resty import Method, form_payload, header, json_payload, path, query, upload
+
+ASGIApp = Callable[[Mapping, Callable, Callable], Awaitable[None]]
+
+
+class PathParams(Schema):
+    id = fields.Integer(required=True)
+
+
+class QueryParams(Schema):
+    q = fields.String()
+    limit = fields.Integer()
+
+
+class HeaderParams(Schema):
+    user_agent = fields.String(data_key='user-agent')
+    request_id = fields.String(data_key='x-request-id')
+
+
+class BodySchema(Schema):
+    name = fields.String()
+    email = fields.String()
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    email = fields.String()
+
+
+ITEM = {'id': 1, 'name': 'Name', 'email': 'email@mail.com'}
+ITEMS = [dict(ITEM, id=i) for i in range(20)]
+
+path_schema = PathParams()
+query_schema = QueryParams()
+header_schema = HeaderParams()
+body_schema = BodySchema()
+item_schema = ItemSchema()
+items_schema = ItemSchema(many=True)
+
+
+@dataclass
+class Params:
+    user: path(PathParams)
+    params: query(QueryParams)
+
+
+class QueryEndpoint(Method):
+    async def execute(self, params: query(QueryParams)):
+        return params
+
+
+class PathEndpoint(Method):
+    async def execute(self, params: path(PathParams)):
+        return params
+
+
+class HeaderEndpoint(Method):
+    async def execute(self, params: header(HeaderParams)):
+        return params
+
+
+class JsonEndpoint(Method):
+    async def execute(self, body: json_payload(BodySchema)):
+        return body
+
+
+class FormEndpoint(Method):
+    async def execute(self, body: form_payload(BodySchema)):
+        return body
+
+
+class UploadEndpoint(Method):
+    async def execute(self, files: upload('file')):
+        return {'size': len(await files[0].read())}
+
+
+class DataclassEndpoint(Method):
+    async def execute(self, params: Params):
+        return {'id': params.user['id'], **params.params}
+
+
+class NoSchemaEndpoint(Method):
+    async def execute(self):
+        return ITEM
+
+
+class ObjectEndpoint(Method):
+    response_schema = ItemSchema
+
+    async def execute(self):
+        return ITEM
+
+
+class ListEndpoint(Method):
+    response_schema = items_schema
+
+    async def execute(self):
+        return ITEMS
+
+
+async def plain_query(request: Request):
+    return JSONResponse(query_schema.load(request.query_params))
+
+
+async def plain_path(request: Request):
+    return JSONResponse(path_schema.load(request.path_params))
+
+
+async def plain_header(request: Request):
+    return JSONResponse(header_schema.load(request.headers, unknown='exclude'))
+
+
+async def plain_json(request: Request):
+    return JSONResponse(body_schema.load(await request.json()))
+
+
+async def plain_form(request: Request):
+    return JSONResponse(body_schema.load(await request.form()))
+
+
+async def plain_upload(request: Request):
+    form = await request.form()
+    return JSONResponse({'size': len(await form['file'].read())})
+
+
+async def plain_dataclass(request: Request):
+    user = path_schema.load(request.path_params)
+    params = query_schema.load(request.query_params)
+    return JSONResponse({'id': user['id'], **params})
+
+
+async def plain_no_schema(_: Request):
+    return JSONResponse(ITEM)
+
+
+async def plain_object(_: Request):
+    return JSONResponse(item_schema.dump(ITEM))
+
+
+async def plain_list(_: Request):
+    return JSONResponse(items_schema.dump(ITEMS))
+
+
+BOUNDARY = b'benchmark'
+MULTIPART = (b'--benchmark\r\nContent-Disposition: form-data; name="file"; filename="file.txt"\r\n'
+             b'Content-Type: text/plain\r\n\r\n' + b'x' * 1024 + b'\r\n--benchmark--\r\n')
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    endpoint: type
+    plain: Callable[[Request], Awaitable]
+    query_string: bytes = b''
+    headers: Sequence[Tuple[bytes, bytes]] = ()
+    body: bytes = b''
+
+
+CASES = (
+    Case('query', QueryEndpoint, plain_query, query_string=b'q=test&limit=10'),
+    Case('path', PathEndpoint, plain_path),
+    Case('header', HeaderEndpoint, plain_header,
+         headers=((b'user-agent', b'benchmark'), (b'x-request-id', b'1'), (b'accept', b'*/*'))),
+    Case('json_payload', JsonEndpoint, plain_json, headers=((b'content-type', b'application/json'),),
+         body=json.dumps({'name': 'Name', 'email': 'email@mail.com'}).encode('utf-8')),
+    Case('form_payload', FormEndpoint, plain_form,
+         headers=((b'content-type', b'application/x-www-form-urlencoded'),),
+         body=b'name=Name&email=email%40mail.com'),
+    Case('upload', UploadEndpoint, plain_upload,
+         headers=((b'content-type', b'multipart/form-data; boundary=' + BOUNDARY),), body=MULTIPART),
+    Case('dataclass', DataclassEndpoint, plain_dataclass, query_string=b'q=test&limit=10'),
+    Case('render: no schema', NoSchemaEndpoint, plain_no_schema),
+    Case('render: object', ObjectEndpoint, plain_object),
+    Case('render: list', ListEndpoint, plain_list),
+)
+
+
+def create_scope(case: Case) -> Dict:
+    return {
+        'type': 'http',
+        'method': 'POST',
+        'path': '/items/1',
+        'query_string': case.query_string,
+        'headers': [*case.headers, (b'content-length', str(len(case.body)).encode('latin-1'))],
+        'path_params': {'id': '1'},
+    }
+
+
+async def run(app: ASGIApp, case: Case, number: int) -> List[float]:
+    body = case.body
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    timings = []
+    perf_counter = time.perf_counter
+    for _ in range(number):
+        scope = create_scope(case)
+        start = perf_counter()
+        await app(scope, receive, send)
+        timings.append(perf_counter() - start)
+
+    if status != 200:
+        raise RuntimeError(f'Unexpected status {status} of the case {case.name!r}')
+
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    timings = sorted(timings)
+
+    def percentile(q: float) -> float:
+        return timings[min(int(len(timings) * q), len(timings) - 1)] * 1e6
+
+    return {
+        'ops': len(timings) / sum(timings),
+        'p50_us': percentile(0.5),
+        'p90_us': percentile(0.9),
+        'p99_us': percentile(0.99),
+    }
+
+
+async def measure(case: Case, number: int, repeat: int) -> Dict:
+    """Run both handlers of the case in turns.
+
+    The overhead is the median ratio of the p50 latencies of the turns,
+    so it is stable against the load of the machine changing between
+    the runs; ops/s and percentiles are taken from the fastest turn.
+    """
+    apps = (request_response(case.endpoint.as_endpoint()), request_response(case.plain))
+    for app in apps:
+        await run(app, case, max(number // 10, 1))
+
+    stars, plains, ratios = [], [], []
+    for _ in range(repeat):
+        star = summarize(await run(apps[0], case, number))
+        plain = summarize(await run(apps[1], case, number))
+        stars.append(star)
+        plains.append(plain)
+        ratios.append(star['p50_us'] / plain['p50_us'])
+
+    return {
+        'star_resty': max(stars, key=lambda value: value['ops']),
+        'starlette': max(plains, key=lambda value: value['ops']),
+        'overhead': statistics.median(ratios),
+    }
+
+
+async def benchmark(number: int, repeat: int = 5, cases: Sequence[Case] = CASES) -> Dict:
+    results = {}
+    for case in cases:
+        results[case.name] = await measure(case, number, repeat)
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'number': number,
+        'cases': results,
+    }
+
+
+def compare(results: Mapping, baseline: Mapping, threshold: float, check_ops: bool = False) -> List[str]:
+    """Regressions of the results against the baseline by more than ``threshold``.
+
+    The overhead ratio to the plain handler is compared always, ops/s
+    with ``check_ops`` for the baseline recorded on the same platform.
+    """
+    check_ops = check_ops and results.get('platform') == baseline.get('platform')
+    regressions = []
+    for name, base in baseline.get('cases', {}).items():
+        current = results['cases'].get(name)
+        if current is None:
+            continue
+
+        if current['overhead'] > base['overhead'] * (1 + threshold):
+            regressions.append(f'{name}: overhead {base["overhead"]:.2f}x -> {current["overhead"]:.2f}x')
+
+        ops, base_ops = current['star_resty']['ops'], base['star_resty']['ops']
+        if check_ops and ops < base_ops * (1 - threshold):
+            regressions.append(f'{name}: {base_ops:.0f} -> {ops:.0f} ops/s')
+
+    return regressions
+
+
+def format_results(results: Mapping) -> str:
+    lines = [f'{"case":<20} {"ops/s":>9} {"p50, us":>8} {"p99, us":>8} {"starlette ops/s":>16} {"overhead":>9}']
+    for name, item in results['cases'].items():
+        star, plain = item['star_resty'], item['starlette']
+        lines.append(f'{name:<20} {star["ops"]:>9.0f} {star["p50_us"]:>8.1f} {star["p99_us"]:>8.1f} '
+                     f'{plain["ops"]:>16.0f} {item["overhead"]:>8.2f}x')
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write results to the json file')
+    parser.add_argument('--baseline', default='benchmarks/baseline.json')
+    parser.add_argument('--save', action='store_true', help='write results to the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--check-ops', action='store_true', help='compare ops/s on the machine of the baseline')
+    args = parser.parse_args(argv)
+
+    results = asyncio.get_event_loop().run_until_complete(benchmark(args.number, args.repeat))
+    print(format_results(results))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2)
+        return 0
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f'no baseline {args.baseline}, run with --save to record it', file=sys.stderr)
+        return 2
+
+    regressions = compare(results, baseline, args.threshold, args.check_ops)
+    for line in regressions:
+        print(f'regression: {line}', file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -30,6 +30,10 @@ setup(
         'apispec<4',
         'python-multipart'
     ],
+    extras_require={
+        'msgpack': ['msgpack'],
+        'orjson': ['orjson'],
+    },
     version='0.0.20',
     url='https://github.com/slv0/start_resty',
     license='BSD',
@@ -1,4 +1,32 @@
-from .apidocs import setup_spec
-from .method import *
+import importlib
+
+from .method import Method, endpoint
 from .operation import Operation
-from .payload import *
+
+_PAYLOAD = ('form_payload', 'form_schema', 'header', 'header_schema', 'json_payload', 'json_schema',
+            'path', 'path_schema', 'query', 'query_schema', 'set_max_body_size', 'upload', 'upload_stream')
+
+__all__ = ('Method', 'endpoint', 'Operation', 'CachePolicy', 'setup_spec', 'setup_metrics', 'prepare', *_PAYLOAD)
+
+# optional subsystems are imported on the first access
+_LAZY = {
+    'CachePolicy': '.cache',
+    'setup_spec': '.apidocs',
+    'setup_metrics': '.metrics',
+    'prepare': '.warmup',
+    **{name: '.payload' for name in _PAYLOAD},
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
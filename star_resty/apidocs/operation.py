@@ -1,7 +1,8 @@
 from starlette.routing import Route
 
 from star_resty.method import Method
-from .request import resolve_parameters, resolve_request_body, resolve_request_body_params
+from star_resty.method.render import get_serializers
+from .request import resolve_consumes, resolve_parameters, resolve_request_body, resolve_request_body_params
 from .response import resolve_responses
 
 __all__ = ('setup_route_operations',)
@@ -21,7 +22,7 @@ def setup_operation(endpoint: Method, version=2):
         'tags': [options.tag],
         'description': options.description,
         'summary': options.summary,
-        'produces': [endpoint.serializer.media_type],
+        'produces': [serializer.media_type for serializer in get_serializers(endpoint)],
         'parameters': resolve_parameters(endpoint),
         'responses': resolve_responses(endpoint, version),
     }
@@ -32,6 +33,7 @@ def setup_operation(endpoint: Method, version=2):
     if version > 2:
         res['requestBody'] = resolve_request_body(endpoint)
     else:
+        res['consumes'] = resolve_consumes(endpoint) or None
         res['parameters'].extend(resolve_request_body_params(endpoint))
 
     if options.meta:
@@ -1,7 +1,7 @@
 from star_resty.method import Method
 from star_resty.method.parser import RequestParser
 
-__all__ = ('resolve_parameters', 'resolve_request_body', 'resolve_request_body_params')
+__all__ = ('resolve_parameters', 'resolve_request_body', 'resolve_request_body_params', 'resolve_consumes')
 
 
 def resolve_parameters(endpoint: Method):
@@ -47,3 +47,20 @@ def resolve_request_body_params(endpoint: Method):
             params.extend(p.get_spec())
 
     return params
+
+
+def resolve_consumes(endpoint: Method):
+    media_types = []
+    parser = getattr(endpoint, '__parser__', None)
+    if parser is None:
+        return media_types
+
+    for p in parser:
+        if not (p.is_body or p.location == 'formData'):
+            continue
+
+        for media_type in ([m for (m, _) in p.get_body_spec()] or [p.media_type]):
+            if media_type and media_type not in media_types:
+                media_types.append(media_type)
+
+    return media_types
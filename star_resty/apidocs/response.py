@@ -2,6 +2,7 @@ import inspect
 from typing import Union, Dict, Type
 
 from star_resty.method import Method
+from star_resty.method.render import get_serializers, is_stream
 
 __all__ = ('resolve_responses',)
 
@@ -9,17 +10,21 @@ __all__ = ('resolve_responses',)
 def resolve_responses(endpoint: Method, version: int):
     responses = {}
     if endpoint.response_schema:
+        schema = endpoint.response_schema
+        if is_stream(endpoint):
+            schema = {'type': 'array', 'items': schema}
+
         if version == 3:
             responses[str(endpoint.status_code)] = {
                 'content': {
-                    endpoint.serializer.media_type: {
-                        'schema': endpoint.response_schema
-                    }
+                    serializer.media_type: {
+                        'schema': schema
+                    } for serializer in get_serializers(endpoint)
                 }
             }
         else:
             responses[str(endpoint.status_code)] = {
-            'schema': endpoint.response_schema
+            'schema': schema
         }
 
     errors = endpoint.meta.errors or ()
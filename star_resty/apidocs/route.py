@@ -1,23 +1,35 @@
-from typing import Sequence
+import hashlib
+import os
+import sys
+from typing import Any, Callable, Dict, Iterator, Sequence, Set, Tuple
 
 from apispec import APISpec
+from marshmallow import Schema, fields
 from starlette.routing import BaseRoute, Mount, Route
 
+from star_resty.method import Method
+from star_resty.method.render import get_response_schema, get_serializers
 from .operation import setup_route_operations
 from .utils import convert_path
 
-__all__ = ('setup_routes',)
+__all__ = ('setup_routes', 'routes_digest', 'SpecBuilder')
 
 
 def setup_routes(routes: Sequence[BaseRoute],
                  spec: APISpec, version: int = 2,
                  add_head_methods: bool = False,
                  path: str = ''):
+    for (route_path, route, endpoint) in iter_routes(routes, path):
+        operations = setup_route_operations(route, endpoint, version=version,
+                                            add_head_methods=add_head_methods)
+        spec.path(convert_path(route_path), operations=operations)
+
+
+def iter_routes(routes: Sequence[BaseRoute], path: str = '') -> Iterator[Tuple[str, Route, Method]]:
+    """Routes of the endpoints included in the schema with the full paths."""
     for route in routes:
         if isinstance(route, Mount):
-            setup_routes(route.routes, spec, version=version, add_head_methods=add_head_methods,
-                         path=f'{path}{route.path}')
-            continue
+            yield from iter_routes(route.routes, f'{path}{route.path}')
         elif isinstance(route, Route):
             if not route.include_in_schema:
                 continue
@@ -26,7 +38,150 @@ def setup_routes(routes: Sequence[BaseRoute],
             if endpoint is None:
                 continue
 
-            operations = setup_route_operations(route, endpoint, version=version,
-                                                add_head_methods=add_head_methods)
-            route_path = f'{path}{route.path}'
-            spec.path(convert_path(route_path), operations=operations)
+            yield f'{path}{route.path}', route, endpoint
+
+
+class SpecBuilder:
+    """Add operations of the routes to the spec incrementally.
+
+    Processed routes are tracked by identity: on update only the new
+    routes are inspected. When routes are removed or replaced the spec
+    is created again by ``factory`` and all routes are processed, so no
+    operations or component schemas of the removed routes are left.
+    """
+    __slots__ = ('factory', 'spec', 'version', 'add_head_methods', '_processed', '_identity', '_snapshot')
+
+    def __init__(self, factory: Callable[[], APISpec], version: int = 2, add_head_methods: bool = False):
+        self.factory = factory
+        self.spec = factory()
+        self.version = version
+        self.add_head_methods = add_head_methods
+        self._processed: Dict[int, Tuple[Route, str]] = {}
+        self._identity = None
+        self._snapshot = ()
+
+    def changed(self, routes: Sequence[BaseRoute]) -> bool:
+        """Fast check of the route table, the identities of the routes are compared."""
+        return self._identity != route_identity(routes)
+
+    def snapshot(self, routes: Sequence[BaseRoute]):
+        # routes are kept alive, so their ids are not reused by new routes
+        self._snapshot = tuple(iter_all_routes(routes))
+        self._identity = route_identity(routes)
+
+    def update(self, routes: Sequence[BaseRoute]) -> int:
+        """Process the changes of the route table, return the number of added and removed routes."""
+        processed = self._processed
+        current = {}
+        added = []
+        for (route_path, route, endpoint) in iter_routes(routes):
+            item = processed.get(id(route))
+            if item is None or item[0] is not route or item[1] != route_path:
+                added.append((route_path, route, endpoint))
+            else:
+                current[id(route)] = item
+
+        removed = len(processed) - len(current)
+        if removed:
+            self.spec = self.factory()
+            added = list(iter_routes(routes))
+            current = {}
+
+        for (route_path, route, endpoint) in added:
+            operations = setup_route_operations(route, endpoint, version=self.version,
+                                                add_head_methods=self.add_head_methods)
+            self.spec.path(convert_path(route_path), operations=operations)
+            current[id(route)] = (route, route_path)
+
+        self._processed = current
+        self.snapshot(routes)
+        return len(added) + removed
+
+
+def route_identity(routes: Sequence[BaseRoute]) -> Tuple:
+    return tuple((id(route), route_identity(route.routes)) if isinstance(route, Mount) else id(route)
+                 for route in routes)
+
+
+def iter_all_routes(routes: Sequence[BaseRoute]) -> Iterator[BaseRoute]:
+    for route in routes:
+        yield route
+        if isinstance(route, Mount):
+            yield from iter_all_routes(route.routes)
+
+
+def routes_digest(routes: Sequence[BaseRoute], *extra: Any) -> str:
+    """Digest of the route table used in the spec.
+
+    Paths, methods, endpoints with their operation options and the
+    declared fields of all request and response schemas are hashed, so
+    the digest changes when a schema of another module is edited and
+    does not depend on the modification times of the deployed files.
+    The modification time of the endpoint modules is hashed as well.
+    """
+    h = hashlib.sha256(repr(extra).encode('utf-8'))
+    described = set()
+    for (route_path, route, endpoint) in iter_routes(routes):
+        module = sys.modules.get(endpoint.__module__)
+        filename = getattr(module, '__file__', None)
+        mtime = os.stat(filename).st_mtime_ns if filename and os.path.exists(filename) else None
+        item = f'{route_path} {sorted(route.methods or ())} {endpoint.__module__}.{endpoint.__qualname__} {mtime}'
+        h.update(item.encode('utf-8'))
+        h.update(b'\0')
+        for item in describe_endpoint(endpoint, described):
+            h.update(item.encode('utf-8'))
+            h.update(b'\0')
+
+    return h.hexdigest()
+
+
+def describe_endpoint(endpoint: Method, described: Set[int]) -> Iterator[str]:
+    """Stable descriptions of the endpoint options and the schemas used in its operations."""
+    meta = endpoint.meta
+    yield repr((meta.tag, meta.description, meta.summary, meta.security, meta.meta,
+                [repr(e) for e in meta.errors or ()], endpoint.status_code,
+                [serializer.media_type for serializer in get_serializers(endpoint)]))
+    for parser in getattr(endpoint, '__parser__', None) or ():
+        yield f'{type(parser).__qualname__} {getattr(parser, "location", None)}'
+        schema = getattr(parser, 'schema', None)
+        if isinstance(schema, Schema):
+            yield from describe_schema(schema, described)
+
+    response_schema = get_response_schema(endpoint)
+    if response_schema is not None:
+        yield from describe_schema(response_schema, described)
+
+
+def describe_schema(schema: Schema, described: Set[int]) -> Iterator[str]:
+    schema_cls = type(schema)
+    yield f'{schema_cls.__module__}.{schema_cls.__qualname__} many={schema.many} only={schema.only!r}'
+    if id(schema) in described:
+        return
+
+    described.add(id(schema))
+    for (name, field) in schema.fields.items():
+        yield from describe_field(name, field, described)
+
+
+def describe_field(name: str, field: fields.Field, described: Set[int]) -> Iterator[str]:
+    field_cls = type(field)
+    try:
+        default = field.load_default
+    except AttributeError:
+        default = field.missing
+    if callable(default):
+        default = getattr(default, '__qualname__', type(default).__qualname__)
+    yield (f'{name} {field_cls.__module__}.{field_cls.__qualname__} {field.data_key} {field.required} '
+           f'{field.allow_none} {default!r} {sorted(field.metadata.items(), key=repr)!r} '
+           f'{[repr(v) for v in field.validators]}')
+    if isinstance(field, fields.Nested):
+        yield from describe_schema(field.schema, described)
+    elif isinstance(field, fields.List):
+        yield from describe_field('[]', field.inner, described)
+    elif isinstance(field, fields.Tuple):
+        for (i, item) in enumerate(field.tuple_fields):
+            yield from describe_field(f'[{i}]', item, described)
+    elif isinstance(field, fields.Mapping):
+        for item in (field.key_field, field.value_field):
+            if item is not None:
+                yield from describe_field('{}', item, described)
@@ -1,14 +1,19 @@
 import logging
-from typing import Optional, Mapping
+import os
+import tempfile
+from typing import Optional, Mapping, Tuple
 
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from starlette.applications import Starlette
 from starlette.requests import Request
-from starlette.responses import JSONResponse, HTMLResponse
+from starlette.responses import JSONResponse, HTMLResponse, Response
 
-from .route import setup_routes
-from .utils import resolve_schema_name, apispec_json_to_html
+from star_resty.cache import CacheEntry
+from star_resty.compression import Compression, Compressor, weak_etag
+from star_resty.method.conditional import is_not_modified, make_etag
+from .route import SpecBuilder, routes_digest
+from .utils import resolve_schema_name, render_html
 
 logger = logging.getLogger(__name__)
 
@@ -24,40 +29,127 @@ def setup_spec(app: Starlette, title: str,
                route_html: str = '/apidocs',
                add_head_methods: bool = False,
                options: Optional[Mapping] = None,
+               compression: Optional[Compression] = Compression(),
+               eager: bool = False,
+               precompress: bool = False,
+               cache_dir: Optional[str] = None,
                **kwargs):
+    """Serve the spec of the application routes.
+
+    JSON and HTML bodies are rendered once, on the first request or on
+    startup with ``eager``, and served with ETag. Bodies are rendered again
+    when the route table changes: only the added routes are inspected, the
+    spec is built from scratch when routes are removed or replaced, so the
+    returned spec is the one of the initial route table. With
+    ``precompress`` the compressed variants are built with the bodies.
+    With ``cache_dir`` the rendered spec is stored on disk by the digest
+    of the route table and the declared schemas, so the routes are not
+    inspected on the next start of the same application.
+
+    Starlette does not run the startup handlers of the application created
+    with ``lifespan``, so ``eager`` has no effect there: call
+    ``star_resty.prepare(app)`` in the lifespan function, it renders the
+    bodies of all specs of the application.
+    """
     if options is None:
         options = {}
 
-    spec = APISpec(
-        title=title,
-        version=version,
-        openapi_version=openapi_version,
-        schemes=schemes or ['http', 'https'],
-        plugins=[MarshmallowPlugin(schema_name_resolver=resolve_schema_name)],
-        **{'swagger': openapi_version, 'basePath': base_path, **options, **kwargs}
-    )
-    api_spec = None
+    spec_options = {'swagger': openapi_version, 'basePath': base_path, **options, **kwargs}
+
+    def create_spec() -> APISpec:
+        return APISpec(
+            title=title,
+            version=version,
+            openapi_version=openapi_version,
+            schemes=schemes or ['http', 'https'],
+            plugins=[MarshmallowPlugin(schema_name_resolver=resolve_schema_name)],
+            **spec_options
+        )
+
+    entries: Optional[Tuple[CacheEntry, CacheEntry]] = None
+    compressor = Compressor(compression) if compression is not None else None
+    builder = SpecBuilder(create_spec, version=get_open_api_version(openapi_version), add_head_methods=add_head_methods)
 
     @app.route(route, include_in_schema=False)
-    def generate_api_docs(_: Request):
-        s = generate_spec(app, get_open_api_version(openapi_version), add_head_methods)
-        return JSONResponse(s)
+    def generate_api_docs(request: Request):
+        return send_entry(request, get_entries()[0])
 
     @app.route(route_html, include_in_schema=False)
-    def generate_html_api_docs(_: Request):
-        s = generate_spec(app, get_open_api_version(openapi_version), add_head_methods)
-        return HTMLResponse(apispec_json_to_html(s))
-
-    def generate_spec(app: Starlette, open_api_version: int, add_head_methods: bool):
-        nonlocal api_spec
-        nonlocal spec
-        if api_spec is None:
-            logger.info('initialize open api schema')
-            setup_routes(app.routes, spec, version=open_api_version, add_head_methods=add_head_methods)
-            api_spec = spec.to_dict()
-        return api_spec
-
-    return spec
+    def generate_html_api_docs(request: Request):
+        return send_entry(request, get_entries()[1])
+
+    def send_entry(request: Request, entry: CacheEntry) -> Response:
+        if is_not_modified(request, entry.status_code, entry.headers):
+            return Response(status_code=304, headers=entry.headers)
+
+        if compressor is not None:
+            return compressor.cached_response(request, entry)
+
+        return entry.response()
+
+    def get_entries() -> Tuple[CacheEntry, CacheEntry]:
+        nonlocal entries
+        if entries is None or builder.changed(app.routes):
+            body = render_spec()
+            entries = (create_entry(route, body, JSONResponse.media_type),
+                       create_entry(route_html, render_html(body.decode('utf-8')).encode('utf-8'),
+                                    HTMLResponse.media_type))
+        return entries
+
+    def create_entry(key: str, body: bytes, media_type: str) -> CacheEntry:
+        etag = make_etag(body) if compressor is None else weak_etag(make_etag(body))
+        entry = CacheEntry(key, body, 200, media_type, None, (), {'etag': etag})
+        if precompress and compressor is not None:
+            compressor.precompress(entry)
+        return entry
+
+    def render_spec() -> bytes:
+        if cache_dir is None:
+            return JSONResponse(generate_spec()).body
+
+        digest = routes_digest(app.routes, title, version, openapi_version, schemes, add_head_methods,
+                               sorted(spec_options.items(), key=lambda item: item[0]))
+        path = os.path.join(cache_dir, f'apidocs-{digest}.json')
+        try:
+            with open(path, 'rb') as file:
+                logger.info('load open api schema from %s', path)
+                body = file.read()
+        except FileNotFoundError:
+            pass
+        else:
+            builder.snapshot(app.routes)
+            return body
+
+        body = JSONResponse(generate_spec()).body
+        write_cache(path, body)
+        return body
+
+    def generate_spec():
+        count = builder.update(app.routes)
+        logger.info('update open api schema, %d routes changed', count)
+        return builder.spec.to_dict()
+
+    if eager:
+        app.add_event_handler('startup', get_entries)
+
+    builds = getattr(app.state, 'star_resty_apidocs', None)
+    if builds is None:
+        builds = app.state.star_resty_apidocs = []
+    builds.append(get_entries)
+
+    return builder.spec
+
+
+def write_cache(path: str, body: bytes):
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(body)
+        os.replace(tmp_path, path)
+    except OSError:
+        logger.warning('failed to store open api schema to %s', path, exc_info=True)
 
 
 def get_open_api_version(version: str) -> int:
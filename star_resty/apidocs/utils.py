@@ -2,9 +2,10 @@ import inspect
 import os
 import re
 import json
+from functools import lru_cache
 from typing import Any
 
-__all__ = ('resolve_schema_name', 'convert_path', 'apispec_json_to_html')
+__all__ = ('resolve_schema_name', 'convert_path', 'apispec_json_to_html', 'render_html')
 
 
 def resolve_schema_name(schema: Any) -> str:
@@ -22,7 +23,15 @@ def convert_path(path: str) -> str:
 
 
 def apispec_json_to_html(apispec_json: dict) -> str:
+    return render_html(json.dumps(apispec_json))
+
+
+def render_html(spec_json: str) -> str:
+    return get_template() % spec_json
+
+
+@lru_cache(maxsize=1)
+def get_template() -> str:
     template_path = os.path.join(os.path.dirname(__file__), 'template.html')
     with open(template_path, 'r') as file:
-        template = file.read()
-    return template % json.dumps(apispec_json)
+        return file.read()
@@ -0,0 +1,234 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Sequence, Set, Tuple
+
+from starlette.responses import Response
+
+__all__ = ('CachePolicy', 'CacheStats', 'LruCache', 'ResponseCache', 'default_cache', 'make_key')
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Response cache options of an endpoint.
+
+    The cache key is made of the ``execute`` arguments, except the ``exclude``d
+    ones, or of ``key(**arguments)`` when ``key`` is set. A request whose key
+    can not be built (unhashable or identity hashed values) is not cached.
+    """
+    ttl: Optional[float] = 60
+    tags: Sequence[str] = ()
+    store: Optional['ResponseCache'] = None
+    key: Optional[Callable[..., Hashable]] = None
+    exclude: Sequence[str] = ()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    count: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CacheEntry:
+    __slots__ = ('key', 'body', 'status_code', 'media_type', 'expires', 'tags', 'headers', 'variants')
+
+    def __init__(self, key: Hashable, body: bytes, status_code: int, media_type: Optional[str],
+                 expires: Optional[float], tags: Sequence[str], headers: Optional[Mapping[str, str]] = None):
+        self.key = key
+        self.body = body
+        self.status_code = status_code
+        self.media_type = media_type
+        self.expires = expires
+        self.tags = tags
+        self.headers = headers
+        self.variants: Dict[str, bytes] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(body) for body in self.variants.values())
+
+    def response(self) -> Response:
+        return Response(self.body, status_code=self.status_code, media_type=self.media_type,
+                        headers=self.headers)
+
+
+class ResponseCache:
+    """In-process cache of rendered responses.
+
+    Entries expire after ``ttl`` seconds and the least recently used
+    entries are evicted when the total size of the bodies exceeds
+    ``max_size`` bytes.
+    """
+
+    def __init__(self, max_size: int = 64 * 1024 * 1024):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[Hashable, CacheEntry]' = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        if entry.expires is not None and entry.expires <= time.monotonic():
+            self._remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry
+
+    def set(self, key: Hashable, body: bytes, status_code: int = 200,
+            media_type: Optional[str] = None, ttl: Optional[float] = None,
+            tags: Sequence[str] = (), headers: Optional[Mapping[str, str]] = None) -> Optional[CacheEntry]:
+        if key in self._entries:
+            self._remove(key)
+
+        if len(body) > self.max_size:
+            return None
+
+        expires = None if ttl is None else time.monotonic() + ttl
+        entry = CacheEntry(key, body, status_code, media_type, expires, tags, headers)
+        self._entries[key] = entry
+        self._size += entry.size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while self._size > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+        return entry
+
+    def add_variant(self, entry: CacheEntry, encoding: str, body: bytes):
+        """Keep an encoded (e.g. compressed) body along with the entry."""
+        if self._entries.get(entry.key) is not entry:
+            return
+
+        entry.variants[encoding] = body
+        self._size += len(body)
+        while self._size > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, *tags: str) -> int:
+        count = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+                    count += 1
+
+        return count
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+        self._size = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                          count=len(self._entries), size=self._size)
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+default_cache = ResponseCache()
+
+
+class LruCache:
+    """Mapping of at most ``maxsize`` values, the least recently used are evicted."""
+    __slots__ = ('maxsize', '_entries', '_hits', '_misses', '_evictions')
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        entries = self._entries
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        count = len(self._entries)
+        return CacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                          count=count, size=count)
+
+
+class _Unfrozen(Exception):
+    pass
+
+
+def make_key(method, values: Sequence[Any]) -> Optional[Tuple]:
+    """Cache key of the values, None if a value can not be a part of the key."""
+    try:
+        return (method, *(_freeze(value) for value in values))
+    except _Unfrozen:
+        return None
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(val)) for (key, val) in value.items()))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(val) for val in value)
+    elif is_dataclass(value) and not isinstance(value, type):
+        return (type(value), *(_freeze(getattr(value, f.name)) for f in fields(value)))
+    elif value is None or isinstance(value, type):
+        return value
+
+    # objects hashed by identity (e.g. an injected session) differ on every request
+    if type(value).__hash__ is None or type(value).__hash__ is object.__hash__:
+        raise _Unfrozen()
+
+    return value
@@ -0,0 +1,13 @@
+from marshmallow import Schema
+
+__all__ = ('has_processors',)
+
+
+def has_processors(schema: Schema, tag: str) -> bool:
+    """Check the schema for the processors of the tag.
+
+    Hooks are registered by ``(tag, pass_many)`` keys before marshmallow
+    3.22 and by the tag since then.
+    """
+    hooks = schema._hooks
+    return bool(hooks.get(tag) or hooks.get((tag, False)) or hooks.get((tag, True)))
@@ -0,0 +1,128 @@
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional, Sequence
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+__all__ = ('Compression', 'Compressor', 'choose_encoding', 'compress', 'weak_etag')
+
+ENCODINGS = ('gzip', 'deflate')
+
+
+@dataclass(frozen=True)
+class Compression:
+    min_size: int = 500
+    level: int = 6
+    encodings: Sequence[str] = ENCODINGS
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == 'gzip':
+        wbits = 16 + zlib.MAX_WBITS
+    elif encoding == 'deflate':
+        wbits = zlib.MAX_WBITS
+    else:
+        raise ValueError(f'Unsupported encoding: {encoding}')
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+    return compressor.compress(body) + compressor.flush()
+
+
+def choose_encoding(accept_encoding: Optional[str], encodings: Sequence[str] = ENCODINGS) -> Optional[str]:
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best = None
+    best_weight = 0.0
+    default = weights.get('*', 0.0)
+    for encoding in encodings:
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+
+    return best
+
+
+def weak_etag(etag: str) -> str:
+    """Weak form of the entity tag, a strong one must differ between the content-codings (RFC 7232)."""
+    return etag if etag.startswith('W/') else f'W/{etag}'
+
+
+class Compressor:
+    """Compress response bodies with the encoding accepted by the client."""
+    __slots__ = ('min_size', 'level', 'encodings')
+
+    def __init__(self, compression: Compression):
+        self.min_size = compression.min_size
+        self.level = compression.level
+        self.encodings = tuple(compression.encodings)
+
+    def choose(self, request: Request, size: int) -> Optional[str]:
+        if size < self.min_size:
+            return None
+
+        return choose_encoding(request.headers.get('accept-encoding'), self.encodings)
+
+    def precompress(self, entry):
+        """Compress the body of the cached entry with all encodings in advance."""
+        if len(entry.body) >= self.min_size:
+            for encoding in self.encodings:
+                if encoding not in entry.variants:
+                    entry.variants[encoding] = compress(entry.body, encoding, self.level)
+
+    def response(self, request: Request, body: bytes, status_code: int = 200,
+                 media_type: Optional[str] = None,
+                 headers: Optional[Mapping[str, str]] = None) -> Response:
+        headers = self._vary(headers)
+        encoding = self.choose(request, len(body))
+        if encoding is not None:
+            body = compress(body, encoding, self.level)
+            self._encoded(headers, encoding)
+
+        return Response(body, status_code=status_code, media_type=media_type, headers=headers)
+
+    def cached_response(self, request: Request, entry, cache=None) -> Response:
+        """Response for the cached entry, compressed body is kept in the entry."""
+        headers = self._vary(entry.headers)
+        body = entry.body
+        encoding = self.choose(request, len(body))
+        if encoding is not None:
+            compressed = entry.variants.get(encoding)
+            if compressed is None:
+                compressed = compress(body, encoding, self.level)
+                if cache is not None:
+                    cache.add_variant(entry, encoding, compressed)
+                else:
+                    entry.variants[encoding] = compressed
+            body = compressed
+            self._encoded(headers, encoding)
+
+        return Response(body, status_code=entry.status_code, media_type=entry.media_type, headers=headers)
+
+    @staticmethod
+    def _encoded(headers: Dict[str, str], encoding: str):
+        headers['content-encoding'] = encoding
+        etag = headers.get('etag')
+        if etag is not None:
+            headers['etag'] = weak_etag(etag)
+
+    @staticmethod
+    def _vary(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+        headers = dict(headers) if headers else {}
+        vary = headers.get('vary')
+        headers['vary'] = f'{vary}, Accept-Encoding' if vary else 'Accept-Encoding'
+        return headers
@@ -1,8 +1,9 @@
 from typing import Dict, Optional
 
 from marshmallow.exceptions import ValidationError
+from starlette.exceptions import HTTPException
 
-__all__ = ('StarRestError', 'DumpError', 'DecodeError')
+__all__ = ('StarRestError', 'DumpError', 'DecodeError', 'PayloadTooLarge')
 
 
 class StarRestError(Exception):
@@ -26,3 +27,13 @@ class DecodeError(StarRestError):
 
     def normalized_messages(self) -> Dict:
         return {'_body': str(self)}
+
+
+class PayloadTooLarge(StarRestError, HTTPException):
+
+    def __init__(self, max_size: int):
+        HTTPException.__init__(self, status_code=413, detail=f'Request body is larger than {max_size} bytes')
+        self.max_size = max_size
+
+    def normalized_messages(self) -> Dict:
+        return {'_body': self.detail}
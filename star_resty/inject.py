@@ -1,12 +1,23 @@
+import asyncio
+import inspect
 import operator
-from typing import TypeVar, Type, Optional, Generic
+import types
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Mapping, Optional, Sequence, Tuple, Type, TypeVar
+
+from starlette.applications import Starlette
+from starlette.requests import Request
 
 from star_resty import Method
+from star_resty.method.parser import RequestParser, create_parser_from_data
+from star_resty.payload.base import Parser, set_parser
 
-__all__ = ('attr',)
+__all__ = ('attr', 'depends', 'resource', 'resources', 'setup')
 
 T = TypeVar('T')
 
+SCOPE_KEY = 'star_resty.dependencies'
+
 
 class InjectAttr(Generic[T]):
     __slots__ = ('_func',)
@@ -30,3 +41,215 @@ class InjectAttr(Generic[T]):
 
 def attr(_: Optional[Type[T]] = None, *, name: Optional[str] = None) -> T:
     return InjectAttr[T](name)
+
+
+def depends(provider: Callable) -> Type:
+    """Request scoped dependency returned by ``provider``.
+
+    Parameters of the provider are declared by annotations like parameters
+    of ``execute``, the parameter annotated with ``Request`` gets the request.
+    The value is created once per request and shared by all dependants.
+    """
+    return types.new_class(f'Depends[{provider.__name__}]', (),
+                           exec_body=set_parser(DependencyParser.create(provider)))
+
+
+def resource(provider: Callable) -> Type:
+    """Application scoped dependency created once by ``provider``.
+
+    Provider is a function, a coroutine function or a generator function,
+    code after ``yield`` is called on shutdown of the application. Parameters
+    annotated with other resources are resolved, the parameter annotated
+    with ``Starlette`` gets the application.
+    """
+    return types.new_class(f'Resource[{provider.__name__}]', (),
+                           exec_body=set_parser(ResourceParser.create(provider)))
+
+
+def setup(app: Starlette, *providers: Type):
+    """Create ``providers`` on startup of the application and release all created resources on shutdown.
+
+    Resources which are not listed are created on the first use. Starlette
+    does not run the startup and shutdown handlers of the application
+    created with ``lifespan``, use ``resources`` in the lifespan function.
+    """
+    async def startup():
+        await create_resources(app, providers)
+
+    async def shutdown():
+        await get_resources(app).close()
+
+    app.add_event_handler('startup', startup)
+    app.add_event_handler('shutdown', shutdown)
+
+
+@asynccontextmanager
+async def resources(app: Starlette, *providers: Type) -> AsyncIterator[None]:
+    """Create ``providers`` on enter and release all created resources on exit.
+
+    For the applications with ``lifespan``::
+
+        @asynccontextmanager
+        async def lifespan(app):
+            async with resources(app, Pool):
+                yield
+    """
+    await create_resources(app, providers)
+    try:
+        yield
+    finally:
+        await get_resources(app).close()
+
+
+async def create_resources(app: Starlette, providers: Sequence[Type]):
+    state = get_resources(app)
+    for value in providers:
+        await state.get(value.parser)
+
+
+class DependencyParser(RequestParser):
+    __slots__ = ('provider', '_request_args', '_is_async')
+
+    @classmethod
+    def create(cls, provider: Callable) -> 'DependencyParser':
+        if inspect.isgeneratorfunction(provider) or inspect.isasyncgenfunction(provider):
+            raise TypeError(f'Generator providers are supported only by resources: {provider.__qualname__}')
+
+        annotations, required = get_parameters(provider)
+        request_args = tuple(name for (name, value) in annotations.items() if is_subclass(value, Request))
+        parser = create_parser_from_data({name: value for (name, value) in annotations.items()
+                                          if name not in request_args})
+        resolved = {key for (key, _) in (*parser.parsers, *parser.async_parsers)}
+        check_resolved(provider, required, resolved.union(request_args))
+        return cls(provider, parser.parsers, parser.async_parsers, request_args)
+
+    def __init__(self, provider: Callable, parsers: Sequence[Tuple[str, Parser]] = (),
+                 async_parsers: Sequence[Tuple[str, Parser]] = (), request_args: Sequence[str] = ()):
+        super().__init__(parsers=parsers, async_parsers=async_parsers)
+        self.provider = provider
+        self._request_args = request_args
+        self._is_async = inspect.iscoroutinefunction(provider)
+
+    async def parse_bodies(self, request: Request, bodies: Mapping) -> Any:
+        memo = request.scope.setdefault(SCOPE_KEY, {})
+        value = memo.get(self.provider)
+        if value is None:
+            value = memo[self.provider] = asyncio.ensure_future(self._resolve(request, bodies))
+
+        return await value
+
+    async def _resolve(self, request: Request, bodies: Mapping) -> Any:
+        params = await super().parse_bodies(request, bodies)
+        for name in self._request_args:
+            params[name] = request
+
+        value = self.provider(**params)
+        if self._is_async:
+            value = await value
+
+        return value
+
+
+class ResourceParser(RequestParser):
+    __slots__ = ('provider', 'resources', 'app_args')
+
+    @classmethod
+    def create(cls, provider: Callable) -> 'ResourceParser':
+        annotations, required = get_parameters(provider)
+        resources = []
+        app_args = []
+        for name, value in annotations.items():
+            parser = getattr(value, 'parser', None)
+            if isinstance(parser, ResourceParser):
+                resources.append((name, parser))
+            elif is_subclass(value, Starlette):
+                app_args.append(name)
+
+        check_resolved(provider, required, {name for (name, _) in resources}.union(app_args))
+        return cls(provider, tuple(resources), tuple(app_args))
+
+    def __init__(self, provider: Callable, resources: Sequence[Tuple[str, 'ResourceParser']] = (),
+                 app_args: Sequence[str] = ()):
+        super().__init__()
+        self.provider = provider
+        self.resources = resources
+        self.app_args = app_args
+
+    async def parse_bodies(self, request: Request, bodies: Mapping) -> Any:
+        return await get_resources(request.app).get(self)
+
+
+class Resources:
+    """Resources of the application, released in the reverse order on close."""
+    __slots__ = ('app', 'values', '_stack', '_lock')
+
+    def __init__(self, app: Starlette):
+        self.app = app
+        self.values: Dict[Callable, Any] = {}
+        self._stack = AsyncExitStack()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self, parser: ResourceParser) -> Any:
+        try:
+            return self.values[parser.provider]
+        except KeyError:
+            pass
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            return await self._create(parser)
+
+    async def close(self):
+        self.values.clear()
+        stack, self._stack = self._stack, AsyncExitStack()
+        await stack.aclose()
+
+    async def _create(self, parser: ResourceParser) -> Any:
+        values = self.values
+        provider = parser.provider
+        if provider in values:
+            return values[provider]
+
+        params = {name: await self._create(dep) for (name, dep) in parser.resources}
+        for name in parser.app_args:
+            params[name] = self.app
+
+        if inspect.isasyncgenfunction(provider):
+            value = await self._stack.enter_async_context(asynccontextmanager(provider)(**params))
+        elif inspect.isgeneratorfunction(provider):
+            value = self._stack.enter_context(contextmanager(provider)(**params))
+        else:
+            value = provider(**params)
+            if inspect.isawaitable(value):
+                value = await value
+
+        values[provider] = value
+        return value
+
+
+def get_resources(app: Starlette) -> Resources:
+    resources = getattr(app.state, 'star_resty_resources', None)
+    if resources is None:
+        resources = app.state.star_resty_resources = Resources(app)
+
+    return resources
+
+
+def get_parameters(provider: Callable) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    parameters = inspect.signature(provider).parameters.values()
+    annotations = {p.name: p.annotation for p in parameters if p.annotation is not p.empty}
+    required = tuple(p.name for p in parameters
+                     if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD))
+    return annotations, required
+
+
+def check_resolved(provider: Callable, required: Sequence[str], resolved):
+    for name in required:
+        if name not in resolved:
+            raise TypeError(f'Unresolved parameter "{name}" of the provider {provider.__qualname__}')
+
+
+def is_subclass(value: Any, cls: type) -> bool:
+    return inspect.isclass(value) and issubclass(value, cls)
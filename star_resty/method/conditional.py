@@ -0,0 +1,69 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Union
+
+from starlette.requests import Request
+
+__all__ = ('create_validators', 'is_not_modified', 'make_etag')
+
+SAFE_METHODS = frozenset(('GET', 'HEAD'))
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def create_validators(etag: Optional[str] = None,
+                      last_modified: Union[datetime, float, None] = None) -> Dict[str, str]:
+    headers = {}
+    if etag is not None:
+        if not (etag.startswith('"') or etag.startswith('W/"')):
+            etag = f'"{etag}"'
+        headers['etag'] = etag
+
+    if last_modified is not None:
+        headers['last-modified'] = format_datetime(_to_datetime(last_modified), usegmt=True)
+
+    return headers
+
+
+def is_not_modified(request: Request, status_code: int, headers: Mapping[str, str]) -> bool:
+    if status_code != 200 or request.method not in SAFE_METHODS:
+        return False
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        etag = headers.get('etag')
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get('if-modified-since')
+    last_modified = headers.get('last-modified')
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == '*':
+        return True
+
+    etag = _strip_weak(etag)
+    return any(_strip_weak(tag.strip()) == etag for tag in if_none_match.split(','))
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _to_datetime(value: Union[datetime, float]) -> datetime:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    return datetime.fromtimestamp(value, tz=timezone.utc)
@@ -0,0 +1,366 @@
+import logging
+import time
+from typing import AsyncIterator, Callable, Dict, List, Sequence
+
+from marshmallow.exceptions import MarshmallowError
+from starlette.responses import Response, StreamingResponse
+
+from star_resty.cache import CachePolicy, default_cache, make_key
+from star_resty.compression import Compressor, weak_etag
+from star_resty.exceptions import DumpError
+from star_resty.metrics import get_phases, use_server_timing
+from star_resty.payload.body import parse_limited, read_limited
+from star_resty.payload.json import with_engine
+from star_resty.serializers import JsonSerializer, Serializer, negotiate
+from .conditional import create_validators, is_not_modified, make_etag
+from .dumper import compile_dumper
+from .parser import RequestParser, gather
+from .render import dump_content, get_response_schema, get_serializers, is_stream, stream_content
+
+__all__ = ('create_dispatch',)
+
+logger = logging.getLogger(__name__)
+
+
+def create_dispatch(method) -> Callable:
+    """Compile a dispatch function specialized for the method class.
+
+    Parser calls, response schema dump and serializer are inlined
+    for the exact parameters of ``execute``, stages which are not used
+    by the endpoint are omitted. Phase timings are emitted only for
+    the endpoints with metrics or Server-Timing enabled.
+    """
+    namespace = {
+        '_Response': Response,
+        '_DumpError': DumpError,
+        '_dump_errors': (MarshmallowError, ValueError, TypeError),
+        '_logger': logger,
+    }
+    lines = ['async def dispatch(self):']
+    phases = get_phases(method)
+    if phases is not None or use_server_timing(method):
+        namespace.update(_perf=time.perf_counter, _phases=phases)
+        lines.append('    _t = _perf()')
+
+    args = _compile_parser(method, namespace, lines)
+    _compile_phase('parse', namespace, lines)
+    if is_stream(method):
+        _compile_stream(method, args, namespace, lines)
+    else:
+        _compile_render(method, args, namespace, lines)
+
+    source = '\n'.join(lines)
+    code = compile(source, f'<dispatch {method.__module__}.{method.__qualname__}>', 'exec')
+    exec(code, namespace)
+    dispatch = namespace['dispatch']
+    dispatch.__qualname__ = f'{method.__qualname__}.__dispatch__'
+    dispatch.__source__ = source
+    return dispatch
+
+
+def _compile_render(method, args: List[str], namespace: Dict, lines: List[str]):
+    serializer = getattr(method, 'serializer', None)
+    compression = getattr(method.meta, 'compression', None)
+    if compression is not None:
+        namespace['_compressor'] = Compressor(compression)
+
+    serializers = get_serializers(method)
+    negotiate = len(serializers) > 1
+    if negotiate:
+        _compile_negotiate(serializers, namespace, lines)
+
+    policy = getattr(method.meta, 'cache', None)
+    if policy is not None:
+        _compile_cache_lookup(method, policy, [*args, '_media_type'] if negotiate else args, namespace, lines)
+
+    lines.append(f'    content = await self.execute({", ".join(args)})')
+    _compile_phase('execute', namespace, lines)
+    if serializer is not None:
+        # entity tags of compressed endpoints are weak, the same tag is sent for all content-codings
+        namespace.update(_validators=create_validators if compression is None else _weak_validators,
+                         _not_modified=is_not_modified)
+        lines.extend((
+            '    if self.etag is not None or self.last_modified is not None:',
+            '        _headers = _validators(self.etag, self.last_modified)',
+            '        if _not_modified(self.request, self.status_code, _headers):',
+            '            return _Response(status_code=304, headers=_headers)',
+            '    else:',
+            '        _headers = None',
+        ))
+
+    response_schema = get_response_schema(method)
+    if response_schema is not None:
+        namespace['_dump'] = compile_dumper(response_schema)
+        lines.extend((
+            '    try:',
+            '        content = _dump(content)',
+            '    except _dump_errors as e:',
+            "        _logger.error('Dump error: %s', e)",
+            '        raise _DumpError(e) from e',
+        ))
+        _compile_phase('dump', namespace, lines)
+
+    if serializer is None:
+        if use_server_timing(method):
+            _compile_server_timing(namespace, lines)
+            lines.extend((
+                '    if isinstance(content, _Response):',
+                "        content.headers.append('server-timing', _timing)",
+            ))
+        lines.append('    return content')
+        return
+
+    namespace['_serializer'] = serializer
+    namespace['_media_type'] = serializer.media_type
+    lines.append('    body = _serializer.render(content)')
+    _compile_phase('serialize', namespace, lines)
+    if method.meta.etag:
+        namespace['_make_etag'] = make_etag if compression is None else _make_weak_etag
+        lines.extend((
+            '    if _headers is None:',
+            "        _headers = {'etag': _make_etag(body)}",
+        ))
+
+    if negotiate:
+        lines.append("    _headers = {**_headers, 'vary': 'Accept'} if _headers else {'vary': 'Accept'}")
+
+    if policy is not None:
+        lines.append('    _entry = None if _key is None else '
+                     '_cache.set(_key, body, self.status_code, _media_type, _ttl, _tags, _headers)')
+
+    if use_server_timing(method):
+        _compile_server_timing(namespace, lines)
+        lines.append("    _headers = {**_headers, 'server-timing': _timing} if _headers "
+                     "else {'server-timing': _timing}")
+
+    if method.meta.etag:
+        lines.extend((
+            '    if _not_modified(self.request, self.status_code, _headers):',
+            '        return _Response(status_code=304, headers=_headers)',
+        ))
+
+    if compression is None:
+        lines.append('    return _Response(body, media_type=_media_type, status_code=self.status_code, '
+                     'headers=_headers)')
+        return
+
+    if policy is not None:
+        lines.append('    if _entry is not None:')
+        if use_server_timing(method):
+            # the cached headers are stored without server-timing
+            lines.extend((
+                '        _response = _compressor.cached_response(self.request, _entry, _cache)',
+                "        _response.headers['server-timing'] = _timing",
+                '        return _response',
+            ))
+        else:
+            lines.append('        return _compressor.cached_response(self.request, _entry, _cache)')
+    lines.append('    return _compressor.response(self.request, body, self.status_code, _media_type, _headers)')
+
+
+def _weak_validators(etag, last_modified):
+    headers = create_validators(etag, last_modified)
+    if 'etag' in headers:
+        headers['etag'] = weak_etag(headers['etag'])
+    return headers
+
+
+def _make_weak_etag(body: bytes) -> str:
+    return weak_etag(make_etag(body))
+
+
+def _compile_phase(name: str, namespace: Dict, lines: List[str]):
+    if '_perf' not in namespace:
+        return
+
+    lines.extend((
+        '    _now = _perf()',
+        f'    _d_{name} = _now - _t',
+        '    _t = _now',
+    ))
+    phases = namespace['_phases']
+    if phases is not None:
+        namespace[f'_observe_{name}'] = phases[name].observe
+        lines.append(f'    _observe_{name}(_d_{name})')
+    namespace.setdefault('_timed', []).append(name)
+
+
+def _compile_server_timing(namespace: Dict, lines: List[str]):
+    items = ', '.join(f'{name};dur={{_d_{name} * 1000:.3f}}' for name in namespace['_timed'])
+    lines.append(f"    _timing = f'{items}'")
+
+
+def _compile_cache_lookup(method, policy: CachePolicy, args: List[str], namespace: Dict, lines: List[str]):
+    parser = getattr(method, '__parser__', None)
+    if parser is not None and parser.readers:
+        raise TypeError(f'Response cache is not supported for request body, method={method.__qualname__}')
+
+    if getattr(method, 'serializer', None) is None:
+        raise TypeError(f'Response cache requires serializer, method={method.__qualname__}')
+
+    namespace.update(
+        _cls=method,
+        _cache=default_cache if policy.store is None else policy.store,
+        _make_key=make_key,
+        _ttl=policy.ttl,
+        _tags=(method.meta.tag, *policy.tags),
+        _not_modified=is_not_modified,
+    )
+    names = {arg.split('=', 1)[0] for arg in args if '=' in arg}
+    unknown = set(policy.exclude) - names
+    if unknown:
+        raise TypeError(f'Unknown cache exclude parameters {sorted(unknown)}, method={method.__qualname__}')
+
+    if policy.key is not None:
+        namespace['_key_func'] = policy.key
+        kwargs = ', '.join(arg for arg in args if '=' in arg)
+        values = f'_key_func({kwargs}), ' + ''.join(f'{arg}, ' for arg in args if '=' not in arg)
+    else:
+        values = ''.join(f'{arg.split("=", 1)[-1]}, ' for arg in args if arg.split('=', 1)[0] not in policy.exclude)
+    lines.extend((
+        f'    _key = _make_key(_cls, ({values}))',
+        '    _entry = None if _key is None else _cache.get(_key)',
+        '    if _entry is not None:',
+        '        if _entry.headers is not None and _not_modified(self.request, _entry.status_code, _entry.headers):',
+        '            return _Response(status_code=304, headers=_entry.headers)',
+    ))
+    if getattr(method.meta, 'compression', None) is not None:
+        lines.append('        return _compressor.cached_response(self.request, _entry, _cache)')
+    else:
+        lines.append('        return _entry.response()')
+
+
+def _compile_negotiate(serializers: Sequence[Serializer], namespace: Dict, lines: List[str]):
+    namespace.update(_negotiate=negotiate, _serializers=serializers)
+    lines.extend((
+        "    _serializer = _negotiate(self.request.headers.get('accept'), _serializers)",
+        '    _media_type = _serializer.media_type',
+    ))
+
+
+def _compile_stream(method, args: List[str], namespace: Dict, lines: List[str]):
+    if getattr(method.meta, 'cache', None) is not None:
+        raise TypeError(f'Response cache is not supported for streaming, method={method.__qualname__}')
+
+    lines.append(f'    content = self.execute({", ".join(args)})')
+    namespace['_StreamingResponse'] = StreamingResponse
+    # headers are sent before the body: Server-Timing has the parse phase only, the execute
+    # histogram observes the time until the stream is exhausted, serialization included
+    headers = 'None'
+    if use_server_timing(method):
+        _compile_server_timing(namespace, lines)
+        headers = "{'server-timing': _timing}"
+
+    phases = namespace.get('_phases')
+    if phases is not None:
+        namespace.update(_observe_stream=observe_stream, _observe_execute=phases['execute'].observe)
+
+    serializer = getattr(method, 'serializer', None)
+    if serializer is None:
+        body = 'content' if phases is None else '_observe_stream(content, _observe_execute)'
+        lines.append(f'    return _StreamingResponse({body}, status_code=self.status_code, headers={headers})')
+        return
+
+    response_schema = get_response_schema(method)
+    namespace.update(
+        _stream=stream_content,
+        _serializer=serializer,
+        _media_type=serializer.media_type,
+        _dump=None if response_schema is None else dump_content(response_schema, None),
+        _batch_size=method.stream_batch_size,
+    )
+    serializers = get_serializers(method)
+    if len(serializers) > 1:
+        _compile_negotiate(serializers, namespace, lines)
+    body = '_stream(content, _serializer, _dump, _batch_size)'
+    if phases is not None:
+        body = f'_observe_stream({body}, _observe_execute)'
+    lines.append(f'    return _StreamingResponse({body}, media_type=_media_type, status_code=self.status_code, '
+                 f'headers={headers})')
+
+
+async def observe_stream(content: AsyncIterator, observe: Callable[[float], None]) -> AsyncIterator:
+    start = time.perf_counter()
+    try:
+        async for chunk in content:
+            yield chunk
+    finally:
+        observe(time.perf_counter() - start)
+
+
+def _compile_parser(method, namespace: Dict, lines: List[str]) -> List[str]:
+    parser = getattr(method, '__parser__', None)
+    if parser is None or not (parser.parsers or parser.async_parsers):
+        return []
+
+    readers = parser.readers
+    uploads = [p for (_, p) in parser.parsers if getattr(p, 'is_stream', False)]
+    streamed = uploads or any(getattr(reader, 'is_stream', False) for reader in readers)
+    if streamed and len(readers) + len(uploads) > 1:
+        raise TypeError(f'Streamed request body can not be read by other body parsers, method={method.__qualname__}')
+
+    max_body_size = getattr(method.meta, 'max_body_size', None)
+    if max_body_size is not None:
+        namespace['_read_limited'] = read_limited
+        namespace['_parse_limited'] = parse_limited
+        namespace['_max_body_size'] = max_body_size
+
+    lines.append('    request = self.request')
+    args = []
+    for i, (key, p) in enumerate(parser.parsers):
+        namespace[f'_parse_{i}'] = p.parse
+        if max_body_size is not None and getattr(p, 'is_stream', False):
+            lines.append(f'    _v{i} = _parse_limited(_parse_{i}, request, _max_body_size)')
+        else:
+            lines.append(f'    _v{i} = _parse_{i}(request)')
+        args.append(f'{key}=_v{i}')
+
+    engine = get_json_engine(method)
+    bodies = {}
+    for i, reader in enumerate(readers):
+        bodies[reader] = i
+        namespace[f'_reader_{i}'] = reader
+        namespace[f'_read_{i}'] = reader if engine is None else with_engine(reader, engine)
+        if max_body_size is None:
+            lines.append(f'    _body_{i} = await _read_{i}(request)')
+        else:
+            lines.append(f'    _body_{i} = await _read_limited(_read_{i}, request, _max_body_size)')
+
+    offset = len(parser.parsers)
+    for i, (key, p) in enumerate(parser.loaders, offset):
+        namespace[f'_load_{i}'] = p.load
+        lines.append(f'    _v{i} = _load_{i}(_body_{bodies[p.reader]})')
+        args.append(f'{key}=_v{i}')
+
+    offset += len(parser.loaders)
+    calls = []
+    for i, (key, p) in enumerate(parser.concurrent_parsers, offset):
+        if isinstance(p, RequestParser):
+            namespace[f'_parse_{i}'] = p.parse_bodies
+            calls.append(f'_parse_{i}(request, _bodies)')
+        else:
+            namespace[f'_parse_{i}'] = p.parse
+            calls.append(f'_parse_{i}(request)')
+        args.append(f'{key}=_v{i}')
+
+    if any(isinstance(p, RequestParser) for (_, p) in parser.concurrent_parsers):
+        items = ', '.join(f'_reader_{i}: _body_{i}' for i in bodies.values())
+        lines.append(f'    _bodies = {{{items}}}')
+
+    if len(calls) == 1:
+        lines.append(f'    _v{offset} = await {calls[0]}')
+    elif calls:
+        namespace['_gather'] = gather
+        names = ', '.join(f'_v{i}' for i in range(offset, offset + len(calls)))
+        lines.append(f'    {names} = await _gather({", ".join(calls)})')
+
+    return args
+
+
+def get_json_engine(method):
+    """Engine of the json serializer created by ``JsonSerializer.using`` for the endpoint."""
+    for serializer in get_serializers(method):
+        if (isinstance(serializer, type) and issubclass(serializer, JsonSerializer)
+                and serializer is not JsonSerializer and 'engine' in vars(serializer)):
+            return serializer.engine
+    return None
@@ -0,0 +1,193 @@
+import itertools
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type, get_value
+
+from star_resty.compat import has_processors
+
+__all__ = ('compile_dumper',)
+
+
+@lru_cache(maxsize=1024)
+def compile_dumper(schema: Schema) -> Callable[[Any], Any]:
+    """Compile a function with the same result as ``schema.dump(obj)``.
+
+    Fields are read with direct key or attribute access, primitive
+    fields are converted inline and nested schemas are compiled
+    recursively. Schemas with dump hooks, overridden ``dump`` or
+    ``get_attribute`` or ordered output are dumped by marshmallow.
+    """
+    dump = _compile_schema(schema, set())
+    if dump is None:
+        return schema.dump
+
+    if schema.many:
+        return _dump_many(dump)
+
+    return dump
+
+
+def _dump_many(dump: Callable) -> Callable:
+    def dump_many(objs):
+        return [dump(obj) for obj in objs]
+
+    return dump_many
+
+
+def _is_supported(schema: Schema) -> bool:
+    schema_cls = type(schema)
+    return (schema_cls.dump is Schema.dump
+            and schema_cls._serialize is Schema._serialize
+            and schema_cls.get_attribute is Schema.get_attribute
+            and not has_processors(schema, PRE_DUMP)
+            and not has_processors(schema, POST_DUMP)
+            and getattr(schema, 'dict_class', dict) is dict)
+
+
+def _compile_schema(schema: Schema, stack: Set[type]) -> Optional[Callable]:
+    if type(schema) in stack or not _is_supported(schema):
+        return None
+
+    stack.add(type(schema))
+    try:
+        return _SchemaCompiler(schema, stack).compile()
+    finally:
+        stack.discard(type(schema))
+
+
+def _dump_default(field: fields.Field) -> Any:
+    try:
+        return field.dump_default
+    except AttributeError:
+        return field.default
+
+
+class _SchemaCompiler:
+    __slots__ = ('schema', 'stack', 'namespace', 'names')
+
+    def __init__(self, schema: Schema, stack: Set[type]):
+        self.schema = schema
+        self.stack = stack
+        self.namespace = {
+            '_missing': missing,
+            '_get_value': get_value,
+            '_get_attribute': schema.get_attribute,
+            '_text': ensure_text_type,
+        }
+        self.names = itertools.count()
+
+    def compile(self) -> Callable:
+        body = {'dict': [], 'attr': [], 'item': []}
+        for attr_name, field in self.schema.dump_fields.items():
+            check_key, lines = self._compile_field(attr_name, field)
+            for access, branch in body.items():
+                if check_key is not None:
+                    branch.extend(self._compile_get(check_key, access))
+                branch.extend(lines)
+
+        lines = [
+            'def dump(obj):',
+            '    ret = {}',
+            '    if obj.__class__ is dict:',
+            *(f'        {line}' for line in body['dict'] or ['pass']),
+            "    elif not hasattr(obj, '__getitem__'):",
+            *(f'        {line}' for line in body['attr'] or ['pass']),
+            '    else:',
+            *(f'        {line}' for line in body['item'] or ['pass']),
+            '    return ret',
+        ]
+        source = '\n'.join(lines)
+        schema_cls = type(self.schema)
+        code = compile(source, f'<dump {schema_cls.__module__}.{schema_cls.__qualname__}>', 'exec')
+        exec(code, self.namespace)
+        dump = self.namespace['dump']
+        dump.__source__ = source
+        return dump
+
+    def _name(self, prefix: str, value: Any) -> str:
+        name = f'_{prefix}_{next(self.names)}'
+        self.namespace[name] = value
+        return name
+
+    def _compile_field(self, attr_name: str, field: fields.Field) -> Tuple[Optional[str], List[str]]:
+        key = field.data_key if field.data_key is not None else attr_name
+        if (not field._CHECK_ATTRIBUTE
+                or type(field).serialize is not fields.Field.serialize
+                or type(field).get_value is not fields.Field.get_value):
+            name = self._name('field', field)
+            return None, [
+                f'v = {name}.serialize({attr_name!r}, obj, accessor=_get_attribute)',
+                'if v is not _missing:',
+                f'    ret[{key!r}] = v',
+            ]
+
+        check_key = field.attribute if field.attribute is not None else attr_name
+        expr = self._compile_value(field, 'v', attr_name)
+        default = _dump_default(field)
+        if default is missing:
+            return check_key, [
+                'if v is not _missing:',
+                f'    ret[{key!r}] = {expr}',
+            ]
+
+        name = self._name('default', default)
+        return check_key, [
+            'if v is _missing:',
+            f'    v = {name}()' if callable(default) else f'    v = {name}',
+            f'ret[{key!r}] = {expr}',
+        ]
+
+    @staticmethod
+    def _compile_get(key: str, access: str) -> List[str]:
+        if not isinstance(key, str) or '.' in key or access == 'item':
+            return [f'v = _get_value(obj, {key!r}, _missing)']
+
+        if access == 'attr':
+            return [f'v = getattr(obj, {key!r}, _missing)']
+
+        if not hasattr(dict, key):
+            return [f'v = obj.get({key!r}, _missing)']
+
+        return [
+            f'v = obj.get({key!r}, _missing)',
+            'if v is _missing:',
+            f'    v = getattr(obj, {key!r}, _missing)',
+        ]
+
+    def _compile_value(self, field: fields.Field, var: str, attr_name: str) -> str:
+        field_cls = type(field)
+        if field_cls is fields.Raw:
+            return var
+
+        if field_cls is fields.String:
+            return f'(None if {var} is None else ({var} if {var}.__class__ is str else _text({var})))'
+
+        if field_cls in (fields.Integer, fields.Float) and not field.as_string:
+            num_type = field.num_type.__name__
+            return f'(None if {var} is None else ({var} if {var}.__class__ is {num_type} else {num_type}({var})))'
+
+        if (field_cls is fields.Boolean and field.truthy is fields.Boolean.truthy
+                and field.falsy is fields.Boolean.falsy):
+            name = self._name('field', field)
+            return (f'(None if {var} is None else ({var} if {var} is True or {var} is False '
+                    f'else {name}._serialize({var}, {attr_name!r}, obj)))')
+
+        if field_cls is fields.Nested:
+            schema = field.schema
+            dump = _compile_schema(schema, self.stack)
+            if dump is not None:
+                if schema.many or field.many:
+                    dump = _dump_many(dump)
+                name = self._name('nested', dump)
+                return f'(None if {var} is None else {name}({var}))'
+
+        if field_cls is fields.List:
+            inner = f'{var}_'
+            expr = self._compile_value(field.inner, inner, attr_name)
+            return f'(None if {var} is None else [{expr} for {inner} in {var}])'
+
+        name = self._name('field', field)
+        return f'{name}._serialize({var}, {attr_name!r}, obj)'
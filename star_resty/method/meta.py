@@ -1,5 +1,8 @@
 import abc
+import time
+import tracemalloc
 
+from .dispatch import create_dispatch
 from .parser import create_parser
 from .render import create_render
 
@@ -15,6 +18,13 @@ class MethodMeta(abc.ABCMeta):
         if func is None:
             raise TypeError(f'Invalid method class={name}')
 
+        # the compile cost is reported by star_resty.prepare, the memory only when tracemalloc is tracing
+        tracing = tracemalloc.is_tracing()
+        memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
         cls.__parser__ = create_parser(func)
         cls.__render__ = create_render(cls)
+        cls.__dispatch__ = create_dispatch(cls)
+        cls.__compile_seconds__ = time.perf_counter() - start
+        cls.__compile_memory__ = max(tracemalloc.get_traced_memory()[0] - memory, 0) if tracing else 0
         return cls
@@ -1,6 +1,7 @@
 import abc
+from datetime import datetime
 from functools import wraps
-from typing import ClassVar, Type, Union, Optional, Callable, Any
+from typing import ClassVar, Type, Union, Optional, Callable, Any, Awaitable, Sequence
 
 from marshmallow import Schema
 from starlette.requests import Request
@@ -8,6 +9,7 @@ from starlette.responses import Response
 
 from star_resty.operation import Operation
 from star_resty.serializers import JsonSerializer, Serializer
+from .conditional import create_validators, is_not_modified
 from .meta import MethodMeta
 
 __all__ = ('Method', 'endpoint')
@@ -17,12 +19,17 @@ class Method(abc.ABC, metaclass=MethodMeta):
     __slots__ = ('request',)
     __parser__: ClassVar[Callable[[Request], Any]]
     __render__: ClassVar[Callable[[Any], Response]]
+    __dispatch__: ClassVar[Callable[['Method'], Awaitable[Response]]]
 
     meta: ClassVar[Operation] = Operation(tag='default')
     serializer: ClassVar[Serializer] = JsonSerializer
+    serializers: ClassVar[Sequence[Serializer]] = ()
     response_schema: ClassVar[Union[Schema, Type[Schema], None]] = None
     Response: ClassVar[Optional[Type[Schema]]] = None
     status_code: int = 200
+    etag: Optional[str] = None
+    last_modified: Union[datetime, float, None] = None
+    stream_batch_size: ClassVar[int] = 100
 
     def __init__(self, request: Request):
         self.request = request
@@ -31,10 +38,13 @@ class Method(abc.ABC, metaclass=MethodMeta):
     async def execute(self, *args, **kwargs):
         pass
 
+    @property
+    def not_modified(self) -> bool:
+        return is_not_modified(self.request, self.status_code,
+                               create_validators(self.etag, self.last_modified))
+
     async def dispatch(self) -> Response:
-        params = await self.__parser__.parse(self.request)
-        content = await self.execute(**params)
-        return self.__render__(content, self)
+        return await self.__dispatch__()
 
     @classmethod
     def as_endpoint(cls):
@@ -42,10 +52,17 @@ class Method(abc.ABC, metaclass=MethodMeta):
 
 
 def endpoint(cls: Type[Method]):
-    @wraps(cls)
-    async def wrapper(request: Request) -> Response:
-        method = cls(request)
-        return await method.dispatch()
+    if cls.dispatch is not Method.dispatch:
+        dispatch = cls.dispatch
+
+        @wraps(cls)
+        async def wrapper(request: Request) -> Response:
+            return await dispatch(cls(request))
+    else:
+        # looked up on every call, so the dispatch can be replaced at runtime (e.g. by the profiler)
+        @wraps(cls)
+        async def wrapper(request: Request) -> Response:
+            return await cls.__dispatch__(cls(request))
 
     wrapper.__endpoint__ = cls
     return wrapper
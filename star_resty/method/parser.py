@@ -1,12 +1,14 @@
+import asyncio
 import inspect
 import itertools
 from dataclasses import is_dataclass, fields
 from functools import partial
-from typing import Dict, Tuple, Sequence, Generator, Mapping, Generic, TypeVar, Type, Callable, Optional, Any, Union
+from typing import (Dict, Tuple, Sequence, Generator, Mapping, Generic, TypeVar, Type, Callable, Optional, Any, Union,
+                    Awaitable, List)
 
 from starlette.requests import Request
 
-from star_resty.payload.base import Parser
+from star_resty.payload.base import BodyParser, Parser
 
 __all__ = ('RequestParser', 'create_parser')
 
@@ -14,16 +16,39 @@ D = TypeVar('D')
 
 
 class RequestParser:
-    __slots__ = ('_parsers', '_async_parsers')
+    __slots__ = ('_parsers', '_async_parsers', '_loaders', '_concurrent', '_readers')
 
     def __init__(self, parsers: Sequence[Tuple[str, Union[Parser, 'RequestParser']]] = (),
                  async_parsers: Sequence[Tuple[str, Union[Parser, 'RequestParser']]] = ()):
         self._parsers = parsers
         self._async_parsers = async_parsers
+        self._loaders = tuple((key, p) for (key, p) in async_parsers if isinstance(p, BodyParser))
+        self._concurrent = tuple((key, p) for (key, p) in async_parsers if not isinstance(p, BodyParser))
+        self._readers = tuple(dict.fromkeys(p.reader for p in self if isinstance(p, BodyParser)))
 
     def __nonzero__(self):
         return bool(self._parsers or self._async_parsers)
 
+    @property
+    def parsers(self) -> Sequence[Tuple[str, Union[Parser, 'RequestParser']]]:
+        return self._parsers
+
+    @property
+    def async_parsers(self) -> Sequence[Tuple[str, Union[Parser, 'RequestParser']]]:
+        return self._async_parsers
+
+    @property
+    def loaders(self) -> Sequence[Tuple[str, BodyParser]]:
+        return self._loaders
+
+    @property
+    def concurrent_parsers(self) -> Sequence[Tuple[str, Union[Parser, 'RequestParser']]]:
+        return self._concurrent
+
+    @property
+    def readers(self) -> Sequence[Callable[[Request], Awaitable]]:
+        return self._readers
+
     def __iter__(self) -> Generator[Parser, None, None]:
         parsers = itertools.chain(self._parsers, self._async_parsers)
         for (_, p) in parsers:
@@ -33,27 +58,103 @@ class RequestParser:
                 yield p
 
     async def parse(self, request: Request) -> Dict:
+        bodies = {}
+        for reader in self._readers:
+            bodies[reader] = await reader(request)
+
+        return await self.parse_bodies(request, bodies)
+
+    async def parse_bodies(self, request: Request, bodies: Mapping) -> Dict:
         params = {}
         for (key, p) in self._parsers:
             params[key] = p.parse(request)
 
-        for (key, p) in self._async_parsers:
-            params[key] = await p.parse(request)
+        for (key, p) in self._loaders:
+            params[key] = p.load(bodies[p.reader])
+
+        concurrent = self._concurrent
+        if len(concurrent) == 1:
+            key, p = concurrent[0]
+            params[key] = await parse_async(p, request, bodies)
+        elif concurrent:
+            values = await gather(*(parse_async(p, request, bodies) for (_, p) in concurrent))
+            for ((key, _), value) in zip(concurrent, values):
+                params[key] = value
 
         return params
 
 
 class DataClassParser(RequestParser, Generic[D]):
-    __slots__ = ('_data_cls',)
+    """Parser of the dataclass parameter.
+
+    Parsers of nested dataclasses are flattened on creation: the leaf
+    parsers of the whole tree are called once per request and the
+    dataclasses are built by the compiled function.
+    """
+    __slots__ = ('_data_cls', '_items', '_build')
 
     def __init__(self, data_cls: Type[D], parsers: Sequence[Tuple[str, Parser]] = (),
                  async_parsers: Sequence[Tuple[str, Parser]] = ()):
-        super().__init__(parsers=parsers, async_parsers=async_parsers)
+        items = (*parsers, *async_parsers)
+        super().__init__(parsers=tuple(_flatten(items, 'parsers')),
+                         async_parsers=tuple(_flatten(items, 'async_parsers')))
         self._data_cls = data_cls
+        self._items = items
+        self._build = compile_builder(self)
+
+    async def parse_bodies(self, request: Request, bodies: Mapping) -> D:
+        return self._build(await super().parse_bodies(request, bodies))
+
+
+def _flatten(items: Sequence[Tuple[str, Parser]], attr: str) -> Generator[Tuple[str, Parser], None, None]:
+    is_async = attr == 'async_parsers'
+    for (key, p) in items:
+        if isinstance(p, DataClassParser):
+            for (name, leaf) in getattr(p, attr):
+                yield f'{key}.{name}', leaf
+        elif inspect.iscoroutinefunction(p.parse) is is_async:
+            yield key, p
+
+
+def compile_builder(parser: DataClassParser) -> Callable[[Mapping], Any]:
+    """Compile the function building the dataclass tree from the flat params of the parser."""
+    namespace = {}
+
+    def build(p: DataClassParser, prefix: str) -> str:
+        name = f'_cls_{len(namespace)}'
+        namespace[name] = p._data_cls
+        args = []
+        for (key, item) in p._items:
+            if isinstance(item, DataClassParser):
+                args.append(f'{key}={build(item, f"{prefix}{key}.")}')
+            else:
+                args.append(f'{key}=params[{prefix + key!r}]')
+
+        return f'{name}({", ".join(args)})'
+
+    source = f'def build(params):\n    return {build(parser, "")}'
+    data_cls = parser._data_cls
+    exec(compile(source, f'<build {data_cls.__module__}.{data_cls.__qualname__}>', 'exec'), namespace)
+    func = namespace['build']
+    func.__source__ = source
+    return func
+
+
+def parse_async(parser: Union[Parser, RequestParser], request: Request, bodies: Mapping) -> Awaitable:
+    if isinstance(parser, RequestParser):
+        return parser.parse_bodies(request, bodies)
 
-    async def parse(self, request: Request) -> D:
-        params = await super().parse(request)
-        return self._data_cls(**params)
+    return parser.parse(request)
+
+
+async def gather(*aws: Awaitable) -> List:
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
 
 def create_parser(func) -> RequestParser:
@@ -69,9 +170,7 @@ def create_parser_from_data(data: Mapping) -> RequestParser:
     for key, value in data.items():
         parser = getattr(value, 'parser', None)
         if parser is None and is_dataclass(value):
-            data = {field.name: field.type for field in fields(value)}
-            factory = partial(DataClassParser, value)
-            parser = create_parser_for_dc(data, factory=factory)
+            parser = create_parser_for_dc(get_dataclass_fields(value), factory=partial(DataClassParser, value))
 
         if parser is None or not isinstance(parser, (Parser, RequestParser)):
             continue
@@ -89,9 +188,7 @@ def create_parser_for_dc(data: Mapping, factory: Callable) -> RequestParser:
     async_parsers = []
     for key, value in data.items():
         if is_dataclass(value):
-            data = {field.name: field.type for field in fields(value)}
-            factory = partial(DataClassParser, value)
-            parser = create_parser_for_dc(data, factory=factory)
+            parser = create_parser_for_dc(get_dataclass_fields(value), factory=partial(DataClassParser, value))
         else:
             parser = getattr(value, 'parser', None)
 
@@ -109,6 +206,10 @@ def create_parser_for_dc(data: Mapping, factory: Callable) -> RequestParser:
     return factory(parsers=parsers, async_parsers=async_parsers)
 
 
+def get_dataclass_fields(data_cls: type) -> Dict[str, Any]:
+    return {field.name: field.type for field in fields(data_cls) if field.init}
+
+
 def get_parser_from_args(value: Any) -> Optional[Parser]:
     args = getattr(value, '__args__', None) or ()
     for a in args:
@@ -1,27 +1,28 @@
 import inspect
 import logging
-from typing import Sequence, Callable, Any
+from functools import lru_cache
+from typing import Sequence, Callable, Any, Optional, Type, AsyncIterator
 
 from marshmallow import Schema
 from marshmallow.exceptions import MarshmallowError
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 from star_resty.exceptions import DumpError
+from star_resty.serializers import Serializer
+from .dumper import compile_dumper
 
-__all__ = ('create_render', 'Render')
+__all__ = ('create_render', 'get_response_schema', 'get_serializers', 'is_stream', 'stream_content', 'Render')
 
 logger = logging.getLogger(__name__)
 
 
 def create_render(method) -> 'Render':
-    renders = []
-    response_schema = getattr(method, 'response_schema', None)
-    if response_schema is None:
-        response_schema = getattr(method, 'Response', None)
+    response_schema = get_response_schema(method)
+    if is_stream(method):
+        return Render([render_stream(getattr(method, 'serializer', None), response_schema, method)])
 
+    renders = []
     if response_schema is not None:
-        if inspect.isclass(response_schema):
-            response_schema = response_schema()
         renders.append(dump_content(response_schema, None))
 
     serializer = getattr(method, 'serializer', None)
@@ -31,6 +32,34 @@ def create_render(method) -> 'Render':
     return Render(renders)
 
 
+def get_response_schema(method) -> Optional[Schema]:
+    response_schema = getattr(method, 'response_schema', None)
+    if response_schema is None:
+        response_schema = getattr(method, 'Response', None)
+
+    if response_schema is not None and inspect.isclass(response_schema):
+        response_schema = _create_schema(response_schema)
+
+    return response_schema
+
+
+def get_serializers(method) -> Sequence[Serializer]:
+    serializer = getattr(method, 'serializer', None)
+    if serializer is None:
+        return ()
+
+    return (serializer, *(getattr(method, 'serializers', None) or ()))
+
+
+def is_stream(method) -> bool:
+    return inspect.isasyncgenfunction(getattr(method, 'execute', None))
+
+
+@lru_cache(maxsize=1024)
+def _create_schema(schema_cls: Type[Schema]) -> Schema:
+    return schema_cls()
+
+
 class Render:
     __slots__ = ('_renders',)
 
@@ -53,10 +82,60 @@ def render_bytes(serializer, method):
     return render
 
 
+def render_stream(serializer, response_schema: Optional[Schema], method):
+    batch_size = method.stream_batch_size
+    if response_schema is not None:
+        dump = dump_content(response_schema, None)
+    else:
+        dump = None
+
+    if serializer is None:
+        def render(content, method):
+            return StreamingResponse(content, status_code=method.status_code)
+    else:
+        def render(content, method):
+            return StreamingResponse(stream_content(content, serializer, dump, batch_size),
+                                     media_type=serializer.media_type,
+                                     status_code=method.status_code)
+
+    return render
+
+
+async def stream_content(content: AsyncIterator, serializer, dump: Optional[Callable],
+                         batch_size: int) -> AsyncIterator[bytes]:
+    """Serialize items of the async iterator and yield them in batches.
+
+    Batches are framed by ``stream_start``, ``stream_separator`` and
+    ``stream_end`` of the serializer, a json array by default.
+    """
+    render = serializer.render
+    separator = getattr(serializer, 'stream_separator', b',')
+    prefix = getattr(serializer, 'stream_start', b'[')
+    end = getattr(serializer, 'stream_end', b']')
+    items = []
+    async for item in content:
+        if dump is not None:
+            item = dump(item, None)
+        items.append(render(item))
+        if len(items) >= batch_size:
+            yield prefix + separator.join(items)
+            prefix = separator
+            items = []
+
+    if items:
+        yield prefix + separator.join(items) + end
+    elif prefix is separator:
+        yield end
+    else:
+        yield prefix + end
+
+
 def dump_content(response_schema: Schema, _) -> Callable:
+    dump_schema = compile_dumper(response_schema)
+
     def dump(content, _):
         try:
-            return response_schema.dump(content)
+            return dump_schema(content)
         except MarshmallowError as e:
             logger.error('Dump error: %s', e)
             raise DumpError(e) from e
@@ -0,0 +1,123 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+
+__all__ = ('Histogram', 'MetricsRegistry', 'configure', 'default_registry', 'setup_metrics', 'PHASES')
+
+PHASES = ('parse', 'execute', 'dump', 'serialize')
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                   5.0, 10.0)
+
+
+class Histogram:
+    """Histogram of durations in seconds with cumulative buckets of Prometheus."""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        total = 0
+        for (bound, count) in zip(self.buckets, self.counts):
+            total += count
+            yield repr(bound), total
+
+        yield '+Inf', self.count
+
+
+class MetricsRegistry:
+    """Latency histograms of the request phases by endpoint."""
+
+    name = 'star_resty_phase_seconds'
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def histogram(self, endpoint: str, phase: str) -> Histogram:
+        key = (endpoint, phase)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets)
+
+        return histogram
+
+    def clear(self):
+        self._histograms.clear()
+
+    def render(self) -> str:
+        """Histograms in the text exposition format of Prometheus."""
+        name = self.name
+        lines = [
+            f'# HELP {name} Latency of the request phases of the endpoints.',
+            f'# TYPE {name} histogram',
+        ]
+        for ((endpoint, phase), histogram) in sorted(self._histograms.items(), key=lambda item: item[0]):
+            labels = f'endpoint="{_escape(endpoint)}",phase="{phase}"'
+            for (bound, count) in histogram.cumulative():
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum!r}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+default_registry = MetricsRegistry()
+
+_enabled = False
+_server_timing = False
+_registry = default_registry
+
+
+def configure(enabled: bool = True, server_timing: bool = False, registry: Optional[MetricsRegistry] = None):
+    """Set the defaults for endpoints without ``metrics`` and ``server_timing`` in ``Operation``.
+
+    Endpoints are compiled on definition, so the defaults apply to the
+    endpoints defined after the call. Endpoints without metrics have no
+    timing code at all.
+    """
+    global _enabled, _server_timing, _registry
+    _enabled = enabled
+    _server_timing = server_timing
+    _registry = registry or default_registry
+
+
+def get_phases(method) -> Optional[Dict[str, Histogram]]:
+    """Histograms of the phases of the method or ``None`` if metrics are disabled."""
+    enabled = getattr(method.meta, 'metrics', None)
+    if not (_enabled if enabled is None else enabled):
+        return None
+
+    endpoint = f'{method.__module__}.{method.__qualname__}'
+    return {phase: _registry.histogram(endpoint, phase) for phase in PHASES}
+
+
+def use_server_timing(method) -> bool:
+    server_timing = getattr(method.meta, 'server_timing', None)
+    return _server_timing if server_timing is None else server_timing
+
+
+def setup_metrics(app: Starlette, route: str = '/metrics', registry: Optional[MetricsRegistry] = None):
+    """Serve the histograms of the registry for Prometheus."""
+    registry = registry or default_registry
+
+    def metrics(_: Request):
+        return Response(registry.render(), media_type='text/plain; version=0.0.4; charset=utf-8')
+
+    app.add_route(route, metrics, include_in_schema=False)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 from typing import Optional, Sequence, Any, Mapping
 
+from star_resty.cache import CachePolicy
+from star_resty.compression import Compression
+
 __all__ = ('Operation',)
 
 
@@ -12,6 +15,12 @@ class Operation:
     errors: Sequence[Any] = ()
     security: Optional[Sequence] = None
     meta: Optional[Mapping] = None
+    cache: Optional[CachePolicy] = None
+    etag: bool = False
+    compression: Optional[Compression] = None
+    max_body_size: Optional[int] = None
+    metrics: Optional[bool] = None
+    server_timing: Optional[bool] = None
 
     @classmethod
     def create(cls,
@@ -20,7 +29,15 @@ class Operation:
                summary: Optional[str] = None,
                errors: Sequence[Any] = (),
                security: Optional[Sequence] = None,
+               cache: Optional[CachePolicy] = None,
+               etag: bool = False,
+               compression: Optional[Compression] = None,
+               max_body_size: Optional[int] = None,
+               metrics: Optional[bool] = None,
+               server_timing: Optional[bool] = None,
                **kwargs) -> 'Operation':
         return cls(tag=tag, description=description,
                    summary=summary, errors=errors,
-                   security=security, meta=kwargs)
+                   security=security, meta=kwargs, cache=cache, etag=etag,
+                   compression=compression, max_body_size=max_body_size,
+                   metrics=metrics, server_timing=server_timing)
@@ -1,6 +1,31 @@
+import importlib
+
+from .body import set_max_body_size
 from .form import form_payload, form_schema
 from .header import header, header_schema
 from .json import json_payload, json_schema
 from .path import path, path_schema
 from .query import query, query_schema
-from .upload import upload
+
+__all__ = ('set_max_body_size', 'form_payload', 'form_schema', 'header', 'header_schema', 'json_payload',
+           'json_schema', 'path', 'path_schema', 'query', 'query_schema', 'upload', 'upload_stream')
+
+# multipart support is imported on the first access
+_LAZY = {
+    'upload': '.uploads',
+    'upload_stream': '.uploads',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
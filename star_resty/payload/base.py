@@ -1,12 +1,14 @@
 import abc
 import inspect
-from functools import lru_cache
-from typing import Dict, Optional, Type, Union, Iterable, Mapping, Tuple
+from functools import lru_cache, partial
+from typing import Dict, Optional, Type, Union, Iterable, Mapping, Tuple, Callable, Awaitable, Any
 
 from marshmallow import EXCLUDE, Schema
 from starlette.requests import Request
 
-__all__ = ('Parser', 'SchemaParser', 'set_parser')
+from .loader import compile_loader
+
+__all__ = ('Parser', 'BodyParser', 'SchemaParser', 'set_parser')
 
 
 class Parser(abc.ABC):
@@ -36,14 +38,39 @@ class Parser(abc.ABC):
     def is_body(self) -> bool:
         return self.location == 'body'
 
+    @property
+    def is_stream(self) -> bool:
+        """Parser reads the request body as a stream."""
+        return False
+
+
+class BodyParser(Parser, metaclass=abc.ABCMeta):
+    """Parser of the decoded request body.
+
+    The body is read and decoded by ``reader`` once per request and
+    the result is shared between all body parsers of the endpoint.
+    """
+    __slots__ = ()
+
+    @property
+    @abc.abstractmethod
+    def reader(self) -> Callable[[Request], Awaitable[Any]]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def load(self, data: Any):
+        raise NotImplementedError
+
+    async def parse(self, request: Request):
+        return self.load(await self.reader(request))
 
 
 class SchemaParser(Parser, metaclass=abc.ABCMeta):
-    __slots__ = ('schema', 'unknown')
+    __slots__ = ('schema', 'unknown', 'loader')
 
     @classmethod
-    def create(cls, schema: Union[Schema, Type[Schema]], unknown: str = EXCLUDE):
-        return cls(cls._convert_schema(schema), unknown)
+    def create(cls, schema: Union[Schema, Type[Schema]], unknown: str = EXCLUDE, compiled: bool = False):
+        return cls(cls._convert_schema(schema), unknown, compiled=compiled)
 
     @staticmethod
     @lru_cache(maxsize=1024)
@@ -58,9 +85,16 @@ class SchemaParser(Parser, metaclass=abc.ABCMeta):
 
         return schema
 
-    def __init__(self, schema: Schema, unknown=EXCLUDE):
+    def __init__(self, schema: Schema, unknown=EXCLUDE, compiled: bool = False):
         self.schema = schema
         self.unknown = unknown
+        self.loader = self.create_loader(compiled)
+
+    def create_loader(self, compiled: bool) -> Callable[[Any], Any]:
+        if compiled:
+            return compile_loader(self.schema, self.unknown)
+
+        return partial(self.schema.load, unknown=self.unknown)
 
     def get_spec(self):
         yield {'in': self.location, 'schema': self.schema}
@@ -0,0 +1,77 @@
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from starlette.requests import Request
+
+from star_resty.exceptions import PayloadTooLarge
+
+__all__ = ('get_max_body_size', 'set_max_body_size', 'read_body', 'iter_body', 'read_limited', 'parse_limited')
+
+_default_max_body_size: Optional[int] = None
+_max_body_size: ContextVar[Optional[int]] = ContextVar('max_body_size', default=None)
+
+
+def set_max_body_size(size: Optional[int]):
+    """Set the default limit of request bodies of the application, ``None`` is unlimited."""
+    global _default_max_body_size
+    _default_max_body_size = size
+
+
+def get_max_body_size() -> Optional[int]:
+    size = _max_body_size.get()
+    return _default_max_body_size if size is None else size
+
+
+async def read_limited(reader: Callable[[Request], Awaitable], request: Request, max_size: int):
+    """Call the body reader with the limit of the endpoint."""
+    token = _max_body_size.set(max_size)
+    try:
+        return await reader(request)
+    finally:
+        _max_body_size.reset(token)
+
+
+def parse_limited(parse: Callable[[Request], Any], request: Request, max_size: int):
+    """Call the parser of a streamed body with the limit of the endpoint."""
+    token = _max_body_size.set(max_size)
+    try:
+        return parse(request)
+    finally:
+        _max_body_size.reset(token)
+
+
+async def read_body(request: Request) -> bytes:
+    max_size = get_max_body_size()
+    if max_size is None:
+        return await request.body()
+
+    chunks = []
+    async for chunk in iter_body(request, max_size):
+        chunks.append(chunk)
+
+    body = b''.join(chunks)
+    request._body = body
+    return body
+
+
+async def iter_body(request: Request, max_size: Optional[int]) -> AsyncIterator[bytes]:
+    """Iterate over the chunks of the request body.
+
+    Requests with ``Content-Length`` above the limit are rejected before
+    reading, others as soon as the received size exceeds the limit.
+    """
+    if max_size is None:
+        async for chunk in request.stream():
+            yield chunk
+        return
+
+    content_length = request.headers.get('content-length')
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_size:
+        raise PayloadTooLarge(max_size)
+
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_size:
+            raise PayloadTooLarge(max_size)
+        yield chunk
@@ -1,28 +1,52 @@
 import types
-from typing import Mapping, Type, TypeVar, Union
+from typing import AsyncIterator, Mapping, Type, TypeVar, Union
 
 from marshmallow import EXCLUDE, Schema
 from starlette.requests import Request
 
-from star_resty.exceptions import DecodeError
-from .base import SchemaParser, set_parser
+from star_resty.exceptions import DecodeError, PayloadTooLarge
+from .base import BodyParser, SchemaParser, set_parser
+from .body import get_max_body_size, iter_body
 
-__all__ = ('form_schema', 'form_payload', 'FormParser')
+__all__ = ('form_schema', 'form_payload', 'FormParser', 'read_form')
 
 P = TypeVar('P')
 
 
 def form_schema(schema: Union[Schema, Type[Schema]], cls: P,
-                unknown: str = EXCLUDE) -> P:
+                unknown: str = EXCLUDE, compiled: bool = False) -> P:
     return types.new_class('FormDataInputParams', (cls,),
-                           exec_body=set_parser(FormParser.create(schema, unknown=unknown)))
+                           exec_body=set_parser(FormParser.create(schema, unknown=unknown, compiled=compiled)))
 
 
-def form_payload(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE) -> Type[Mapping]:
-    return form_schema(schema, Mapping, unknown=unknown)
+def form_payload(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE, compiled: bool = False) -> Type[Mapping]:
+    return form_schema(schema, Mapping, unknown=unknown, compiled=compiled)
 
 
-class FormParser(SchemaParser):
+async def read_form(request: Request):
+    max_size = get_max_body_size()
+    form_request = request if max_size is None else LimitedRequest(request, max_size)
+    try:
+        return await form_request.form()
+    except PayloadTooLarge:
+        raise
+    except Exception as e:
+        raise DecodeError('Invalid form data: %s' % (str(e))) from e
+
+
+class LimitedRequest(Request):
+    """Request with the body stream limited for the form parser of starlette."""
+
+    def __init__(self, request: Request, max_size: int):
+        super().__init__(request.scope, request.receive)
+        self._request = request
+        self._max_size = max_size
+
+    def stream(self) -> AsyncIterator[bytes]:
+        return iter_body(self._request, self._max_size)
+
+
+class FormParser(SchemaParser, BodyParser):
     __slots__ = ()
 
     @property
@@ -33,10 +57,9 @@ class FormParser(SchemaParser):
     def media_type(self):
         return 'multipart/form-data'
 
-    async def parse(self, request: Request):
-        try:
-            form_data = await request.form()
-        except Exception as e:
-            raise DecodeError('Invalid form data: %s' % (str(e))) from e
+    @property
+    def reader(self):
+        return read_form
 
-        return self.schema.load(form_data, unknown=self.unknown)
+    def load(self, form_data):
+        return self.loader(form_data)
@@ -1,5 +1,5 @@
 import types
-from typing import Mapping, Type, TypeVar, Union
+from typing import Dict, Mapping, Tuple, Type, TypeVar, Union
 
 from marshmallow import EXCLUDE, Schema
 from starlette.requests import Request
@@ -12,21 +12,54 @@ P = TypeVar('P')
 
 
 def header_schema(schema: Union[Schema, Type[Schema]], cls: P,
-                  unknown=EXCLUDE) -> P:
+                  unknown=EXCLUDE, compiled: bool = False) -> P:
     return types.new_class('HeaderInputParams', (cls,),
-                           exec_body=set_parser(HeaderParser.create(schema, unknown=unknown)))
+                           exec_body=set_parser(HeaderParser.create(schema, unknown=unknown, compiled=compiled)))
 
 
-def header(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE) -> Type[Mapping]:
-    return header_schema(schema, Mapping, unknown=unknown)
+def header(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE, compiled: bool = False) -> Type[Mapping]:
+    return header_schema(schema, Mapping, unknown=unknown, compiled=compiled)
 
 
 class HeaderParser(SchemaParser):
-    __slots__ = ()
+    """Parser of the request headers.
+
+    With ``unknown=EXCLUDE`` only the declared headers are taken from
+    the raw ASGI headers, the first value of the repeated header is used
+    like ``Headers.get`` does.
+    """
+    __slots__ = ('names',)
+
+    def __init__(self, schema: Schema, unknown=EXCLUDE, compiled: bool = False):
+        super().__init__(schema, unknown, compiled=compiled)
+        self.names = get_header_names(schema) if unknown == EXCLUDE else None
 
     @property
     def location(self):
         return 'header'
 
     def parse(self, request: Request):
-        return self.schema.load(request.headers, unknown=self.unknown)
+        names = self.names
+        if names is None:
+            return self.loader(request.headers)
+
+        data = {}
+        for (name, value) in request.scope['headers']:
+            keys = names.get(name)
+            if keys is not None and keys[0] not in data:
+                value = value.decode('latin-1')
+                for key in keys:
+                    data[key] = value
+
+        return self.loader(data)
+
+
+def get_header_names(schema: Schema) -> Dict[bytes, Tuple[str, ...]]:
+    """Lower-cased raw names of the declared headers mapped to the keys of the schema."""
+    names: Dict[bytes, Tuple[str, ...]] = {}
+    for (attr_name, field) in schema.load_fields.items():
+        key = field.data_key if field.data_key is not None else attr_name
+        name = key.lower().encode('latin-1')
+        names[name] = names.get(name, ()) + (key,)
+
+    return names
@@ -1,30 +1,111 @@
 import types
-from typing import Mapping, Type, TypeVar, Union
+from functools import lru_cache, partial
+from typing import Awaitable, Callable, FrozenSet, Mapping, Optional, Type, TypeVar, Union
 
-import ujson
 from marshmallow import EXCLUDE, Schema
 from starlette.requests import Request
 
 from star_resty.exceptions import DecodeError
-from .base import SchemaParser, set_parser
+from star_resty.serializers import JsonEngine, JsonSerializer, codecs
+from .base import BodyParser, SchemaParser, set_parser
+from .body import get_max_body_size, iter_body, read_body
+from .scanner import JsonObjectScanner
 
-__all__ = ('json_schema', 'json_payload', 'JsonParser')
+__all__ = ('json_schema', 'json_payload', 'JsonParser', 'IncrementalJsonReader', 'read_json', 'with_engine')
 
 P = TypeVar('P')
 
 
 def json_schema(schema: Union[Schema, Type[Schema]], cls: P,
-                unknown: str = EXCLUDE) -> P:
+                unknown: str = EXCLUDE, compiled: bool = False, incremental: bool = False) -> P:
     return types.new_class('JsonInputParams', (cls,),
-                           exec_body=set_parser(JsonParser.create(schema, unknown=unknown)))
+                           exec_body=set_parser(JsonParser.create(schema, unknown=unknown, compiled=compiled,
+                                                                  incremental=incremental)))
 
 
-def json_payload(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE) -> Type[Mapping]:
-    return json_schema(schema, Mapping, unknown=unknown)
+def json_payload(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE, compiled: bool = False,
+                 incremental: bool = False) -> Type[Mapping]:
+    return json_schema(schema, Mapping, unknown=unknown, compiled=compiled, incremental=incremental)
 
 
-class JsonParser(SchemaParser):
-    __slots__ = ()
+async def read_json(request: Request, engine: Optional[JsonEngine] = None):
+    body = await read_body(request)
+    if body is None:
+        return {}
+
+    codec = codecs.get(request.headers.get('content-type'))
+    parse = codec.parse if engine is None or codec.media_type != JsonSerializer.media_type else engine.loads
+    try:
+        return parse(body)
+    except (TypeError, ValueError) as e:
+        raise DecodeError(f'Invalid {codec.media_type} body') from e
+
+
+@lru_cache(maxsize=64)
+def json_reader(engine: JsonEngine) -> Callable[[Request], Awaitable]:
+    return partial(read_json, engine=engine)
+
+
+def with_engine(reader: Callable[[Request], Awaitable], engine: JsonEngine) -> Callable[[Request], Awaitable]:
+    """Json body reader decoding ``application/json`` by the engine of the endpoint."""
+    if reader is read_json:
+        return json_reader(engine)
+    if isinstance(reader, IncrementalJsonReader):
+        return incremental_reader(reader.keys, engine)
+    return reader
+
+
+class IncrementalJsonReader:
+    """Body reader decoding a json object as the chunks arrive.
+
+    Only values of the top level ``keys`` are decoded, all values
+    are decoded with ``keys=None``. Bodies of other codecs are read
+    by ``read_json``.
+    """
+    __slots__ = ('keys', 'engine')
+    is_stream = True
+
+    def __init__(self, keys: Optional[FrozenSet[str]] = None, engine: Optional[JsonEngine] = None):
+        self.keys = keys
+        self.engine = engine
+
+    async def __call__(self, request: Request):
+        codec = codecs.get(request.headers.get('content-type'))
+        if codec.media_type != JsonSerializer.media_type:
+            return await read_json(request)
+
+        scanner = JsonObjectScanner(self.keys, codec.parse if self.engine is None else self.engine.loads)
+        try:
+            async for chunk in iter_body(request, get_max_body_size()):
+                scanner.feed(chunk)
+            return scanner.close()
+        except (TypeError, ValueError) as e:
+            raise DecodeError(f'Invalid {codec.media_type} body') from e
+
+
+@lru_cache(maxsize=1024)
+def incremental_reader(keys: Optional[FrozenSet[str]], engine: Optional[JsonEngine] = None) -> IncrementalJsonReader:
+    return IncrementalJsonReader(keys, engine)
+
+
+class JsonParser(SchemaParser, BodyParser):
+    __slots__ = ('_reader',)
+
+    @classmethod
+    def create(cls, schema: Union[Schema, Type[Schema]], unknown: str = EXCLUDE, compiled: bool = False,
+               incremental: bool = False):
+        return cls(cls._convert_schema(schema), unknown, compiled=compiled, incremental=incremental)
+
+    def __init__(self, schema: Schema, unknown=EXCLUDE, compiled: bool = False, incremental: bool = False):
+        super().__init__(schema, unknown, compiled=compiled)
+        if not incremental:
+            self._reader = read_json
+        elif unknown == EXCLUDE:
+            keys = (field.data_key if field.data_key is not None else name
+                    for (name, field) in schema.load_fields.items())
+            self._reader = incremental_reader(frozenset(keys))
+        else:
+            self._reader = incremental_reader(None)
 
     @property
     def location(self):
@@ -34,14 +115,13 @@ class JsonParser(SchemaParser):
     def media_type(self):
         return 'application/json'
 
-    async def parse(self, request: Request):
-        body = await request.body()
-        if body is None:
-            data = {}
-        else:
-            try:
-                data = ujson.loads(body)
-            except (TypeError, ValueError) as e:
-                raise DecodeError('Invalid json body') from e
+    @property
+    def reader(self):
+        return self._reader
+
+    def load(self, data):
+        return self.loader(data)
 
-        return self.schema.load(data, unknown=self.unknown)
+    def get_body_spec(self):
+        for media_type in codecs.media_types:
+            yield media_type, {'schema': self.schema}
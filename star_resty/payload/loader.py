@@ -0,0 +1,355 @@
+import itertools
+import math
+import uuid
+from functools import lru_cache, partial
+from typing import Any, Callable, List, Mapping, Optional, Set, Tuple
+
+from marshmallow import EXCLUDE, INCLUDE, RAISE, Schema, ValidationError, fields, missing
+from marshmallow.decorators import POST_LOAD, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+from marshmallow.utils import set_value
+
+from star_resty.compat import has_processors
+
+__all__ = ('compile_loader', 'create_primitive_loader')
+
+UNKNOWN = (EXCLUDE, INCLUDE, RAISE)
+
+
+@lru_cache(maxsize=1024)
+def compile_loader(schema: Schema, unknown: str = EXCLUDE) -> Callable[[Any], Any]:
+    """Compile a function with the same result as ``schema.load(data, unknown=unknown)``.
+
+    Values of the expected type are taken as is by primitive fields,
+    lists and nested schemas are loaded inline and everything else
+    is deserialized by the field, so the errors are the same as the
+    marshmallow ones. Schemas with load hooks, validators, ``many``,
+    ``partial`` or ordered output are loaded by marshmallow.
+    """
+    load = None
+    if unknown in UNKNOWN:
+        load = _compile_schema(schema, unknown, schema.partial, set())
+
+    if load is None:
+        return partial(schema.load, unknown=unknown)
+
+    return load
+
+
+@lru_cache(maxsize=1024)
+def create_primitive_loader(schema: Schema, unknown: str = EXCLUDE) -> Optional[Callable[[Any], Any]]:
+    """Loader of the schema of primitive fields by the conversion table, ``None`` for other schemas.
+
+    Integer, String, Boolean and UUID fields without validators are
+    supported. Values of the target type (e.g. converted by the route)
+    are taken as is, the failed conversions are deserialized by the
+    field to get the same errors as ``schema.load``.
+    """
+    if unknown != EXCLUDE or not _is_supported(schema, schema.partial):
+        return None
+
+    table = []
+    for attr_name, field in schema.load_fields.items():
+        factory = PRIMITIVES.get(type(field))
+        attr = field.attribute or attr_name
+        if factory is None or field.validators or '.' in attr:
+            return None
+
+        key = field.data_key if field.data_key is not None else attr_name
+        target, convert = factory(field)
+        table.append((key, attr, target, convert, field, field.required, _load_default(field)))
+
+    return partial(_load_primitives, tuple(table), schema.error_messages['type'])
+
+
+def _load_primitives(table: Tuple, type_error: str, data: Mapping):
+    if not isinstance(data, Mapping):
+        raise ValidationError({'_schema': [type_error]}, data=data, valid_data={})
+
+    ret = {}
+    errors = None
+    for (key, attr, target, convert, field, required, default) in table:
+        value = data.get(key, missing)
+        if value is missing:
+            if required:
+                errors = errors or {}
+                errors[key] = field.make_error('required').messages
+            elif default is not missing:
+                ret[attr] = default() if callable(default) else default
+        elif value.__class__ is target:
+            ret[attr] = value
+        else:
+            try:
+                ret[attr] = convert(value)
+            except ValidationError as e:
+                errors = errors or {}
+                errors[key] = e.messages
+
+    if errors:
+        raise ValidationError(errors, data=data, valid_data=ret)
+
+    return ret
+
+
+def _integer(field: fields.Integer):
+    deserialize = field.deserialize
+    if field.strict:
+        return int, deserialize
+
+    def convert(value):
+        if value is not None and value is not True and value is not False:
+            try:
+                return int(value)
+            except (TypeError, ValueError, OverflowError):
+                pass
+        return deserialize(value)
+
+    return int, convert
+
+
+def _string(field: fields.String):
+    return str, field.deserialize
+
+
+def _boolean(field: fields.Boolean):
+    deserialize = field.deserialize
+    truthy = field.truthy
+    falsy = field.falsy
+    if not truthy:
+        return bool, deserialize
+
+    def convert(value):
+        try:
+            if value in truthy:
+                return True
+            if value in falsy:
+                return False
+        except TypeError:
+            pass
+        return deserialize(value)
+
+    return bool, convert
+
+
+def _uuid(field: fields.UUID):
+    deserialize = field.deserialize
+
+    def convert(value):
+        if value.__class__ is str:
+            try:
+                return uuid.UUID(value)
+            except ValueError:
+                pass
+        return deserialize(value)
+
+    return uuid.UUID, convert
+
+
+PRIMITIVES = {
+    fields.Integer: _integer,
+    fields.String: _string,
+    fields.Boolean: _boolean,
+    fields.UUID: _uuid,
+}
+
+
+def _is_supported(schema: Schema, partial_value) -> bool:
+    schema_cls = type(schema)
+    return (not schema.many
+            and partial_value in (None, False)
+            and schema_cls.load is Schema.load
+            and schema_cls._do_load is Schema._do_load
+            and schema_cls._deserialize is Schema._deserialize
+            and schema_cls.handle_error is Schema.handle_error
+            and not has_processors(schema, PRE_LOAD)
+            and not has_processors(schema, POST_LOAD)
+            and not has_processors(schema, VALIDATES_SCHEMA)
+            and not has_processors(schema, VALIDATES)
+            and getattr(schema, 'dict_class', dict) is dict)
+
+
+def _compile_schema(schema: Schema, unknown: str, partial_value, stack: Set[type]) -> Optional[Callable]:
+    if type(schema) in stack or not _is_supported(schema, partial_value):
+        return None
+
+    stack.add(type(schema))
+    try:
+        return _SchemaCompiler(schema, unknown, partial_value, stack).compile()
+    finally:
+        stack.discard(type(schema))
+
+
+def _load_default(field: fields.Field) -> Any:
+    try:
+        return field.load_default
+    except AttributeError:
+        return field.missing
+
+
+def _validated(field: fields.Field) -> Callable:
+    validate = field._validate
+
+    def check(value):
+        validate(value)
+        return value
+
+    return check
+
+
+class _SchemaCompiler:
+    __slots__ = ('schema', 'unknown', 'partial', 'stack', 'namespace', 'names')
+
+    def __init__(self, schema: Schema, unknown: str, partial_value, stack: Set[type]):
+        self.schema = schema
+        self.unknown = unknown
+        self.partial = partial_value
+        self.stack = stack
+        self.namespace = {
+            '_missing': missing,
+            '_Mapping': Mapping,
+            '_ValidationError': ValidationError,
+            '_set_value': set_value,
+            '_isfinite': math.isfinite,
+        }
+        self.names = itertools.count()
+
+    def compile(self) -> Callable:
+        schema = self.schema
+        type_error = self._name('message', schema.error_messages['type'])
+        lines = [
+            'def load(data):',
+            '    if not isinstance(data, _Mapping):',
+            f"        raise _ValidationError({{'_schema': [{type_error}]}}, data=data, valid_data={{}})",
+            '    ret = {}',
+            '    errors = {}',
+        ]
+        keys = set()
+        for attr_name, field in schema.load_fields.items():
+            key = field.data_key if field.data_key is not None else attr_name
+            keys.add(key)
+            lines.extend(f'    {line}' for line in self._compile_field(attr_name, key, field))
+
+        if self.unknown != EXCLUDE:
+            keys_name = self._name('keys', frozenset(keys))
+            lines.extend((
+                '    for key in data:',
+                f'        if key not in {keys_name}:',
+            ))
+            if self.unknown == INCLUDE:
+                lines.append('            ret[key] = data[key]')
+            else:
+                message = self._name('message', schema.error_messages['unknown'])
+                lines.append(f'            errors[key] = [{message}]')
+
+        lines.extend((
+            '    if errors:',
+            '        raise _ValidationError(errors, data=data, valid_data=ret)',
+            '    return ret',
+        ))
+        source = '\n'.join(lines)
+        schema_cls = type(schema)
+        code = compile(source, f'<load {schema_cls.__module__}.{schema_cls.__qualname__}>', 'exec')
+        exec(code, self.namespace)
+        load = self.namespace['load']
+        load.__source__ = source
+        return load
+
+    def _name(self, prefix: str, value: Any) -> str:
+        name = f'_{prefix}_{next(self.names)}'
+        self.namespace[name] = value
+        return name
+
+    def _compile_field(self, attr_name: str, key: str, field: fields.Field) -> List[str]:
+        attr = field.attribute or attr_name
+        if '.' in attr:
+            def assign(expr):
+                return f'_set_value(ret, {attr!r}, {expr})'
+        else:
+            def assign(expr):
+                return f'ret[{attr!r}] = {expr}'
+
+        lines = [
+            f'v = data.get({key!r}, _missing)',
+            'if v is _missing:',
+        ]
+        default = _load_default(field)
+        if field.required:
+            name = self._name('field', field)
+            lines.append(f"    errors[{key!r}] = {name}.make_error('required').messages")
+        elif default is not missing:
+            name = self._name('default', default)
+            lines.append('    ' + assign(f'{name}()' if callable(default) else name))
+        else:
+            lines.append('    pass')
+
+        expr = self._compile_value(field, 'v', f'v, {key!r}, data')
+        if type(field) is fields.List:
+            name = self._name('field', field)
+            load = [
+                '        try:',
+                f'            v = {expr}',
+                '        except _ValidationError:',
+                f'            v = {name}.deserialize(v, {key!r}, data, partial={self.partial!r})',
+            ]
+        else:
+            load = [f'        v = {expr}']
+
+        lines.extend((
+            'else:',
+            '    try:',
+            *load,
+            '    except _ValidationError as e:',
+            f'        errors[{key!r}] = e.messages',
+            '        if e.valid_data:',
+            '            ' + assign('e.valid_data'),
+            '    else:',
+            '        ' + assign('v'),
+        ))
+        return lines
+
+    def _compile_value(self, field: fields.Field, var: str, args: str) -> str:
+        name = self._name('field', field)
+        slow = f'{name}.deserialize({args}, partial={self.partial!r})'
+        fast = self._compile_fast(field, var)
+        if fast is None:
+            return slow
+
+        check, value = fast
+        if field.validators:
+            value = f"{self._name('validated', _validated(field))}({value})"
+
+        return f'({value} if {check} else {slow})'
+
+    def _compile_fast(self, field: fields.Field, var: str):
+        field_cls = type(field)
+        if field_cls is fields.Raw:
+            return f'{var} is not None', var
+
+        if field_cls is fields.String:
+            return f'{var}.__class__ is str', var
+
+        if field_cls is fields.Integer:
+            return f'{var}.__class__ is int', var
+
+        if field_cls is fields.Float:
+            if field.allow_nan is False:
+                return f'{var}.__class__ is float and _isfinite({var})', var
+            return f'{var}.__class__ is float', var
+
+        if (field_cls is fields.Boolean and field.truthy is fields.Boolean.truthy
+                and field.falsy is fields.Boolean.falsy):
+            return f'{var} is True or {var} is False', var
+
+        if field_cls is fields.Nested and not field.many:
+            schema = field.schema
+            unknown = schema.unknown if field.unknown is None else field.unknown
+            nested_partial = schema.partial if self.partial is None else self.partial
+            load = _compile_schema(schema, unknown, nested_partial, self.stack)
+            if load is not None:
+                return f'{var} is not None', f"{self._name('nested', load)}({var})"
+
+        if field_cls is fields.List:
+            inner = f'{var}_'
+            expr = self._compile_value(field.inner, inner, inner)
+            return f'{var}.__class__ is list', f'[{expr} for {inner} in {var}]'
+
+        return None
@@ -0,0 +1,233 @@
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, FrozenSet, List, Optional, Tuple
+
+import multipart
+from marshmallow import ValidationError
+from multipart.multipart import parse_options_header
+from starlette.datastructures import Headers
+from starlette.requests import Request
+
+from star_resty.exceptions import DecodeError, PayloadTooLarge
+from .body import iter_body
+from .sinks import Sink
+
+try:
+    from multipart.exceptions import MultipartParseError
+except ImportError:  # the multipart package is an alias of python_multipart since 0.0.13
+    from python_multipart.exceptions import MultipartParseError
+
+__all__ = ('UploadPart', 'UploadStream')
+
+
+class UploadPart:
+    """File part of the multipart body read by chunks as they arrive.
+
+    Data of the part is available until the next part is requested
+    from the stream, the rest of the part is discarded then.
+    """
+    __slots__ = ('name', 'filename', 'headers', 'size', '_stream', '_chunks', '_done')
+
+    def __init__(self, stream: 'UploadStream', name: str, filename: str, headers: Headers):
+        self.name = name
+        self.filename = filename
+        self.headers = headers
+        self.size = 0
+        self._stream = stream
+        self._chunks: Deque[bytes] = deque()
+        self._done = False
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.headers.get('content-type')
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self._iter_chunks()
+
+    async def _iter_chunks(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                return
+            yield chunk
+
+    async def read_chunk(self) -> bytes:
+        """Next chunk of the file, ``b''`` at the end of the file."""
+        chunks = self._chunks
+        while not chunks:
+            if self._done:
+                return b''
+            await self._stream._feed()
+
+        return chunks.popleft()
+
+    async def read(self) -> bytes:
+        return b''.join([chunk async for chunk in self])
+
+    async def save(self, sink: Sink):
+        """Write the rest of the file to the sink, return the result of ``sink.close()``."""
+        try:
+            async for chunk in self:
+                await sink.write(chunk)
+        except BaseException:
+            await sink.abort()
+            raise
+
+        return await sink.close()
+
+    def _discard(self):
+        self._chunks.clear()
+
+
+class UploadStream:
+    """Async iterator over the declared file parts of the multipart body.
+
+    The body is parsed while the parts are read. Parts with other names
+    are discarded without buffering, values of the form fields are
+    collected to ``fields``.
+    """
+    __slots__ = ('fields', '_request', '_names', '_required', '_max_file_size', '_max_size',
+                 '_parser', '_body', '_eof', '_ready', '_current', '_count', '_charset',
+                 '_header_name', '_header_value', '_headers', '_part', '_field', '_field_data')
+
+    def __init__(self, request: Request, names: FrozenSet[str] = frozenset(), *,
+                 required: bool = False,
+                 max_file_size: Optional[int] = None,
+                 max_size: Optional[int] = None):
+        self.fields: Dict[str, str] = {}
+        self._request = request
+        self._names = names
+        self._required = required
+        self._max_file_size = max_file_size
+        self._max_size = max_size
+        self._parser = None
+        self._body = None
+        self._eof = False
+        self._ready: Deque[UploadPart] = deque()
+        self._current: Optional[UploadPart] = None
+        self._count = 0
+        self._charset = 'utf-8'
+        self._header_name = b''
+        self._header_value = b''
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._part: Optional[UploadPart] = None
+        self._field: Optional[str] = None
+        self._field_data = bytearray()
+
+    def __aiter__(self) -> 'UploadStream':
+        return self
+
+    async def __anext__(self) -> UploadPart:
+        if self._parser is None:
+            self._start()
+
+        current = self._current
+        if current is not None:
+            while not current._done:
+                current._discard()
+                await self._feed()
+            current._discard()
+            self._current = None
+
+        while not self._ready:
+            if self._eof:
+                if self._required and not self._count:
+                    raise ValidationError(message='Missing required file', field_name='form')
+                raise StopAsyncIteration
+            await self._feed()
+
+        self._current = self._ready.popleft()
+        self._count += 1
+        return self._current
+
+    def _start(self):
+        _, params = parse_options_header(self._request.headers.get('content-type', ''))
+        boundary = params.get(b'boundary')
+        if not boundary:
+            raise DecodeError('Invalid form data: missing boundary')
+
+        charset = params.get(b'charset')
+        if charset:
+            self._charset = charset.decode('latin-1')
+
+        self._parser = multipart.MultipartParser(boundary, {
+            'on_part_begin': self._on_part_begin,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+        })
+        self._body = iter_body(self._request, self._max_size).__aiter__()
+
+    async def _feed(self):
+        if self._eof:
+            raise DecodeError('Invalid form data: unexpected end of body')
+
+        try:
+            chunk = await self._body.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            self._parser.finalize()
+            if self._current is not None and not self._current._done:
+                raise DecodeError('Invalid form data: unexpected end of body')
+            return
+
+        try:
+            self._parser.write(chunk)
+        except MultipartParseError as e:
+            raise DecodeError(f'Invalid form data: {e}') from e
+
+    def _decode(self, value: bytes) -> str:
+        try:
+            return value.decode(self._charset)
+        except (UnicodeDecodeError, LookupError):
+            return value.decode('latin-1')
+
+    def _on_part_begin(self):
+        self._headers = []
+        self._part = None
+        self._field = None
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers.append((self._header_name.lower(), self._header_value))
+        self._header_name = b''
+        self._header_value = b''
+
+    def _on_headers_finished(self):
+        headers = Headers(raw=self._headers)
+        _, options = parse_options_header(headers.get('content-disposition', ''))
+        name = options.get(b'name')
+        if name is None:
+            raise DecodeError('Invalid form data: missing part name')
+
+        name = self._decode(name)
+        filename = options.get(b'filename')
+        if filename is None:
+            self._field = name
+            self._field_data = bytearray()
+        elif not self._names or name in self._names:
+            self._part = UploadPart(self, name, self._decode(filename), headers)
+            self._ready.append(self._part)
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        part = self._part
+        if part is not None:
+            part.size += end - start
+            if self._max_file_size is not None and part.size > self._max_file_size:
+                raise PayloadTooLarge(self._max_file_size)
+            part._chunks.append(data[start:end])
+        elif self._field is not None:
+            self._field_data += data[start:end]
+
+    def _on_part_end(self):
+        if self._part is not None:
+            self._part._done = True
+        elif self._field is not None:
+            self.fields[self._field] = self._decode(bytes(self._field_data))
@@ -1,10 +1,11 @@
 import types
-from typing import Mapping, Type, TypeVar, Union
+from typing import Any, Callable, Mapping, Type, TypeVar, Union
 
 from marshmallow import EXCLUDE, Schema
 from starlette.requests import Request
 
 from .base import SchemaParser, set_parser
+from .loader import create_primitive_loader
 
 __all__ = ('path', 'path_schema', 'PathParser')
 
@@ -12,21 +13,34 @@ P = TypeVar('P')
 
 
 def path_schema(schema: Union[Schema, Type[Schema]], cls: P,
-                unknown=EXCLUDE) -> P:
+                unknown=EXCLUDE, compiled: bool = False) -> P:
     return types.new_class('PathInputParams', (cls,),
-                           exec_body=set_parser(PathParser.create(schema, unknown=unknown)))
+                           exec_body=set_parser(PathParser.create(schema, unknown=unknown, compiled=compiled)))
 
 
-def path(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE) -> Type[Mapping]:
-    return path_schema(schema, Mapping, unknown=unknown)
+def path(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE, compiled: bool = False) -> Type[Mapping]:
+    return path_schema(schema, Mapping, unknown=unknown, compiled=compiled)
 
 
 class PathParser(SchemaParser):
+    """Parser of the path params.
+
+    Schemas of primitive fields are loaded by the conversion table
+    without marshmallow, values converted by the route are reused.
+    """
     __slots__ = ()
 
+    def create_loader(self, compiled: bool) -> Callable[[Any], Any]:
+        if not compiled:
+            loader = create_primitive_loader(self.schema, self.unknown)
+            if loader is not None:
+                return loader
+
+        return super().create_loader(compiled)
+
     @property
     def location(self):
         return 'path'
 
     def parse(self, request: Request):
-        return self.schema.load(request.path_params, unknown=self.unknown)
+        return self.loader(request.path_params)
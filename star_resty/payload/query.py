@@ -1,52 +1,96 @@
+import copy
 import inspect
 import types
-from functools import lru_cache
-from typing import Mapping, Type, TypeVar, Union, Callable, Sequence, List, Tuple, Iterator
+from functools import lru_cache, partial
+from typing import Any, Mapping, Type, TypeVar, Union, Callable, Sequence, List, Tuple, Iterator, Optional
 
-from marshmallow import EXCLUDE, Schema, fields
+from marshmallow import EXCLUDE, Schema, fields, missing
+from marshmallow.decorators import POST_LOAD
 from starlette.requests import Request
 
+from star_resty.cache import LruCache
+from star_resty.compat import has_processors
 from .base import SchemaParser, set_parser
+from .loader import create_primitive_loader
 
 __all__ = ('query', 'query_schema', 'QueryParser')
 
 Q = TypeVar('Q')
 
 
+IMMUTABLE_FIELDS = (fields.String, fields.Number, fields.Boolean, fields.UUID, fields.DateTime,
+                    fields.Date, fields.Time, fields.TimeDelta, fields.Constant)
+
+
 def query_schema(schema: Union[Schema, Type[Schema]], cls: Q,
-                 unknown=EXCLUDE) -> Q:
+                 unknown=EXCLUDE, compiled: bool = False, cache_size: int = 0) -> Q:
     return types.new_class('QueryInputParams', (cls,),
-                           exec_body=set_parser(QueryParser.create(schema, unknown=unknown)))
+                           exec_body=set_parser(QueryParser.create(schema, unknown=unknown, compiled=compiled,
+                                                                   cache_size=cache_size)))
 
 
-def query(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE) -> Type[Mapping]:
-    return query_schema(schema, Mapping, unknown=unknown)
+def query(schema: Union[Schema, Type[Schema]], unknown=EXCLUDE, compiled: bool = False,
+          cache_size: int = 0) -> Type[Mapping]:
+    return query_schema(schema, Mapping, unknown=unknown, compiled=compiled, cache_size=cache_size)
 
 
 class QueryParser(SchemaParser):
-    __slots__ = ('fields',)
+    """Parser of the query string.
+
+    With ``cache_size`` the loaded values of the last query strings are
+    kept in LRU cache, a copy of the cached value is returned. Schemas of
+    primitive fields are loaded by the conversion table without marshmallow.
+    """
+    __slots__ = ('fields', 'cache', '_copy')
 
     @classmethod
-    def create(cls, schema: Union[Schema, Type[Schema]], unknown: str = EXCLUDE):
+    def create(cls, schema: Union[Schema, Type[Schema]], unknown: str = EXCLUDE, compiled: bool = False,
+               cache_size: int = 0):
         schema, query_fields = get_query_fields(schema)
-        return cls(schema, query_fields, unknown)
+        return cls(schema, query_fields, unknown, compiled=compiled, cache_size=cache_size)
 
-    def __init__(self, schema: Schema, query_fields: Mapping, unknown=EXCLUDE):
-        super().__init__(schema, unknown=unknown)
+    def __init__(self, schema: Schema, query_fields: Mapping, unknown=EXCLUDE, compiled: bool = False,
+                 cache_size: int = 0):
+        super().__init__(schema, unknown=unknown, compiled=compiled)
         self.fields = query_fields
+        self.cache: Optional[LruCache] = LruCache(cache_size) if cache_size > 0 else None
+        self._copy = get_copy(schema, unknown)
+
+    def create_loader(self, compiled: bool) -> Callable[[Any], Any]:
+        if compiled:
+            return super().create_loader(compiled)
+
+        loader = create_primitive_loader(self.schema, self.unknown)
+        if loader is not None:
+            return loader
+
+        return partial(self.schema.load, many=False, unknown=self.unknown)
 
     @property
     def location(self):
         return 'query'
 
     def parse(self, request: Request):
+        cache = self.cache
+        if cache is None:
+            return self._load(request)
+
+        key = request.scope['query_string']
+        value = cache.get(key, missing)
+        if value is missing:
+            value = self._load(request)
+            cache.set(key, value)
+
+        return self._copy(value)
+
+    def _load(self, request: Request):
         query_params = request.query_params
         getlist = request.query_params.getlist
         query_fields = self.fields
         data = ((key, query_fields[key](getlist(key)))
                 for key in query_params.keys() if key in query_fields)
         data = {key: val for (key, val) in data if val is not None}
-        return self.schema.load(data, many=False, unknown=self.unknown)
+        return self.loader(data)
 
 
 @lru_cache(typed=False, maxsize=1024)
@@ -85,3 +129,15 @@ def get_list_value(values: Sequence) -> List:
 
 def get_value(values: Sequence):
     return next((v for v in values if v), None)
+
+
+def get_copy(schema: Schema, unknown: str) -> Callable:
+    """Shallow copy if values of the loaded dict are immutable, deep copy otherwise."""
+    if unknown != EXCLUDE or has_processors(schema, POST_LOAD):
+        return copy.deepcopy
+
+    for field in schema.load_fields.values():
+        if not isinstance(field, IMMUTABLE_FIELDS) or '.' in (field.attribute or ''):
+            return copy.deepcopy
+
+    return dict
@@ -0,0 +1,187 @@
+import re
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+__all__ = ('JsonObjectScanner',)
+
+_NON_SPACE = re.compile(rb'\S')
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_STRING_END = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb'[,}\]\s]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_OPEN = frozenset(b'{[')
+
+# states
+_START, _RAW, _FIRST_KEY, _KEY, _COLON, _VALUE_START, _VALUE, _AFTER_VALUE, _NEXT_KEY, _END = range(10)
+
+
+class JsonObjectScanner:
+    """Incremental parser of a json object.
+
+    Chunks of the body are passed to ``feed`` as they arrive. Values of
+    the top level ``keys`` are decoded by ``loads``, other values are
+    skipped without decoding and are not kept in memory (their content
+    is only checked for balanced strings and brackets). ``keys=None``
+    keeps all values. A body that is not an object is decoded as a whole.
+    """
+    __slots__ = ('keys', 'loads', '_buf', '_state', '_pos', '_start', '_key', '_capture',
+                 '_scalar', '_depth', '_in_string', '_result')
+
+    def __init__(self, keys: Optional[FrozenSet[str]], loads: Callable[[bytes], Any]):
+        self.keys = keys
+        self.loads = loads
+        self._buf = bytearray()
+        self._state = _START
+        self._pos = 0
+        self._start = 0
+        self._key = None
+        self._capture = False
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._result: Dict[str, Any] = {}
+
+    def feed(self, chunk: bytes):
+        if not chunk:
+            return
+
+        buf = self._buf
+        buf += chunk
+        if self._state == _RAW:
+            return
+
+        self._advance()
+        if self._state in (_KEY, _VALUE) and (self._state == _KEY or self._capture):
+            cut = self._start
+        else:
+            cut = self._pos
+
+        if cut:
+            del buf[:cut]
+            self._pos -= cut
+            self._start -= cut
+
+    def close(self) -> Any:
+        if self._state == _RAW:
+            return self.loads(bytes(self._buf))
+
+        if self._state != _END or _NON_SPACE.search(self._buf, self._pos) is not None:
+            raise ValueError('Unexpected end of json data')
+
+        return self._result
+
+    def _advance(self):
+        buf = self._buf
+        while True:
+            state = self._state
+            if state == _KEY or state == _VALUE:
+                end = self._scan(buf, self._pos)
+                if end < 0:
+                    return
+
+                self._pos = end
+                if state == _KEY:
+                    self._key = self.loads(bytes(buf[self._start:end]))
+                    self._state = _COLON
+                else:
+                    self._finish_value(end)
+                    self._state = _AFTER_VALUE
+                continue
+
+            match = _NON_SPACE.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                return
+
+            pos = match.start()
+            char = buf[pos]
+            if state == _START:
+                if char != ord('{'):
+                    self._state = _RAW
+                    return
+                self._state = _FIRST_KEY
+                self._pos = pos + 1
+            elif state == _FIRST_KEY and char == ord('}'):
+                self._state = _END
+                self._pos = pos + 1
+            elif state in (_FIRST_KEY, _NEXT_KEY):
+                if char != _QUOTE:
+                    raise ValueError('Expected object key')
+                self._begin(pos, False)
+                self._state = _KEY
+            elif state == _COLON:
+                if char != ord(':'):
+                    raise ValueError('Expected ":"')
+                self._state = _VALUE_START
+                self._pos = pos + 1
+            elif state == _VALUE_START:
+                self._begin(pos, char != _QUOTE and char not in _OPEN)
+                self._capture = self.keys is None or self._key in self.keys
+                self._state = _VALUE
+            elif state == _AFTER_VALUE:
+                if char == ord(','):
+                    self._state = _NEXT_KEY
+                elif char == ord('}'):
+                    self._state = _END
+                else:
+                    raise ValueError('Expected "," or "}"')
+                self._pos = pos + 1
+            else:
+                raise ValueError('Extra data after json object')
+
+    def _begin(self, pos: int, scalar: bool):
+        self._start = self._pos = pos
+        self._scalar = scalar
+        self._depth = 0
+        self._in_string = False
+
+    def _finish_value(self, end: int):
+        if self._capture:
+            self._result[self._key] = self.loads(bytes(self._buf[self._start:end]))
+
+    def _scan(self, buf: bytearray, pos: int) -> int:
+        """End of the current string, container or scalar, -1 if more data is needed."""
+        if self._scalar:
+            match = _SCALAR_END.search(buf, pos)
+            if match is None:
+                self._pos = len(buf)
+                return -1
+            return match.start()
+
+        while True:
+            if self._in_string:
+                match = _STRING_END.search(buf, pos)
+                if match is None:
+                    self._pos = len(buf)
+                    return -1
+
+                pos = match.start()
+                if buf[pos] == _BACKSLASH:
+                    if pos + 1 >= len(buf):
+                        self._pos = pos
+                        return -1
+                    pos += 2
+                    continue
+
+                pos += 1
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+                continue
+
+            match = _STRUCTURE.search(buf, pos)
+            if match is None:
+                self._pos = len(buf)
+                return -1
+
+            pos = match.end()
+            char = buf[match.start()]
+            if char == _QUOTE:
+                self._in_string = True
+            elif char in _OPEN:
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth <= 0:
+                    return pos
@@ -0,0 +1,71 @@
+import hashlib
+import os
+from typing import Any, Optional, Union
+
+from starlette.concurrency import run_in_threadpool
+from typing_extensions import Protocol
+
+__all__ = ('Sink', 'FileSink', 'HashSink')
+
+
+class Sink(Protocol):
+    async def write(self, data: bytes):
+        pass
+
+    async def close(self) -> Any:
+        pass
+
+    async def abort(self):
+        pass
+
+
+class FileSink:
+    """Write the file to the local path, the file is removed on abort."""
+    __slots__ = ('path', '_file')
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self._file = None
+
+    async def write(self, data: bytes):
+        if self._file is None:
+            self._file = await run_in_threadpool(open, self.path, 'wb')
+        await run_in_threadpool(self._file.write, data)
+
+    async def close(self) -> str:
+        if self._file is None:
+            self._file = await run_in_threadpool(open, self.path, 'wb')
+        await run_in_threadpool(self._file.close)
+        return self.path
+
+    async def abort(self):
+        if self._file is not None:
+            await run_in_threadpool(self._file.close)
+            await run_in_threadpool(os.remove, self.path)
+            self._file = None
+
+
+class HashSink:
+    """Compute the hex digest of the file, the data is passed to the next ``sink`` if any.
+
+    ``close`` returns the digest.
+    """
+    __slots__ = ('sink', '_hash')
+
+    def __init__(self, name: str = 'sha256', sink: Optional[Sink] = None):
+        self.sink = sink
+        self._hash = hashlib.new(name)
+
+    async def write(self, data: bytes):
+        self._hash.update(data)
+        if self.sink is not None:
+            await self.sink.write(data)
+
+    async def close(self) -> str:
+        if self.sink is not None:
+            await self.sink.close()
+        return self._hash.hexdigest()
+
+    async def abort(self):
+        if self.sink is not None:
+            await self.sink.abort()
@@ -0,0 +1,139 @@
+import abc
+from typing import Optional, Any, Sequence, Mapping, Type
+
+from marshmallow import ValidationError
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+
+from .base import BodyParser, Parser
+from .body import get_max_body_size
+from .form import read_form
+from .multipart import UploadStream
+
+__all__ = ('upload', 'upload_stream')
+
+
+class UploadSequence(Sequence[UploadFile], metaclass=abc.ABCMeta):
+    pass
+
+
+def upload(*args: str,
+           description: Optional[str] = None,
+           required: bool = False) -> Type[UploadSequence]:
+    def helper() -> Any:
+        return UploadParser(args, description=description, required=required)
+
+    return helper()
+
+
+def upload_stream(*args: str,
+                  description: Optional[str] = None,
+                  required: bool = False,
+                  max_file_size: Optional[int] = None,
+                  max_size: Optional[int] = None) -> Type[UploadStream]:
+    def helper() -> Any:
+        return UploadStreamParser(args, description=description, required=required,
+                                  max_file_size=max_file_size, max_size=max_size)
+
+    return helper()
+
+
+class UploadParser(BodyParser):
+
+    def __init__(self, file_names: Sequence[str] = (), *,
+                 description: Optional[str] = None,
+                 required: bool = False):
+        self.files_names = frozenset(file_names)
+        self.description = description
+        self.required = required
+
+    @property
+    def parser(self):
+        return self
+
+    @property
+    def media_type(self):
+        return 'multipart/form-data'
+
+    @property
+    def location(self):
+        return 'formData'
+
+    @property
+    def reader(self):
+        return read_form
+
+    def load(self, form):
+        res = []
+        for key, val in form.items():
+            if not isinstance(val, UploadFile):
+                continue
+
+            if not self.files_names or key in self.files_names:
+                res.append(val)
+
+        if self.required and not res:
+            raise ValidationError(message='Missing required file', field_name='form')
+
+        return res
+
+    def get_spec(self):
+        return create_files_spec(self.files_names, self.description, self.required)
+
+
+class UploadStreamParser(Parser):
+    """Parser of the multipart body streamed to ``execute`` as ``UploadStream``.
+
+    ``max_file_size`` limits every declared file, ``max_size`` the whole
+    body along with the limit of the endpoint.
+    """
+
+    def __init__(self, file_names: Sequence[str] = (), *,
+                 description: Optional[str] = None,
+                 required: bool = False,
+                 max_file_size: Optional[int] = None,
+                 max_size: Optional[int] = None):
+        self.files_names = frozenset(file_names)
+        self.description = description
+        self.required = required
+        self.max_file_size = max_file_size
+        self.max_size = max_size
+
+    @property
+    def parser(self):
+        return self
+
+    @property
+    def media_type(self):
+        return 'multipart/form-data'
+
+    @property
+    def location(self):
+        return 'formData'
+
+    @property
+    def is_stream(self) -> bool:
+        return True
+
+    def parse(self, request: Request) -> UploadStream:
+        max_size = self.max_size
+        body_size = get_max_body_size()
+        if max_size is None or (body_size is not None and body_size < max_size):
+            max_size = body_size
+
+        return UploadStream(request, self.files_names, required=self.required,
+                            max_file_size=self.max_file_size, max_size=max_size)
+
+    def get_spec(self):
+        return create_files_spec(self.files_names, self.description, self.required)
+
+
+def create_files_spec(files_names: Sequence[str], description: Optional[str], required: bool):
+    for name in (sorted(files_names) or ('upfile',)):
+        yield {
+            'in': 'formData',
+            'type': 'file',
+            'description': description or '',
+            'name': name,
+            'required': required
+        }
@@ -0,0 +1,289 @@
+import cProfile
+import marshal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Type
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from star_resty.method import Method
+from star_resty.warmup import iter_endpoints
+
+__all__ = ('Profile', 'start_profiling', 'stop_profiling', 'get_profile', 'setup_profiling')
+
+MODES = ('cprofile', 'sampling')
+
+
+class Profile:
+    """Profile of the dispatch of one method class.
+
+    The profiler runs while at least one request of the method is in
+    flight, so the other coroutines of the event loop interleaved with
+    these requests are profiled too. The session finishes after
+    ``requests`` requests or ``seconds`` seconds, the results stay
+    available until the next session of the method.
+    """
+    __slots__ = ('method', 'mode', 'requests', 'deadline', 'started', 'count', 'finished',
+                 '_profiler', '_active', '_dispatch')
+
+    def __init__(self, method: Type[Method], mode: str = 'cprofile', requests: Optional[int] = None,
+                 seconds: Optional[float] = None, interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f'Invalid profiling mode={mode}, expected one of {MODES}')
+        if requests is None and seconds is None:
+            raise ValueError('Profiling requires requests or seconds')
+
+        self.method = method
+        self.mode = mode
+        self.requests = requests
+        self.started = time.monotonic()
+        self.deadline = None if seconds is None else self.started + seconds
+        self.count = 0
+        self.finished = False
+        self._profiler = _CProfiler() if mode == 'cprofile' else _Sampler(interval)
+        self._active = 0
+        self._dispatch = None
+
+    def start(self):
+        original = self._dispatch = self.method.__dispatch__
+
+        async def dispatch(method: Method) -> Response:
+            if not self._enter():
+                return await original(method)
+            try:
+                return await original(method)
+            finally:
+                self._exit()
+
+        dispatch.__source__ = getattr(original, '__source__', None)
+        dispatch.__profile__ = self
+        self.method.__dispatch__ = dispatch
+
+    def stop(self):
+        if self.finished:
+            return
+
+        self.finished = True
+        dispatch = vars(self.method).get('__dispatch__')
+        if getattr(dispatch, '__profile__', None) is self:
+            self.method.__dispatch__ = self._dispatch
+        self._profiler.close()
+
+    def _enter(self) -> bool:
+        if self.finished or self._expired():
+            if not self._active:
+                self.stop()
+            return False
+
+        self.count += 1
+        self._active += 1
+        if self._active == 1:
+            self._profiler.start()
+        return True
+
+    def _exit(self):
+        self._active -= 1
+        if self._active:
+            return
+
+        self._profiler.pause()
+        if self._expired():
+            self.stop()
+
+    def _expired(self) -> bool:
+        if self.requests is not None and self.count >= self.requests:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def pstats(self) -> bytes:
+        """Stats in the format of ``pstats.Stats.dump_stats``, cprofile mode only."""
+        return self._profiler.pstats()
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format of flame graph tools, sampling mode only."""
+        return self._profiler.collapsed()
+
+    def info(self) -> Dict:
+        return {
+            'endpoint': _name(self.method),
+            'mode': self.mode,
+            'requests': self.count,
+            'seconds': round(time.monotonic() - self.started, 3),
+            'finished': self.finished,
+        }
+
+
+class _CProfiler:
+    __slots__ = ('_profile',)
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def pause(self):
+        self._profile.disable()
+
+    def close(self):
+        self._profile.disable()
+
+    def pstats(self) -> bytes:
+        self._profile.snapshot_stats()
+        return marshal.dumps(self._profile.stats)
+
+    def collapsed(self) -> str:
+        raise ValueError('Collapsed stacks are available in sampling mode')
+
+
+class _Sampler:
+    """Sample the stack of the event loop thread from a background thread."""
+    __slots__ = ('interval', 'stacks', '_ident', '_running', '_closed', '_thread')
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self._ident = None
+        self._running = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def start(self):
+        self._ident = threading.get_ident()
+        self._running.set()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='star_resty-sampler', daemon=True)
+            self._thread.start()
+
+    def pause(self):
+        self._running.clear()
+
+    def close(self):
+        self._closed = True
+        self._running.set()
+
+    def _run(self):
+        while True:
+            self._running.wait()
+            if self._closed:
+                return
+
+            frame = sys._current_frames().get(self._ident)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+            del frame
+            time.sleep(self.interval)
+
+    def pstats(self) -> bytes:
+        raise ValueError('pstats are available in cprofile mode')
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for (stack, count) in self.stacks.most_common())
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})'.replace(';', ':'))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def _name(method: Type[Method]) -> str:
+    return f'{method.__module__}.{method.__qualname__}'
+
+
+_profiles: Dict[Type[Method], Profile] = {}
+
+
+def start_profiling(method: Type[Method], requests: Optional[int] = None, seconds: Optional[float] = None,
+                    mode: str = 'cprofile', interval: float = 0.001) -> Profile:
+    """Profile the next ``requests`` requests or ``seconds`` seconds of the method.
+
+    Only one cProfile profiler may run in a thread, so at most one
+    session of the cprofile mode is active at a time.
+    """
+    profile = Profile(method, mode=mode, requests=requests, seconds=seconds, interval=interval)
+    if mode == 'cprofile' and any(not p.finished and p.mode == 'cprofile' and p.method is not method
+                                  for p in _profiles.values()):
+        raise RuntimeError('Other method is profiled in cprofile mode')
+
+    stop_profiling(method)
+    _profiles[method] = profile
+    profile.start()
+    return profile
+
+
+def stop_profiling(method: Type[Method]) -> Optional[Profile]:
+    profile = _profiles.get(method)
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def get_profile(method: Type[Method]) -> Optional[Profile]:
+    return _profiles.get(method)
+
+
+def setup_profiling(app: Starlette, route: str = '/_profile'):
+    """Admin API of the profiler.
+
+    ``POST {route}/{endpoint}?requests=N&seconds=T&mode=cprofile|sampling``
+    starts a session, ``GET {route}/{endpoint}?format=pstats|collapsed``
+    downloads the results, ``DELETE`` stops the session and
+    ``GET {route}`` lists the sessions. Endpoints are named by the module
+    and the qualified name of the method class. The routes are not
+    protected, mount them behind the authentication of the application.
+    """
+
+    def find(request: Request) -> Optional[Type[Method]]:
+        name = request.path_params['endpoint']
+        for (_, method) in iter_endpoints(app.routes):
+            if _name(method) == name:
+                return method
+        return None
+
+    async def sessions(_: Request):
+        return JSONResponse([profile.info() for profile in _profiles.values()])
+
+    async def session(request: Request):
+        method = find(request)
+        if method is None:
+            return JSONResponse({'error': 'Endpoint not found'}, status_code=404)
+
+        if request.method == 'POST':
+            query = request.query_params
+            try:
+                profile = start_profiling(
+                    method,
+                    requests=int(query['requests']) if 'requests' in query else None,
+                    seconds=float(query['seconds']) if 'seconds' in query else None,
+                    mode=query.get('mode', 'cprofile'),
+                    interval=float(query.get('interval', 0.001)))
+            except (ValueError, RuntimeError) as e:
+                return JSONResponse({'error': str(e)}, status_code=400)
+            return JSONResponse(profile.info(), status_code=201)
+
+        profile = stop_profiling(method) if request.method == 'DELETE' else get_profile(method)
+        if profile is None:
+            return JSONResponse({'error': 'Endpoint is not profiled'}, status_code=404)
+
+        fmt = request.query_params.get('format')
+        try:
+            if fmt == 'pstats':
+                return Response(profile.pstats(), media_type='application/octet-stream',
+                                headers={'content-disposition': f'attachment; filename="{_name(method)}.pstats"'})
+            if fmt == 'collapsed':
+                return Response(profile.collapsed(), media_type='text/plain')
+        except ValueError as e:
+            return JSONResponse({'error': str(e)}, status_code=400)
+
+        return JSONResponse(profile.info())
+
+    app.add_route(route, sessions, methods=['GET'], include_in_schema=False)
+    app.add_route(f'{route}/{{endpoint}}', session, methods=['GET', 'POST', 'DELETE'], include_in_schema=False)
@@ -1,2 +1,5 @@
-from .json import JsonSerializer
+from .codecs import Codecs, codecs, negotiate
+from .engines import JsonEngine, get_engine, register_engine
+from .json import JsonSerializer, NdJsonSerializer, set_json_engine
+from .native import NativeJsonSerializer, encode, native, register_encoder
 from .serializer import Serializer
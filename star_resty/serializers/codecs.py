@@ -0,0 +1,72 @@
+from typing import Dict, Optional, Sequence
+
+from .json import JsonSerializer
+from .serializer import Serializer
+
+__all__ = ('Codecs', 'codecs', 'negotiate')
+
+
+class Codecs:
+    """Registry of serializers by media type used to decode request bodies."""
+
+    def __init__(self, *serializers: Serializer, default: Serializer = JsonSerializer):
+        self.default = default
+        self._codecs: Dict[str, Serializer] = {}
+        for serializer in (default, *serializers):
+            self.register(serializer)
+
+    def register(self, serializer: Serializer):
+        self._codecs[serializer.media_type] = serializer
+
+    def unregister(self, media_type: str):
+        if media_type != self.default.media_type:
+            self._codecs.pop(media_type, None)
+
+    def get(self, content_type: Optional[str]) -> Serializer:
+        if not content_type:
+            return self.default
+
+        media_type = content_type.partition(';')[0].strip().lower()
+        return self._codecs.get(media_type, self.default)
+
+    @property
+    def media_types(self) -> Sequence[str]:
+        return tuple(self._codecs)
+
+
+codecs = Codecs()
+
+
+def negotiate(accept: Optional[str], serializers: Sequence[Serializer]) -> Serializer:
+    """Choose the serializer for the Accept header, the first one by default."""
+    if not accept:
+        return serializers[0]
+
+    weights = {}
+    for item in accept.split(','):
+        media_range, _, params = item.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[media_range.strip().lower()] = weight
+
+    best = serializers[0]
+    best_weight = 0.0
+    for serializer in serializers:
+        media_type = serializer.media_type
+        weight = 0.0
+        # the most specific media range defines the weight
+        for media_range in (media_type, f'{media_type.split("/", 1)[0]}/*', '*/*'):
+            if media_range in weights:
+                weight = weights[media_range]
+                break
+
+        if weight > best_weight:
+            best, best_weight = serializer, weight
+
+    return best
@@ -0,0 +1,61 @@
+import importlib
+import json
+from typing import Any, Callable, Dict, Union
+
+import ujson
+
+__all__ = ('JsonEngine', 'get_engine', 'register_engine', 'ujson_engine', 'json_engine')
+
+
+class JsonEngine:
+    """JSON backend, ``dumps`` returns utf-8 encoded bytes."""
+    __slots__ = ('name', 'dumps', 'loads')
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[bytes, str]], Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self):
+        return f'JsonEngine({self.name!r})'
+
+
+def _ujson_dumps(content) -> bytes:
+    return ujson.dumps(content, ensure_ascii=False).encode('utf-8')
+
+
+def _json_dumps(content) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _create_orjson_engine() -> JsonEngine:
+    orjson = importlib.import_module('orjson')
+    return JsonEngine('orjson', orjson.dumps, orjson.loads)
+
+
+ujson_engine = JsonEngine('ujson', _ujson_dumps, ujson.loads)
+json_engine = JsonEngine('json', _json_dumps, json.loads)
+
+_engines: Dict[str, Union[JsonEngine, Callable[[], JsonEngine]]] = {
+    'ujson': ujson_engine,
+    'json': json_engine,
+    'orjson': _create_orjson_engine,
+}
+
+
+def register_engine(name: str, engine: Union[JsonEngine, Callable[[], JsonEngine]]):
+    _engines[name] = engine
+
+
+def get_engine(engine: Union[str, JsonEngine]) -> JsonEngine:
+    if isinstance(engine, JsonEngine):
+        return engine
+
+    factory = _engines.get(engine)
+    if factory is None:
+        raise ValueError(f'Unknown json engine: {engine}')
+
+    if not isinstance(factory, JsonEngine):
+        factory = _engines[engine] = factory()
+
+    return factory
@@ -1,11 +1,49 @@
-import ujson
+from typing import Type, Union
 
-__all__ = ('JsonSerializer',)
+from .engines import JsonEngine, get_engine, ujson_engine
+
+__all__ = ('JsonSerializer', 'NdJsonSerializer', 'set_json_engine')
 
 
 class JsonSerializer:
     media_type = 'application/json'
+    stream_start = b'['
+    stream_separator = b','
+    stream_end = b']'
+    engine: JsonEngine = ujson_engine
+    render = staticmethod(ujson_engine.dumps)
+    parse = staticmethod(ujson_engine.loads)
+
+    @classmethod
+    def using(cls, engine: Union[str, JsonEngine]) -> Type['JsonSerializer']:
+        engine = get_engine(engine)
+        return type(cls.__name__, (cls,), {
+            '__module__': cls.__module__,
+            'engine': engine,
+            'render': staticmethod(engine.dumps),
+            'parse': staticmethod(engine.loads),
+        })
+
+
+class NdJsonSerializer:
+    media_type = 'application/x-ndjson'
+    stream_start = b''
+    stream_separator = b''
+    stream_end = b''
 
     @staticmethod
     def render(content) -> bytes:
-        return ujson.dumps(content, ensure_ascii=False).encode('utf-8')
+        return JsonSerializer.engine.dumps(content) + b'\n'
+
+    @staticmethod
+    def parse(body: bytes):
+        loads = JsonSerializer.engine.loads
+        return [loads(line) for line in body.splitlines() if line.strip()]
+
+
+def set_json_engine(engine: Union[str, JsonEngine]):
+    """Set the json engine of the application for JsonSerializer and json request bodies."""
+    engine = get_engine(engine)
+    JsonSerializer.engine = engine
+    JsonSerializer.render = staticmethod(engine.dumps)
+    JsonSerializer.parse = staticmethod(engine.loads)
@@ -0,0 +1,21 @@
+import msgpack
+
+__all__ = ('MsgpackSerializer',)
+
+
+class MsgpackSerializer:
+    media_type = 'application/msgpack'
+    stream_start = b''
+    stream_separator = b''
+    stream_end = b''
+
+    @staticmethod
+    def render(content) -> bytes:
+        return msgpack.packb(content, use_bin_type=True)
+
+    @staticmethod
+    def parse(body: bytes):
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except msgpack.UnpackException as e:
+            raise ValueError(str(e)) from e
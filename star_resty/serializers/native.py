@@ -0,0 +1,122 @@
+import datetime
+import decimal
+import enum
+import uuid
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, Type
+
+from .json import JsonSerializer
+from .serializer import Serializer
+
+__all__ = ('encode', 'native', 'register_encoder', 'NativeJsonSerializer')
+
+PRIMITIVES = (str, int, float, bool, type(None))
+
+_plans: Dict[type, Callable[[Any], Any]] = {}
+_encoders: Dict[type, Callable[[Any], Any]] = {}
+
+
+def encode(obj: Any) -> Any:
+    """Convert the object to the serializable primitives.
+
+    Dataclasses become dicts of their fields, enums their values,
+    dates and times ISO 8601 strings, UUIDs and Decimals strings.
+    The conversion plan is created once per type.
+    """
+    cls = obj.__class__
+    if cls in PRIMITIVES:
+        return obj
+
+    plan = _plans.get(cls)
+    if plan is None:
+        plan = _plans[cls] = _create_plan(cls)
+
+    return plan(obj)
+
+
+def register_encoder(cls: type, encoder: Callable[[Any], Any]):
+    """Convert instances of the class and its subclasses by the ``encoder``."""
+    _encoders[cls] = encoder
+    _plans.clear()
+
+
+def native(serializer: Type[Serializer]) -> Type[Serializer]:
+    """Serializer that renders the content with ``encode`` applied."""
+
+    def render(content) -> bytes:
+        return serializer.render(encode(content))
+
+    return type(serializer.__name__, (serializer,), {
+        '__module__': serializer.__module__,
+        'render': staticmethod(render),
+    })
+
+
+def _create_plan(cls: type) -> Callable[[Any], Any]:
+    for base in cls.__mro__:
+        encoder = _encoders.get(base)
+        if encoder is not None:
+            return encoder
+
+    if is_dataclass(cls):
+        return _create_dataclass_plan(cls)
+
+    if issubclass(cls, enum.Enum):
+        return _encode_enum
+
+    if issubclass(cls, dict):
+        return _encode_dict
+
+    if issubclass(cls, (list, tuple, set, frozenset)):
+        return _encode_list
+
+    if issubclass(cls, (datetime.date, datetime.time)):
+        return _encode_isoformat
+
+    if issubclass(cls, (uuid.UUID, decimal.Decimal)):
+        return str
+
+    if issubclass(cls, PRIMITIVES):
+        return _create_primitive_plan(cls)
+
+    return _identity
+
+
+def _create_dataclass_plan(cls: type) -> Callable[[Any], Any]:
+    names = tuple(f.name for f in fields(cls))
+
+    def encode_dataclass(obj):
+        return {name: encode(getattr(obj, name)) for name in names}
+
+    return encode_dataclass
+
+
+def _create_primitive_plan(cls: type) -> Callable[[Any], Any]:
+    for base in cls.__mro__:
+        if base in PRIMITIVES:
+            return base
+
+    return _identity
+
+
+def _encode_enum(obj: enum.Enum) -> Any:
+    return encode(obj.value)
+
+
+def _encode_dict(obj: dict) -> dict:
+    return {(key if key.__class__ is str else encode(key)): encode(value) for (key, value) in obj.items()}
+
+
+def _encode_list(obj) -> list:
+    return [encode(value) for value in obj]
+
+
+def _encode_isoformat(obj) -> str:
+    return obj.isoformat()
+
+
+def _identity(obj: Any) -> Any:
+    return obj
+
+
+NativeJsonSerializer = native(JsonSerializer)
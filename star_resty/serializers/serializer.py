@@ -5,6 +5,12 @@ __all__ = ('Serializer',)
 
 class Serializer(Protocol):
     media_type: str
+    stream_start: bytes
+    stream_separator: bytes
+    stream_end: bytes
 
     def render(self, resp) -> bytes:
         pass
+
+    def parse(self, body: bytes):
+        pass
@@ -0,0 +1,188 @@
+import logging
+import time
+import tracemalloc
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Iterator, Sequence, Set, Tuple, Type
+
+from marshmallow import Schema, fields
+from starlette.applications import Starlette
+from starlette.routing import BaseRoute, Mount, Route
+
+from star_resty.method import Method
+from star_resty.method.dispatch import get_json_engine
+from star_resty.method.render import get_response_schema, get_serializers
+from star_resty.serializers import codecs
+
+__all__ = ('prepare', 'PrepareReport', 'EndpointReport')
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class EndpointReport:
+    path: str
+    endpoint: str
+    seconds: float
+    memory: int
+    compile_seconds: float = 0.0
+    compile_memory: int = 0
+
+
+@dataclass(frozen=True)
+class PrepareReport:
+    endpoints: Tuple[EndpointReport, ...]
+    spec_seconds: float
+    spec_memory: int
+
+    @property
+    def seconds(self) -> float:
+        return sum(item.seconds for item in self.endpoints) + self.spec_seconds
+
+    @property
+    def memory(self) -> int:
+        return sum(item.memory for item in self.endpoints) + self.spec_memory
+
+    @property
+    def compile_seconds(self) -> float:
+        return sum(item.compile_seconds for item in self.endpoints)
+
+    @property
+    def compile_memory(self) -> int:
+        return sum(item.compile_memory for item in self.endpoints)
+
+    def format(self) -> str:
+        lines = [f'{"path":<40} {"endpoint":<50} {"ms":>8} {"KiB":>8} {"compile ms":>10} {"compile KiB":>11}']
+        for item in sorted(self.endpoints, key=lambda value: value.seconds + value.compile_seconds, reverse=True):
+            lines.append(f'{item.path:<40} {item.endpoint:<50} '
+                         f'{item.seconds * 1000:>8.2f} {item.memory / 1024:>8.1f} '
+                         f'{item.compile_seconds * 1000:>10.2f} {item.compile_memory / 1024:>11.1f}')
+        lines.append(f'{"apidocs":<91} {self.spec_seconds * 1000:>8.2f} {self.spec_memory / 1024:>8.1f}')
+        lines.append(f'{"total":<91} {self.seconds * 1000:>8.2f} {self.memory / 1024:>8.1f} '
+                     f'{self.compile_seconds * 1000:>10.2f} {self.compile_memory / 1024:>11.1f}')
+        return '\n'.join(lines)
+
+
+def prepare(app: Starlette, trace_memory: bool = True) -> PrepareReport:
+    """Warm up all endpoints of the application ahead of traffic.
+
+    Routes are walked through mounts, schemas of every endpoint declared
+    by the lazy nested fields are resolved, the serializers, json engines
+    and request codecs are run once and the apidocs registered by
+    ``setup_spec`` are rendered. The time and the memory of this work are
+    reported per endpoint along with the cost of compiling its parsers,
+    render and dispatch at the class creation (the memory of which is
+    known only if tracemalloc was tracing at the time, e.g. with
+    ``PYTHONTRACEMALLOC=1``).
+    """
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+
+    try:
+        seen: Set[Type[Method]] = set()
+        warmed: Set[Tuple[Callable, Callable]] = set()
+        endpoints = []
+        for (path, endpoint) in iter_endpoints(app.routes):
+            if endpoint in seen:
+                continue
+
+            seen.add(endpoint)
+            seconds, memory = measure(partial(prepare_endpoint, warmed=warmed), endpoint, trace_memory)
+            endpoints.append(EndpointReport(path, f'{endpoint.__module__}.{endpoint.__qualname__}', seconds, memory,
+                                            getattr(endpoint, '__compile_seconds__', 0.0),
+                                            getattr(endpoint, '__compile_memory__', 0)))
+
+        spec_seconds, spec_memory = measure(prepare_apidocs, app, trace_memory)
+    finally:
+        if tracing:
+            tracemalloc.stop()
+
+    report = PrepareReport(tuple(endpoints), spec_seconds, spec_memory)
+    logger.info('prepared %d endpoints in %.3fs\n%s', len(endpoints), report.seconds, report.format())
+    return report
+
+
+def prepare_endpoint(endpoint: Type[Method], warmed: Set[Tuple[Callable, Callable]]):
+    """Resolve all schemas and warm the codecs of the endpoint, parsers and dispatch are compiled with the class."""
+    resolved: Set[int] = set()
+    for parser in endpoint.__parser__:
+        schema = getattr(parser, 'schema', None)
+        if isinstance(schema, Schema):
+            resolve_schema(schema, resolved)
+
+    response_schema = get_response_schema(endpoint)
+    if response_schema is not None:
+        resolve_schema(response_schema, resolved)
+
+    warm = list(get_serializers(endpoint))
+    engine = get_json_engine(endpoint)
+    if engine is not None:
+        warm.append(engine)
+
+    if endpoint.__parser__.readers:
+        warm.extend(codecs.get(media_type) for media_type in codecs.media_types)
+
+    for codec in warm:
+        # serializers created by JsonSerializer.using share the functions of their engine
+        functions = (getattr(codec, 'render', None) or codec.dumps, getattr(codec, 'parse', None) or codec.loads)
+        if functions not in warmed:
+            warmed.add(functions)
+            warm_codec(codec, *functions)
+
+
+def warm_codec(codec: Any, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]):
+    """Encode and decode a sample, the first call imports and sets up the backend of the codec."""
+    try:
+        loads(dumps({'warmup': [1, 1.5, 'a', None, True]}))
+    except (TypeError, ValueError) as e:
+        logger.warning('Failed to warm up codec %r: %s', codec, e)
+
+
+def prepare_apidocs(app: Starlette):
+    for build in getattr(app.state, 'star_resty_apidocs', ()):
+        build()
+
+
+def resolve_schema(schema: Schema, resolved: Set[int]):
+    """Resolve the schemas of nested fields declared by names or callables."""
+    if id(schema) in resolved:
+        return
+
+    resolved.add(id(schema))
+    for field in schema.fields.values():
+        resolve_field(field, resolved)
+
+
+def resolve_field(field: fields.Field, resolved: Set[int]):
+    if isinstance(field, fields.Nested):
+        resolve_schema(field.schema, resolved)
+    elif isinstance(field, fields.List):
+        resolve_field(field.inner, resolved)
+    elif isinstance(field, fields.Tuple):
+        for item in field.tuple_fields:
+            resolve_field(item, resolved)
+    elif isinstance(field, fields.Mapping):
+        for item in (field.key_field, field.value_field):
+            if item is not None:
+                resolve_field(item, resolved)
+
+
+def iter_endpoints(routes: Sequence[BaseRoute], path: str = '') -> Iterator[Tuple[str, Type[Method]]]:
+    for route in routes:
+        if isinstance(route, Mount):
+            yield from iter_endpoints(route.routes, f'{path}{route.path}')
+        elif isinstance(route, Route):
+            endpoint = getattr(route.endpoint, '__endpoint__', None)
+            if endpoint is not None:
+                yield f'{path}{route.path}', endpoint
+
+
+def measure(func: Callable, arg, trace_memory: bool) -> Tuple[float, int]:
+    memory = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+    start = time.perf_counter()
+    func(arg)
+    seconds = time.perf_counter() - start
+    if trace_memory:
+        memory = max(tracemalloc.get_traced_memory()[0] - memory, 0)
+    return seconds, memory
@@ -1,8 +1,15 @@
+from contextlib import asynccontextmanager
+
+import pytest
+from marshmallow import Schema, fields
+from marshmallow.validate import Length
 from starlette.applications import Starlette
 from starlette.routing import Mount, Route, Router
 from starlette.testclient import TestClient
 
-from star_resty.apidocs import setup_spec
+from star_resty import Method, json_payload, prepare
+from star_resty.apidocs import route as route_module, setup_spec
+from star_resty.apidocs.route import routes_digest
 from .utils.method import CreateUser, GetUser, SearchUser, GetItemsEcho
 
 
@@ -26,6 +33,7 @@ def test_generate_api_docs():
                     {'in': 'body', 'name': 'body', 'required': False,
                      'schema': {'$ref': '#/definitions/tests.utils.method.BodySchema'}}],
                 'produces': ['application/json'],
+                'consumes': ['application/json'],
                 'responses': {
                     '201': {'schema': {
                         '$ref': '#/definitions/tests.utils.method.CreateUserResponse'}},
@@ -66,6 +74,7 @@ def test_generate_api_docs_for_router():
     assert body.get('paths') == {
         '/v1/users': {
             'post': {'tags': ['users'], 'description': 'create user', 'produces': ['application/json'],
+                     'consumes': ['application/json'],
                      'parameters': [
                          {'in': 'path', 'name': 'id', 'required': True, 'type': 'integer', 'format': 'int32'},
                          {'in': 'body', 'required': False, 'name': 'body',
@@ -96,6 +105,7 @@ def test_generate_api_docs_for_path():
     assert body.get('paths') == {
         '/users/{user_id}': {
             'post': {'tags': ['users'], 'description': 'get user', 'produces': ['application/json'],
+                     'consumes': ['application/json'],
                      'parameters': [
                          {'in': 'path', 'name': 'id', 'required': True, 'type': 'integer', 'format': 'int32'},
                          {'in': 'body', 'required': False, 'name': 'body',
@@ -123,3 +133,144 @@ def test_generate_api_docs_for_nested():
                                   '400': {'description': 'Bad request'}}}
         }
     }
+
+
+def test_api_docs_etag():
+    app = Starlette()
+    setup_spec(app, title='test', precompress=True)
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+
+    client = TestClient(app)
+    resp = client.get('/apidocs.json')
+    etag = resp.headers['etag']
+    assert resp.json()['paths']['/users']
+    resp = client.get('/apidocs.json', headers={'if-none-match': etag})
+    assert resp.status_code == 304
+    assert resp.content == b''
+
+    resp = client.get('/apidocs')
+    assert resp.headers['content-type'] == 'text/html; charset=utf-8'
+    assert '"/users"' in resp.text
+    assert client.get('/apidocs', headers={'if-none-match': resp.headers['etag']}).status_code == 304
+    assert client.get('/apidocs.json', headers={'if-none-match': resp.headers['etag']}).status_code == 200
+
+    resp = client.get('/apidocs.json', headers={'accept-encoding': 'deflate'})
+    assert resp.headers['content-encoding'] == 'deflate'
+    assert resp.headers['etag'] == etag
+
+
+def test_api_docs_eager():
+    app = Starlette()
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+    spec = setup_spec(app, title='test', eager=True)
+    assert not spec.to_dict()['paths']
+    with TestClient(app):
+        assert '/users' in spec.to_dict()['paths']
+
+
+def test_api_docs_lifespan():
+    @asynccontextmanager
+    async def lifespan(app):
+        prepare(app)
+        yield
+
+    app = Starlette(lifespan=lifespan)
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+    spec = setup_spec(app, title='test')
+    with TestClient(app):
+        assert '/users' in spec.to_dict()['paths']
+
+
+def test_api_docs_disk_cache(tmp_path, monkeypatch):
+    def create_app():
+        app = Starlette(routes=[Mount('/v1', Router([Route('/users', CreateUser.as_endpoint(), methods=['POST'])]))])
+        setup_spec(app, title='test', cache_dir=str(tmp_path))
+        return app
+
+    body = TestClient(create_app()).get('/apidocs.json').json()
+    assert '/v1/users' in body['paths']
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError('routes are inspected')
+
+    monkeypatch.setattr('star_resty.apidocs.route.setup_route_operations', fail)
+    assert TestClient(create_app()).get('/apidocs.json').json() == body
+
+    app = create_app()
+    app.add_route('/items', GetItemsEcho.as_endpoint(), methods=['POST'])
+    with pytest.raises(AssertionError):
+        TestClient(app).get('/apidocs.json')
+
+
+def test_api_docs_incremental(monkeypatch):
+    app = Starlette()
+    router = Router([Route('/users', CreateUser.as_endpoint(), methods=['POST'])])
+    app.mount('/v1', router)
+    setup_spec(app, title='test')
+    client = TestClient(app)
+    body = client.get('/apidocs.json').json()
+    assert list(body['paths']) == ['/v1/users']
+    definitions = body['definitions']
+
+    processed = []
+    setup_route_operations = route_module.setup_route_operations
+
+    def track(route, endpoint, **kwargs):
+        processed.append(route.path)
+        return setup_route_operations(route, endpoint, **kwargs)
+
+    monkeypatch.setattr(route_module, 'setup_route_operations', track)
+    etag = client.get('/apidocs.json').headers['etag']
+    assert processed == []
+
+    router.add_route('/users', SearchUser.as_endpoint(), methods=['GET'])
+    app.add_route('/users/{user_id}', GetUser.as_endpoint(), methods=['GET'])
+    resp = client.get('/apidocs.json', headers={'if-none-match': etag})
+    assert resp.status_code == 200
+    assert processed == ['/users', '/users/{user_id}']
+    body = resp.json()
+    assert list(body['paths']) == ['/v1/users', '/users/{user_id}']
+    assert list(body['paths']['/v1/users']) == ['post', 'get']
+    assert set(definitions).issubset(body['definitions'])
+    assert '"/users/{user_id}"' in client.get('/apidocs').text
+
+    del router.routes[0]
+    processed.clear()
+    body = client.get('/apidocs.json').json()
+    assert processed == ['/users', '/users/{user_id}']
+    assert list(body['paths']) == ['/v1/users', '/users/{user_id}']
+    assert list(body['paths']['/v1/users']) == ['get']
+    assert not any(name.endswith('1') for name in body['definitions'])
+    assert not set(definitions).issubset(body['definitions'])
+
+    processed.clear()
+    router.routes[0] = Route('/users/search', SearchUser.as_endpoint(), methods=['GET'])
+    body = client.get('/apidocs.json').json()
+    assert processed == ['/users/search', '/users/{user_id}']
+    assert list(body['paths']) == ['/v1/users/search', '/users/{user_id}']
+
+    router.routes = [Route('/users', CreateUser.as_endpoint(), methods=['POST'])]
+    body = client.get('/apidocs.json').json()
+    assert list(body['paths']) == ['/v1/users', '/users/{user_id}']
+
+
+def test_routes_digest_schemas():
+    def create_routes(*schema_fields):
+        schema_cls = Schema.from_dict(dict(schema_fields), name='ItemSchema')
+
+        class GetItem(Method):
+            response_schema = schema_cls
+
+            async def execute(self, item: json_payload(schema_cls)):
+                return item
+
+        GetItem.__qualname__ = 'GetItem'
+        return [Route('/items', GetItem.as_endpoint(), methods=['POST'])]
+
+    name = ('name', fields.String())
+    digest = routes_digest(create_routes(name))
+    assert routes_digest(create_routes(('name', fields.String()))) == digest
+    assert routes_digest(create_routes(name, ('id', fields.Integer()))) != digest
+    assert routes_digest(create_routes(('name', fields.String(required=True)))) != digest
+    assert routes_digest(create_routes(('name', fields.String(validate=Length(max=10))))) != digest
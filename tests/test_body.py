@@ -0,0 +1,154 @@
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from star_resty import Method, Operation, form_payload, json_payload, set_max_body_size, upload
+from star_resty.exceptions import DecodeError, PayloadTooLarge
+from star_resty.payload.body import read_limited
+from star_resty.payload.json import IncrementalJsonReader, JsonParser
+from .utils.method import BodySchema
+
+BODY = {'name': 'Name', 'email': 'email@mail.com', 'skip': {'items': [{'a': '}]"'}] * 10}}
+
+
+class CreateUser(Method):
+    meta = Operation(max_body_size=100)
+
+    async def execute(self, user: json_payload(BodySchema)):
+        return user
+
+
+class CreateUserIncremental(Method):
+    async def execute(self, user: json_payload(BodySchema, incremental=True)):
+        return user
+
+
+class CreateUserForm(Method):
+    meta = Operation(max_body_size=100)
+
+    async def execute(self, user: form_payload(BodySchema)):
+        return user
+
+
+class UploadFiles(Method):
+    meta = Operation(max_body_size=1000)
+
+    async def execute(self, files: upload('file')):
+        return {'files': len(files)}
+
+
+def create_client() -> TestClient:
+    app = Starlette()
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+    app.add_route('/users/form', CreateUserForm.as_endpoint(), methods=['POST'])
+    app.add_route('/files', UploadFiles.as_endpoint(), methods=['POST'])
+    app.add_route('/users/incremental', CreateUserIncremental.as_endpoint(), methods=['POST'])
+    return TestClient(app)
+
+
+def create_request(*chunks: bytes, headers=()) -> Request:
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': True} for chunk in chunks]
+    messages.append({'type': 'http.request', 'body': b'', 'more_body': False})
+
+    async def receive():
+        return messages.pop(0)
+
+    return Request({'type': 'http', 'method': 'POST', 'headers': list(headers)}, receive)
+
+
+def chunks(data: bytes, size: int = 7):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_body_limit():
+    client = create_client()
+    resp = client.post('/users', json={'name': 'Name'})
+    assert resp.status_code == 200
+
+    resp = client.post('/users', json=BODY)
+    assert resp.status_code == 413
+
+    resp = client.post('/users', content=chunks(json.dumps(BODY).encode()))
+    assert resp.status_code == 413
+
+
+def test_form_body_limit():
+    client = create_client()
+    resp = client.post('/users/form', data={'name': 'Name'})
+    assert resp.status_code == 200
+    assert resp.json() == {'name': 'Name'}
+
+    resp = client.post('/users/form', data={'name': 'x' * 1000})
+    assert resp.status_code == 413
+
+    headers = {'content-type': 'application/x-www-form-urlencoded'}
+    resp = client.post('/users/form', content=chunks(b'name=' + b'x' * 1000), headers=headers)
+    assert resp.status_code == 413
+
+
+def test_upload_body_limit():
+    client = create_client()
+    resp = client.post('/files', files={'file': ('a.txt', b'x')})
+    assert resp.status_code == 200
+    assert resp.json() == {'files': 1}
+
+    resp = client.post('/files', files={'file': ('a.txt', b'x' * 2000)})
+    assert resp.status_code == 413
+
+
+def test_default_body_limit():
+    client = create_client()
+    set_max_body_size(10)
+    try:
+        resp = client.post('/users/incremental', json=BODY)
+        assert resp.status_code == 413
+        assert client.post('/users', json={'name': 'Name'}).status_code == 200
+    finally:
+        set_max_body_size(None)
+
+    assert client.post('/users/incremental', json=BODY).status_code == 200
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('size', [1, 3, 7, 1000])
+async def test_incremental_reader(size: int):
+    reader = JsonParser.create(BodySchema, incremental=True).reader
+    data = json.dumps(BODY, indent=2).encode()
+    assert await reader(create_request(*chunks(data, size))) == {'name': 'Name', 'email': 'email@mail.com'}
+
+    reader = IncrementalJsonReader()
+    assert await reader(create_request(*chunks(data, size))) == BODY
+    assert await reader(create_request(*chunks(b'[1, 2]', size))) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_incremental_reader_errors():
+    reader = IncrementalJsonReader(frozenset())
+    with pytest.raises(DecodeError):
+        await reader(create_request(b'{"name": "Name"'))
+
+    with pytest.raises(DecodeError):
+        await reader(create_request(b'{"name" "Name"}'))
+
+    with pytest.raises(PayloadTooLarge):
+        await read_limited(reader, create_request(b'{}', headers=[(b'content-length', b'1000000')]), 100)
+
+    with pytest.raises(PayloadTooLarge):
+        await read_limited(reader, create_request(b'{"name":', b'"Name"}'), 10)
+
+
+def test_incremental_parser_unknown():
+    assert JsonParser.create(BodySchema, incremental=True).reader.keys == frozenset(('name', 'email'))
+    assert JsonParser.create(BodySchema, unknown='raise', incremental=True).reader.keys is None
+
+
+def test_incremental_with_other_body_parser():
+    with pytest.raises(TypeError):
+        class CreateUsers(Method):
+            async def execute(self, user: json_payload(BodySchema, incremental=True),
+                              other: json_payload(BodySchema)):
+                pass
@@ -0,0 +1,194 @@
+import pytest
+from marshmallow import Schema, fields
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import CachePolicy, Method, Operation, inject, json_payload, query
+from star_resty.cache import ResponseCache, make_key
+from .utils.method import BodySchema
+
+
+class QuerySchema(Schema):
+    q = fields.String()
+    ids = fields.List(fields.Integer())
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('star_resty.cache.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_cache_ttl(clock):
+    cache = ResponseCache()
+    cache.set('a', b'body', ttl=10)
+    assert cache.get('a').body == b'body'
+    clock[0] += 10
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.hit_rate) == (1, 1, 0.5)
+
+
+def test_cache_lru_size():
+    cache = ResponseCache(max_size=10)
+    cache.set('a', b'1234')
+    cache.set('b', b'1234')
+    assert cache.get('a') is not None
+    cache.set('c', b'1234')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.set('d', b'12345678901') is None
+    stats = cache.stats()
+    assert (stats.count, stats.size, stats.evictions) == (2, 8, 1)
+
+
+def test_cache_invalidate_tags():
+    cache = ResponseCache()
+    cache.set('a', b'1', tags=('items', 'catalog'))
+    cache.set('b', b'2', tags=('catalog',))
+    cache.set('c', b'3', tags=('users',))
+    assert cache.invalidate('items') == 1
+    assert cache.invalidate('catalog') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_cache_endpoint():
+    store = ResponseCache()
+    calls = []
+
+    class Items(Method):
+        meta = Operation(tag='items', cache=CachePolicy(ttl=60, tags=('catalog',), store=store))
+
+        async def execute(self, params: query(QuerySchema)):
+            calls.append(params)
+            self.status_code = 201
+            return {'calls': len(calls), **params}
+
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+
+    for _ in range(3):
+        resp = client.get('/items?q=a&ids=1&ids=2')
+        assert resp.status_code == 201
+        assert resp.json() == {'calls': 1, 'q': 'a', 'ids': [1, 2]}
+
+    assert client.get('/items?ids=1&ids=2&q=a').json()['calls'] == 1
+    assert client.get('/items?q=b').json()['calls'] == 2
+    assert store.stats().hits == 3
+
+    store.invalidate('items')
+    assert client.get('/items?q=a&ids=1&ids=2').json()['calls'] == 3
+    store.invalidate('catalog')
+    assert client.get('/items?q=b').json()['calls'] == 4
+
+
+class Session:
+    pass
+
+
+async def get_session():
+    return Session()
+
+
+def test_make_key_unfrozen():
+    assert make_key('m', ({'a': [1, {2}]}, None, int)) == ('m', (('a', (1, frozenset({2}))),), None, int)
+    assert make_key('m', (Session(),)) is None
+    assert make_key('m', ([bytearray(b'a')],)) is None
+
+
+def test_cache_skip_unfrozen():
+    store = ResponseCache()
+    calls = []
+
+    class Items(Method):
+        meta = Operation(tag='items', cache=CachePolicy(store=store))
+
+        async def execute(self, params: query(QuerySchema), session: inject.depends(get_session)):
+            calls.append(params)
+            return {'calls': len(calls)}
+
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+    assert client.get('/items?q=a').json() == {'calls': 1}
+    assert client.get('/items?q=a').json() == {'calls': 2}
+    assert len(store) == 0
+
+
+def test_cache_exclude():
+    store = ResponseCache()
+    calls = []
+
+    class Items(Method):
+        meta = Operation(tag='items', cache=CachePolicy(store=store, exclude=('session',)))
+
+        async def execute(self, params: query(QuerySchema), session: inject.depends(get_session)):
+            calls.append(params)
+            return {'calls': len(calls)}
+
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+    assert client.get('/items?q=a').json() == {'calls': 1}
+    assert client.get('/items?q=a').json() == {'calls': 1}
+    assert client.get('/items?q=b').json() == {'calls': 2}
+    assert len(store) == 2
+
+
+def test_cache_key():
+    store = ResponseCache()
+    calls = []
+
+    class Items(Method):
+        meta = Operation(tag='items', cache=CachePolicy(store=store, key=lambda params, session: params.get('q')))
+
+        async def execute(self, params: query(QuerySchema), session: inject.depends(get_session)):
+            calls.append(params)
+            return {'calls': len(calls)}
+
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+    assert client.get('/items?q=a&ids=1').json() == {'calls': 1}
+    assert client.get('/items?q=a&ids=2').json() == {'calls': 1}
+    assert client.get('/items?q=b').json() == {'calls': 2}
+
+
+def test_cache_exclude_unknown():
+    with pytest.raises(TypeError):
+        class Items(Method):
+            meta = Operation(cache=CachePolicy(exclude=('session',)))
+
+            async def execute(self, params: query(QuerySchema)):
+                return params
+
+
+def test_cache_body_not_supported():
+    with pytest.raises(TypeError):
+        class CreateItem(Method):
+            meta = Operation(cache=CachePolicy())
+
+            async def execute(self, body: json_payload(BodySchema)):
+                return body
+
+
+def test_cache_etag():
+    class Items(Method):
+        meta = Operation(tag='items', etag=True, cache=CachePolicy(store=ResponseCache()))
+
+        async def execute(self):
+            return {'id': 1}
+
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+    etag = client.get('/items').headers['etag']
+    resp = client.get('/items')
+    assert resp.status_code == 200
+    assert resp.headers['etag'] == etag
+    assert client.get('/items', headers={'if-none-match': etag}).status_code == 304
@@ -0,0 +1,69 @@
+import msgpack
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method, json_payload
+from star_resty.apidocs import setup_spec
+from star_resty.serializers import JsonSerializer, NdJsonSerializer, codecs, negotiate
+from star_resty.serializers.msgpack import MsgpackSerializer
+from .utils.method import BodySchema, CreateUserResponse
+
+
+class Echo(Method):
+    response_schema = CreateUserResponse
+    serializers = (MsgpackSerializer,)
+
+    async def execute(self, body: json_payload(BodySchema)):
+        return {'id': 1, **body}
+
+
+@pytest.fixture()
+def msgpack_codec():
+    codecs.register(MsgpackSerializer)
+    yield
+    codecs.unregister(MsgpackSerializer.media_type)
+
+
+def test_negotiate():
+    serializers = (JsonSerializer, MsgpackSerializer)
+    assert negotiate(None, serializers) is JsonSerializer
+    assert negotiate('*/*', serializers) is JsonSerializer
+    assert negotiate('application/msgpack', serializers) is MsgpackSerializer
+    assert negotiate('application/json;q=0.5, application/*', serializers) is MsgpackSerializer
+    assert negotiate('text/html', serializers) is JsonSerializer
+    assert negotiate('application/x-ndjson', (JsonSerializer, NdJsonSerializer)) is NdJsonSerializer
+
+
+def test_codecs_get(msgpack_codec):
+    assert codecs.get(None) is JsonSerializer
+    assert codecs.get('application/msgpack; charset=utf-8') is MsgpackSerializer
+    assert codecs.get('text/plain') is JsonSerializer
+
+
+def test_msgpack_body_and_response(msgpack_codec):
+    app = Starlette()
+    app.add_route('/echo', Echo.as_endpoint(), methods=['POST'])
+    client = TestClient(app)
+    body = msgpack.packb({'name': 'Name', 'email': 'email@mail.com'})
+
+    resp = client.post('/echo', content=body, headers={'content-type': 'application/msgpack',
+                                                       'accept': 'application/msgpack'})
+    assert resp.status_code == 200
+    assert resp.headers['content-type'] == 'application/msgpack'
+    assert resp.headers['vary'] == 'Accept'
+    assert msgpack.unpackb(resp.content) == {'id': 1, 'name': 'Name', 'email': 'email@mail.com'}
+
+    resp = client.post('/echo', json={'name': 'Name'})
+    assert resp.headers['content-type'] == 'application/json'
+    assert resp.json() == {'id': 1, 'name': 'Name'}
+
+
+def test_api_docs_media_types(msgpack_codec):
+    app = Starlette()
+    setup_spec(app, title='test', openapi_version='3.0.2')
+    app.add_route('/echo', Echo.as_endpoint(), methods=['POST'])
+    operation = TestClient(app).get('/apidocs.json').json()['paths']['/echo']['post']
+    assert list(operation['requestBody']['content']) == ['application/json', 'application/msgpack']
+    assert list(operation['responses']['200']['content']) == ['application/json', 'application/msgpack']
+    assert operation['produces'] == ['application/json', 'application/msgpack']
@@ -0,0 +1,41 @@
+from collections import defaultdict
+
+from marshmallow import Schema, fields, post_load, pre_dump, validates
+from marshmallow.decorators import POST_DUMP, POST_LOAD, PRE_DUMP, PRE_LOAD, VALIDATES
+
+from star_resty.compat import has_processors
+
+
+class Hooked(Schema):
+    id = fields.Integer()
+
+    @post_load
+    def make(self, data, **kwargs):
+        return data
+
+    @pre_dump(pass_many=True)
+    def prepare(self, data, **kwargs):
+        return data
+
+    @validates('id')
+    def validate_id(self, value, **kwargs):
+        pass
+
+
+def test_has_processors():
+    schema = Hooked()
+    assert has_processors(schema, POST_LOAD)
+    assert has_processors(schema, PRE_DUMP)
+    assert has_processors(schema, VALIDATES)
+    assert not has_processors(schema, PRE_LOAD)
+    assert not has_processors(schema, POST_DUMP)
+    assert not has_processors(Schema.from_dict({'id': fields.Integer()})(), POST_LOAD)
+
+
+def test_has_processors_layouts():
+    schema = Schema()
+    schema._hooks = defaultdict(list, {(POST_LOAD, True): ['make']})
+    assert has_processors(schema, POST_LOAD)
+    schema._hooks = defaultdict(list, {POST_LOAD: [('make', False, {})]})
+    assert has_processors(schema, POST_LOAD)
+    assert not has_processors(schema, PRE_LOAD)
@@ -0,0 +1,140 @@
+import gzip
+import zlib
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import CachePolicy, Method, Operation
+from star_resty.apidocs import setup_spec
+from star_resty.cache import ResponseCache
+from star_resty.compression import Compression, choose_encoding, compress
+from .utils.method import CreateUser
+
+
+def test_choose_encoding():
+    assert choose_encoding(None) is None
+    assert choose_encoding('br') is None
+    assert choose_encoding('gzip, deflate') == 'gzip'
+    assert choose_encoding('gzip;q=0.5, deflate') == 'deflate'
+    assert choose_encoding('gzip;q=0, *') == 'deflate'
+    assert choose_encoding('identity') is None
+
+
+def test_compress():
+    body = b'{"items":[1,2,3]}' * 10
+    assert gzip.decompress(compress(body, 'gzip')) == body
+    assert zlib.decompress(compress(body, 'deflate')) == body
+
+
+class Items(Method):
+    meta = Operation(compression=Compression(min_size=100, level=1))
+
+    async def execute(self):
+        return {'items': list(range(100))}
+
+
+class Tagged(Method):
+    meta = Operation(etag=True, compression=Compression(min_size=100, level=1))
+
+    async def execute(self):
+        return {'items': list(range(100))}
+
+
+class Versioned(Method):
+    meta = Operation(compression=Compression(min_size=100, level=1))
+
+    async def execute(self):
+        self.etag = 'v1'
+        return {'items': list(range(100))}
+
+
+class Small(Method):
+    meta = Operation(compression=Compression(min_size=100))
+
+    async def execute(self):
+        return {'id': 1}
+
+
+def test_compress_response():
+    app = Starlette()
+    app.add_route('/items', Items.as_endpoint(), methods=['GET'])
+    app.add_route('/small', Small.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+
+    resp = client.get('/items', headers={'accept-encoding': 'gzip'})
+    assert resp.headers['content-encoding'] == 'gzip'
+    assert resp.headers['vary'] == 'Accept-Encoding'
+    assert resp.json() == {'items': list(range(100))}
+
+    resp = client.get('/items', headers={'accept-encoding': 'identity'})
+    assert 'content-encoding' not in resp.headers
+    assert resp.json() == {'items': list(range(100))}
+
+    resp = client.get('/small', headers={'accept-encoding': 'gzip'})
+    assert 'content-encoding' not in resp.headers
+    assert resp.json() == {'id': 1}
+
+
+def test_compress_cached_once():
+    store = ResponseCache()
+
+    class CachedItems(Items):
+        meta = Operation(compression=Compression(min_size=100), cache=CachePolicy(store=store))
+
+    app = Starlette()
+    app.add_route('/items', CachedItems.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+    for _ in range(3):
+        resp = client.get('/items', headers={'accept-encoding': 'deflate'})
+        assert resp.headers['content-encoding'] == 'deflate'
+        assert resp.json() == {'items': list(range(100))}
+
+    entry = next(iter(store._entries.values()))
+    assert list(entry.variants) == ['deflate']
+    assert store.stats().size == entry.size
+
+
+def test_compress_api_docs():
+    app = Starlette()
+    setup_spec(app, title='test', compression=Compression(min_size=0))
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+
+    client = TestClient(app)
+    resp = client.get('/apidocs.json', headers={'accept-encoding': 'gzip'})
+    assert resp.headers['content-encoding'] == 'gzip'
+    assert '/users' in resp.json()['paths']
+
+
+def test_compress_weak_etag():
+    app = Starlette()
+    app.add_route('/items', Tagged.as_endpoint(), methods=['GET'])
+    app.add_route('/versioned', Versioned.as_endpoint(), methods=['GET'])
+    client = TestClient(app)
+
+    gzipped = client.get('/items', headers={'accept-encoding': 'gzip'})
+    deflated = client.get('/items', headers={'accept-encoding': 'deflate'})
+    identity = client.get('/items', headers={'accept-encoding': 'identity'})
+    assert gzipped.headers['content-encoding'] == 'gzip'
+    assert deflated.headers['content-encoding'] == 'deflate'
+    assert 'content-encoding' not in identity.headers
+    etag = gzipped.headers['etag']
+    assert etag.startswith('W/"')
+    assert deflated.headers['etag'] == identity.headers['etag'] == etag
+
+    resp = client.get('/items', headers={'accept-encoding': 'gzip', 'if-none-match': etag})
+    assert resp.status_code == 304
+    assert resp.headers['etag'] == etag
+
+    resp = client.get('/versioned', headers={'accept-encoding': 'gzip'})
+    assert resp.headers['etag'] == 'W/"v1"'
+    resp = client.get('/versioned', headers={'if-none-match': '"v1"'})
+    assert resp.status_code == 304
+    assert resp.headers['etag'] == 'W/"v1"'
+
+    app = Starlette()
+    setup_spec(app, title='test', compression=Compression(min_size=0))
+    client = TestClient(app)
+    gzipped = client.get('/apidocs.json', headers={'accept-encoding': 'gzip'})
+    identity = client.get('/apidocs.json', headers={'accept-encoding': 'identity'})
+    assert gzipped.headers['etag'] == identity.headers['etag']
+    assert gzipped.headers['etag'].startswith('W/"')
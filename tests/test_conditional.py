@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method, Operation
+from .utils.method import SearchUserResponse
+
+dumps = []
+
+
+class CountingSchema(SearchUserResponse):
+    def dump(self, obj, *args, **kwargs):
+        dumps.append(obj)
+        return super().dump(obj, *args, **kwargs)
+
+
+class GetUser(Method):
+    meta = Operation(etag=True)
+    response_schema = CountingSchema
+
+    async def execute(self):
+        return {'id': 1}
+
+
+class GetVersionedUser(Method):
+    response_schema = CountingSchema
+
+    async def execute(self):
+        self.etag = 'v5'
+        self.last_modified = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        if self.not_modified:
+            return None
+        return {'id': 5}
+
+
+def create_client() -> TestClient:
+    app = Starlette()
+    app.add_route('/user', GetUser.as_endpoint(), methods=['GET'])
+    app.add_route('/versioned', GetVersionedUser.as_endpoint(), methods=['GET', 'POST'])
+    return TestClient(app)
+
+
+def test_etag_from_body():
+    client = create_client()
+    resp = client.get('/user')
+    assert resp.status_code == 200
+    etag = resp.headers['etag']
+    assert etag.startswith('"') and etag.endswith('"')
+
+    resp = client.get('/user', headers={'if-none-match': f'"other", W/{etag}'})
+    assert resp.status_code == 304
+    assert resp.content == b''
+    assert resp.headers['etag'] == etag
+
+    assert client.get('/user', headers={'if-none-match': '"other"'}).status_code == 200
+
+
+def test_version_from_execute():
+    client = create_client()
+    dumps.clear()
+    resp = client.get('/versioned')
+    assert resp.status_code == 200
+    assert resp.json() == {'id': 5}
+    assert resp.headers['etag'] == '"v5"'
+    assert resp.headers['last-modified'] == 'Thu, 02 Jan 2020 03:04:05 GMT'
+    assert len(dumps) == 1
+
+    resp = client.get('/versioned', headers={'if-none-match': '"v5"'})
+    assert resp.status_code == 304
+    resp = client.get('/versioned', headers={'if-modified-since': 'Thu, 02 Jan 2020 03:04:05 GMT'})
+    assert resp.status_code == 304
+    assert len(dumps) == 1
+
+    resp = client.get('/versioned', headers={'if-modified-since': 'Thu, 02 Jan 2020 03:04:04 GMT'})
+    assert resp.status_code == 200
+    assert client.post('/versioned', headers={'if-none-match': '"v5"'}).status_code == 200
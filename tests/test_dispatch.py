@@ -0,0 +1,78 @@
+import json
+
+import pytest
+from asynctest import mock
+from starlette.requests import Request
+from starlette.responses import Response
+
+from star_resty import Method
+from .utils.method import CreateUser, SearchUserResponse
+
+
+class Ping(Method):
+    async def execute(self):
+        return {'pong': True}
+
+
+class Raw(Method):
+    serializer = None
+
+    async def execute(self):
+        return Response(b'raw')
+
+
+def test_dispatch_skip_unused_stages():
+    source = Ping.__dispatch__.__source__
+    assert '_parse_' not in source
+    assert '_read_' not in source
+    assert '_dump' not in source
+    assert '_serialize' in source
+
+
+def test_dispatch_inline_parsers():
+    source = CreateUser.__dispatch__.__source__
+    assert '_v0 = _parse_0(request)' in source
+    assert '_body_0 = await _read_0(request)' in source
+    assert '_v1 = _load_1(_body_0)' in source
+    assert 'self.execute(user=_v0, payload=_v1)' in source
+    assert '_dump(content)' in source
+
+
+@pytest.mark.asyncio
+async def test_dispatch_same_as_generic():
+    request = mock.MagicMock(spec_set=Request)
+    request.path_params = {'id': 1}
+    request.body.return_value = json.dumps({'name': 'Name', 'email': 'email@mail.com'}).encode('utf8')
+
+    method = CreateUser(request)
+    params = await CreateUser.__parser__.parse(request)
+    expected = CreateUser.__render__(await method.execute(**params), method)
+    resp = await CreateUser.as_endpoint()(request)
+    assert resp.status_code == expected.status_code == 201
+    assert resp.body == expected.body
+
+
+@pytest.mark.asyncio
+async def test_dispatch_without_serializer():
+    request = mock.MagicMock(spec_set=Request)
+    resp = await Raw.as_endpoint()(request)
+    assert resp.body == b'raw'
+
+
+@pytest.mark.asyncio
+async def test_dispatch_override():
+    class Custom(Method):
+        response_schema = SearchUserResponse
+
+        async def execute(self):
+            return {'id': 1}
+
+        async def dispatch(self) -> Response:
+            resp = await super().dispatch()
+            resp.headers['x-custom'] = '1'
+            return resp
+
+    request = mock.MagicMock(spec_set=Request)
+    resp = await Custom.as_endpoint()(request)
+    assert resp.headers['x-custom'] == '1'
+    assert json.loads(resp.body) == {'id': 1}
@@ -0,0 +1,191 @@
+import datetime as dt
+import decimal
+import uuid
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass, field
+from typing import List
+
+import pytest
+from marshmallow import Schema, fields, post_dump, pre_dump
+
+from star_resty.method.dumper import compile_dumper
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+
+
+class PrimitiveSchema(Schema):
+    i = fields.Integer()
+    f = fields.Float()
+    s = fields.String()
+    b = fields.Boolean()
+    r = fields.Raw()
+    i_str = fields.Integer(as_string=True)
+    b_custom = fields.Boolean(truthy={'yes'})
+
+
+class TypesSchema(Schema):
+    created = fields.DateTime()
+    day = fields.Date()
+    uid = fields.UUID()
+    amount = fields.Decimal(as_string=True)
+    email = fields.Email()
+    data = fields.Dict(keys=fields.String(), values=fields.Integer())
+
+
+class KeysSchema(Schema):
+    id = fields.Integer(data_key='ID')
+    name = fields.String(attribute='title')
+    owner = fields.String(attribute='owner.name')
+    items = fields.Raw()
+    secret = fields.String(load_only=True)
+
+
+class DefaultSchema(Schema):
+    a = fields.Integer(dump_default=1)
+    b = fields.List(fields.Integer(), dump_default=list)
+    c = fields.String()
+
+
+class NestedSchema(Schema):
+    item = fields.Nested(ItemSchema)
+    items = fields.List(fields.Nested(ItemSchema))
+    many = fields.Nested(ItemSchema, many=True)
+    only = fields.Nested(ItemSchema, only=('id',))
+    ids = fields.List(fields.Integer())
+    matrix = fields.List(fields.List(fields.Float()))
+    plucked = fields.Pluck(ItemSchema, 'name', many=True)
+
+
+class ComputedSchema(Schema):
+    const = fields.Constant('c')
+    method = fields.Method('get_method')
+    function = fields.Function(lambda obj: 'f')
+
+    def get_method(self, obj):
+        return 'm'
+
+
+class TreeSchema(Schema):
+    name = fields.String()
+    children = fields.List(fields.Nested(lambda: TreeSchema()))
+
+
+class HookSchema(ItemSchema):
+    @pre_dump
+    def upper(self, data, **_):
+        return {**data, 'name': data['name'].upper()}
+
+    @post_dump
+    def wrap(self, data, **_):
+        return {'data': data}
+
+
+class DumpSchema(ItemSchema):
+    def dump(self, obj, *args, **kwargs):
+        return super().dump(obj, *args, **kwargs)
+
+
+class OrderedSchema(ItemSchema):
+    class Meta:
+        ordered = True
+
+
+@dataclass
+class Item:
+    id: int
+    name: str
+
+
+@dataclass
+class Owner:
+    name: str
+
+
+@dataclass
+class Keys:
+    id: int
+    title: str
+    owner: Owner
+    secret: str = 'secret'
+
+
+@dataclass
+class Tree:
+    name: str
+    children: List['Tree'] = field(default_factory=list)
+
+
+class SlotsItem:
+    __slots__ = ('id', 'name')
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+NamedItem = namedtuple('NamedItem', ('id', 'name'))
+
+CASES = [
+    (ItemSchema(), {'id': 1, 'name': 'name'}),
+    (ItemSchema(), {'id': '1', 'name': 2}),
+    (ItemSchema(), {'id': None, 'name': None}),
+    (ItemSchema(), {}),
+    (ItemSchema(), Item(1, 'item')),
+    (ItemSchema(), SlotsItem(1, 'slots')),
+    (ItemSchema(), NamedItem(1, 'named')),
+    (ItemSchema(), OrderedDict(id=1, name='ordered')),
+    (ItemSchema(many=True), [{'id': 1}, Item(2, 'b'), SlotsItem(3, 'c')]),
+    (ItemSchema(only=('name',)), {'id': 1, 'name': 'only'}),
+    (ItemSchema(exclude=('name',)), {'id': 1, 'name': 'exclude'}),
+    (PrimitiveSchema(), {'i': 1.5, 'f': 1, 's': b'bytes', 'b': 'true', 'r': [1, {'a': 2}],
+                         'i_str': 10, 'b_custom': 'yes'}),
+    (PrimitiveSchema(), {'i': True, 'f': '2.5', 's': 10, 'b': 0, 'r': None, 'i_str': None, 'b_custom': 1}),
+    (PrimitiveSchema(), {'b': True, 'b_custom': False}),
+    (TypesSchema(), {'created': dt.datetime(2020, 1, 2, 3, 4, 5), 'day': dt.date(2020, 1, 2),
+                     'uid': uuid.UUID(int=1), 'amount': decimal.Decimal('1.50'),
+                     'email': 'email@mail.com', 'data': {'a': '1'}}),
+    (TypesSchema(), {'created': None, 'uid': None, 'data': None}),
+    (KeysSchema(), {'id': 1, 'title': 't', 'owner': {'name': 'o'}, 'secret': 's'}),
+    (KeysSchema(), Keys(1, 't', Owner('o'))),
+    (KeysSchema(), {'id': 1}),
+    (DefaultSchema(), {}),
+    (DefaultSchema(), {'a': None, 'b': [1], 'c': 'c'}),
+    (NestedSchema(), {'item': {'id': 1, 'name': 'a'}, 'items': [{'id': 2}, Item(3, 'c')],
+                      'many': [Item(4, 'd')], 'only': {'id': 5, 'name': 'e'},
+                      'ids': ['1', 2], 'matrix': [[1, 2], [3]], 'plucked': [{'name': 'p'}]}),
+    (NestedSchema(), {'item': None, 'items': None, 'many': None, 'only': None, 'ids': None,
+                      'matrix': [None], 'plucked': None}),
+    (ComputedSchema(), {}),
+    (TreeSchema(), Tree('root', [Tree('a', [Tree('b')]), Tree('c')])),
+    (HookSchema(), {'id': 1, 'name': 'hook'}),
+    (OrderedSchema(), {'id': 1, 'name': 'ordered'}),
+]
+
+
+@pytest.mark.parametrize('schema, obj', CASES)
+def test_dump_conformance(schema: Schema, obj):
+    dump = compile_dumper(schema)
+    expected = schema.dump(obj)
+    result = dump(obj)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+@pytest.mark.parametrize('obj', [{'id': 'invalid'}, {'id': []}])
+def test_dump_error_conformance(obj):
+    schema = ItemSchema()
+    with pytest.raises(Exception) as expected:
+        schema.dump(obj)
+
+    with pytest.raises(expected.type):
+        compile_dumper(schema)(obj)
+
+
+def test_dump_compiled():
+    assert hasattr(compile_dumper(NestedSchema()), '__source__')
+    assert not hasattr(compile_dumper(HookSchema()), '__source__')
+    assert not hasattr(compile_dumper(DumpSchema()), '__source__')
+    assert compile_dumper(ItemSchema(many=True)).__name__ == 'dump_many'
@@ -0,0 +1,51 @@
+import pytest
+from marshmallow import Schema, ValidationError, fields
+from starlette.requests import Request
+
+from star_resty.payload.header import HeaderParser
+
+HEADERS = [
+    (b'host', b'example.com'),
+    (b'x-request-id', b'1'),
+    (b'x-request-id', b'2'),
+    (b'user-agent', b'agent'),
+    (b'cookie', b'session=1'),
+    (b'x-limit', b'10'),
+]
+
+
+class HeaderSchema(Schema):
+    request_id = fields.Integer(data_key='X-Request-Id', required=True)
+    limit = fields.Integer(data_key='x-limit')
+    agent = fields.String(data_key='User-Agent')
+    token = fields.String(data_key='X-Token')
+    host = fields.String()
+
+
+def create_request(headers) -> Request:
+    return Request({'type': 'http', 'headers': headers})
+
+
+@pytest.mark.parametrize('compiled', [False, True])
+def test_parse_declared_headers(compiled: bool):
+    parser = HeaderParser.create(HeaderSchema, compiled=compiled)
+    assert set(parser.names) == {b'x-request-id', b'x-limit', b'user-agent', b'x-token', b'host'}
+    request = create_request(HEADERS)
+    expected = HeaderSchema().load(request.headers, unknown='exclude')
+    assert parser.parse(request) == expected == {'request_id': 1, 'limit': 10, 'agent': 'agent',
+                                                 'host': 'example.com'}
+
+
+def test_parse_headers_errors():
+    parser = HeaderParser.create(HeaderSchema)
+    with pytest.raises(ValidationError) as e:
+        parser.parse(create_request([(b'x-limit', b'limit')]))
+
+    assert e.value.messages == {'X-Request-Id': ['Missing data for required field.'],
+                                'x-limit': ['Not a valid integer.']}
+
+
+def test_parse_all_headers():
+    parser = HeaderParser.create(HeaderSchema, unknown='include')
+    assert parser.names is None
+    assert parser.parse(create_request(HEADERS))['cookie'] == 'session=1'
@@ -0,0 +1,79 @@
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+import pytest
+
+# budget of the own modules of star_resty in microseconds, dependencies are excluded
+IMPORT_BUDGET = int(os.environ.get('STAR_RESTY_IMPORT_BUDGET', 150000))
+
+IMPORT_TIME = re.compile(r'import time:\s*(\d+) \|\s*(\d+) \|\s*(\S+)')
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            stderr=subprocess.PIPE, check=True, universal_newlines=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match is not None:
+            times[match.group(3)] = int(match.group(1))
+
+    return times
+
+
+def test_import_time():
+    times = min((import_times('import star_resty') for _ in range(3)),
+                key=lambda value: sum(t for (name, t) in value.items() if name.startswith('star_resty')))
+    own = sum(t for (name, t) in times.items() if name.startswith('star_resty'))
+    assert own <= IMPORT_BUDGET, f'import star_resty took {own}us, budget {IMPORT_BUDGET}us'
+
+
+def imported_modules(statement: str) -> List[str]:
+    result = subprocess.run([sys.executable, '-c', f'{statement}; import sys; print(*sys.modules)'],
+                            stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    return result.stdout.split()
+
+
+def test_lazy_subsystems():
+    modules = imported_modules('import star_resty')
+    assert 'apispec' not in modules
+    assert 'star_resty.apidocs' not in modules
+    assert 'star_resty.payload.uploads' not in modules
+
+
+@pytest.mark.parametrize('name, module', [
+    ('setup_spec', 'star_resty.apidocs'),
+    ('upload_stream', 'star_resty.payload.uploads'),
+    ('CachePolicy', 'star_resty.cache'),
+])
+def test_lazy_import(name, module):
+    assert module in imported_modules(f'from star_resty import {name}')
+
+
+def test_lazy_attribute_error():
+    import star_resty
+    with pytest.raises(AttributeError):
+        getattr(star_resty, 'unknown')
+
+    assert 'setup_spec' in dir(star_resty)
+
+
+def test_lazy_names_of_submodules():
+    import star_resty.payload.uploads
+    import star_resty.profiling
+    from star_resty import prepare, upload
+    from star_resty.payload import upload_stream
+    assert callable(prepare)
+    assert callable(upload)
+    assert callable(upload_stream)
+
+
+def test_upload_module_path():
+    from star_resty.payload.upload import upload as upload_func
+    from star_resty.payload import upload
+    from star_resty.payload.uploads import UploadParser
+    assert isinstance(upload('file'), UploadParser)
+    assert isinstance(upload_func('file'), UploadParser)
@@ -1,9 +1,14 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import pytest
 from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
 from starlette.testclient import TestClient
 
-from star_resty import Method, inject
-from tests.utils.method import SearchUserResponse
+from star_resty import Method, inject, path
+from tests.utils.method import PathParams, SearchUserResponse
 
 
 class Repository:
@@ -56,3 +61,119 @@ def test_inject_attr_by_name(app):
     assert resp.status_code == 200
     body = resp.json()
     assert body == {'id': 2}
+
+
+events = []
+
+
+async def create_pool(app: Starlette):
+    events.append('open pool')
+    yield {'app': app, 'users': {1: 'first', 2: 'second'}}
+    events.append('close pool')
+
+
+Pool = inject.resource(create_pool)
+
+
+def create_client(pool: Pool):
+    events.append('create client')
+    return {'pool': pool}
+
+
+Client = inject.resource(create_client)
+
+
+async def get_session(request: Request, pool: Pool):
+    events.append('session')
+    await asyncio.sleep(0)
+    return {'path': request.url.path, 'pool': pool}
+
+
+Session = inject.depends(get_session)
+
+
+async def get_user(params: path(PathParams), session: Session):
+    return {'id': params['id'], 'name': session['pool']['users'][params['id']]}
+
+
+User = inject.depends(get_user)
+
+
+class GetUserName(Method):
+    serializer = None
+
+    async def execute(self, user: User, session: Session, client: Client):
+        assert client['pool'] is session['pool']
+        return Response(f'{user["name"]} {session["path"]}')
+
+
+def test_dependencies(app):
+    events.clear()
+    inject.setup(app, Client)
+    app.add_route('/users/{id:int}', GetUserName.as_endpoint())
+    with TestClient(app) as client:
+        assert events == ['open pool', 'create client']
+        assert client.get('/users/1').text == 'first /users/1'
+        assert client.get('/users/2').text == 'second /users/2'
+        assert events == ['open pool', 'create client', 'session', 'session']
+
+    assert events[-1] == 'close pool'
+    assert GetUserName.__parser__.async_parsers[0][1].parsers[0][1].location == 'path'
+
+
+def test_resources_lifespan():
+    @asynccontextmanager
+    async def lifespan(app):
+        async with inject.resources(app, Client):
+            yield
+
+    events.clear()
+    app = Starlette(lifespan=lifespan)
+    app.add_route('/users/{id:int}', GetUserName.as_endpoint())
+    with TestClient(app) as client:
+        assert events == ['open pool', 'create client']
+        assert client.get('/users/1').text == 'first /users/1'
+
+    assert events[-1] == 'close pool'
+
+
+@pytest.mark.asyncio
+async def test_resolve_concurrently(app):
+    started = []
+    release = asyncio.Event()
+
+    async def first():
+        started.append('first')
+        await release.wait()
+        return 1
+
+    async def second():
+        started.append('second')
+        await release.wait()
+        return 2
+
+    class Sum(Method):
+        serializer = None
+
+        async def execute(self, a: inject.depends(first), b: inject.depends(second)):
+            return Response(str(a + b))
+
+    async def unblock():
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        release.set()
+
+    request = Request({'type': 'http', 'app': app, 'headers': [], 'path_params': {}})
+    response, _ = await asyncio.wait_for(asyncio.gather(Sum.as_endpoint()(request), unblock()), timeout=1)
+    assert response.body == b'3'
+
+
+def test_unresolved_dependency():
+    def provider(name):
+        return name
+
+    with pytest.raises(TypeError):
+        inject.depends(provider)
+
+    with pytest.raises(TypeError):
+        inject.resource(provider)
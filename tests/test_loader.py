@@ -0,0 +1,238 @@
+import datetime as dt
+import uuid
+from collections import OrderedDict
+
+import pytest
+from marshmallow import EXCLUDE, INCLUDE, RAISE, Schema, ValidationError, fields, post_load, validate, validates
+from starlette.datastructures import Headers
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method, path, query
+from star_resty.payload.loader import compile_loader, create_primitive_loader
+from .utils.method import BodySchema, ItemsModel
+
+
+class ItemSchema(Schema):
+    id = fields.Integer(required=True)
+    name = fields.String()
+
+
+class PrimitiveSchema(Schema):
+    i = fields.Integer()
+    strict = fields.Integer(strict=True)
+    f = fields.Float()
+    nan = fields.Float(allow_nan=True)
+    s = fields.String()
+    b = fields.Boolean()
+    r = fields.Raw()
+    none = fields.String(allow_none=True)
+    custom = fields.Boolean(truthy={'yes'}, falsy={'no'})
+
+
+class ParamsSchema(Schema):
+    id = fields.Integer(required=True)
+    strict = fields.Integer(strict=True)
+    name = fields.String(data_key='q', allow_none=True)
+    active = fields.Boolean(load_default=False)
+    custom = fields.Boolean(truthy={'yes'}, falsy={'no'})
+    uid = fields.UUID()
+    tag = fields.String(attribute='label')
+
+
+class TypesSchema(Schema):
+    created = fields.DateTime()
+    day = fields.Date()
+    uid = fields.UUID()
+    amount = fields.Decimal()
+    email = fields.Email()
+    data = fields.Dict(keys=fields.String(), values=fields.Integer())
+
+
+class KeysSchema(Schema):
+    id = fields.Integer(data_key='ID', required=True)
+    name = fields.String(attribute='title')
+    owner = fields.String(attribute='owner.name')
+    secret = fields.String(dump_only=True)
+
+
+class DefaultSchema(Schema):
+    a = fields.Integer(load_default=1)
+    b = fields.List(fields.Integer(), load_default=list)
+    c = fields.String(load_default=None)
+
+
+class ValidateSchema(Schema):
+    age = fields.Integer(validate=validate.Range(min=1, max=150))
+    tags = fields.List(fields.String(validate=validate.Length(max=3)), validate=validate.Length(max=2))
+
+
+class NestedSchema(Schema):
+    item = fields.Nested(ItemSchema)
+    items = fields.List(fields.Nested(ItemSchema))
+    many = fields.Nested(ItemSchema, many=True)
+    only = fields.Nested(ItemSchema, only=('name',))
+    exclude = fields.Nested(ItemSchema, unknown=EXCLUDE)
+    ids = fields.List(fields.Integer())
+    matrix = fields.List(fields.List(fields.Float()))
+
+
+class TreeSchema(Schema):
+    name = fields.String()
+    children = fields.List(fields.Nested(lambda: TreeSchema()))
+
+
+class HookSchema(ItemSchema):
+    @post_load
+    def wrap(self, data, **_):
+        return {'data': data}
+
+
+class ValidatesSchema(ItemSchema):
+    @validates('id')
+    def check_id(self, value):
+        if value < 0:
+            raise ValidationError('Negative id.')
+
+
+class OrderedSchema(ItemSchema):
+    class Meta:
+        ordered = True
+
+
+CASES = [
+    (ItemSchema(), {'id': 1, 'name': 'name'}),
+    (ItemSchema(), {'id': '1', 'name': 'name'}),
+    (ItemSchema(), {'id': True, 'name': 1}),
+    (ItemSchema(), {'id': None, 'name': None}),
+    (ItemSchema(), {}),
+    (ItemSchema(), {'id': 1, 'extra': 1}),
+    (ItemSchema(), OrderedDict(id=1, name='ordered')),
+    (ItemSchema(), []),
+    (ItemSchema(), 'invalid'),
+    (ItemSchema(), Headers({'id': '1', 'Name': 'header', 'x-extra': '1'})),
+    (ItemSchema(only=('name',)), {'id': 1, 'name': 'only'}),
+    (PrimitiveSchema(), {'i': 1, 'strict': 1, 'f': 1.5, 'nan': float('inf'), 's': 's', 'b': True,
+                         'r': [1], 'none': None, 'custom': 'yes'}),
+    (PrimitiveSchema(), {'i': 1.5, 'strict': 1.5, 'f': '1', 'nan': '-inf', 's': b's', 'b': 'true',
+                         'r': None, 'none': 's', 'custom': 'no'}),
+    (PrimitiveSchema(), {'i': 'i', 'strict': '1', 'f': float('nan'), 'nan': None, 's': 1, 'b': 'b',
+                         'r': {}, 'custom': True}),
+    (PrimitiveSchema(), {'i': 10 ** 400, 'f': 10 ** 400, 'b': 1, 's': b'\xff'}),
+    (TypesSchema(), {'created': '2020-01-02T03:04:05', 'day': '2020-01-02', 'uid': str(uuid.UUID(int=1)),
+                     'amount': '1.50', 'email': 'email@mail.com', 'data': {'a': '1'}}),
+    (TypesSchema(), {'created': dt.datetime(2020, 1, 2), 'day': 'day', 'uid': 'uid', 'amount': 'amount',
+                     'email': 'email', 'data': {'a': 'a'}}),
+    (KeysSchema(), {'ID': 1, 'name': 'name', 'owner': 'owner', 'secret': 'secret'}),
+    (KeysSchema(), {'id': 1, 'name': 1, 'owner': 1}),
+    (DefaultSchema(), {}),
+    (DefaultSchema(), {'a': None, 'b': None, 'c': None}),
+    (DefaultSchema(), {'a': 2, 'b': [1, '2'], 'c': 'c'}),
+    (ValidateSchema(), {'age': 10, 'tags': ['a', 'b']}),
+    (ValidateSchema(), {'age': 0, 'tags': ['a', 'b', 'c']}),
+    (ValidateSchema(), {'age': '200', 'tags': ['long', 1]}),
+    (NestedSchema(), {'item': {'id': 1, 'name': 'a'}, 'items': [{'id': 2}, {'id': '3'}],
+                      'many': [{'id': 4}], 'only': {'name': 'e'}, 'exclude': {'id': 5, 'extra': 1},
+                      'ids': ['1', 2], 'matrix': [[1, 2.5], [3]]}),
+    (NestedSchema(), {'item': {'name': 1, 'extra': 1}, 'items': [{'id': 2}, {}, None, 'item'],
+                      'many': {'id': 4}, 'only': {'id': 1, 'name': 'e'}, 'exclude': [],
+                      'ids': ['a', 2, None], 'matrix': [[1, 'a'], None, 'b']}),
+    (NestedSchema(), {'item': None, 'items': None, 'many': None, 'only': None, 'exclude': None,
+                      'ids': (1, 2), 'matrix': 'matrix'}),
+    (TreeSchema(), {'name': 'root', 'children': [{'name': 'a', 'children': [{'name': 'b'}]}]}),
+    (TreeSchema(), {'name': 'root', 'children': [{'name': 1, 'children': [{'extra': 'b'}]}]}),
+    (HookSchema(), {'id': 1, 'name': 'hook'}),
+    (ValidatesSchema(), {'id': -1}),
+    (OrderedSchema(), {'id': 1, 'name': 'ordered'}),
+    (BodySchema(), {'name': 'name', 'email': 'email@mail.com', 'extra': 1}),
+    (ItemsModel(), {'items': [{'id': 1}, {'id': 'a'}]}),
+]
+
+
+def load(func, data):
+    try:
+        return func(data), None
+    except ValidationError as e:
+        return e.valid_data, e.messages
+
+
+@pytest.mark.parametrize('unknown', [EXCLUDE, INCLUDE, RAISE])
+@pytest.mark.parametrize('schema, data', CASES)
+def test_load_conformance(schema: Schema, data, unknown):
+    expected = load(lambda value: schema.load(value, unknown=unknown), data)
+    result = load(compile_loader(schema, unknown), data)
+    assert result == expected
+    assert type(result[0]) is type(expected[0])
+
+
+def test_load_compiled():
+    assert hasattr(compile_loader(NestedSchema()), '__source__')
+    assert hasattr(compile_loader(TreeSchema()), '__source__')
+    assert not hasattr(compile_loader(HookSchema()), '__source__')
+    assert not hasattr(compile_loader(ValidatesSchema()), '__source__')
+    assert not hasattr(compile_loader(ItemSchema(many=True)), '__source__')
+    assert not hasattr(compile_loader(ItemSchema(partial=True)), '__source__')
+    assert not hasattr(compile_loader(ItemSchema(), 'invalid'), '__source__')
+
+
+def test_compiled_parser():
+    class SearchItems(Method):
+        async def execute(self, params: query(ItemSchema, compiled=True)):
+            return params
+
+    (_, parser), = SearchItems.__parser__.parsers
+    assert hasattr(parser.loader, '__source__')
+
+
+PRIMITIVE_CASES = [
+    {'id': 1, 'strict': 1, 'q': 'name', 'active': True, 'custom': 'yes', 'uid': uuid.UUID(int=1), 'tag': 't'},
+    {'id': '1', 'strict': '1', 'q': None, 'active': 'off', 'custom': 'no', 'uid': str(uuid.UUID(int=2))},
+    {'id': ' 2 ', 'strict': True, 'name': 'name', 'active': 'invalid', 'custom': 'true', 'uid': 'uid'},
+    {'id': 'id', 'active': 1, 'custom': [], 'uid': 1, 'tag': b't'},
+    {'id': None, 'strict': 1.5, 'q': 1, 'active': None, 'uid': None},
+    {'id': True, 'q': b'\xff'},
+    {'id': 1.5, 'extra': 1},
+    {},
+    [],
+]
+
+
+@pytest.mark.parametrize('data', PRIMITIVE_CASES)
+def test_primitive_conformance(data):
+    schema = ParamsSchema()
+    expected = load(lambda value: schema.load(value, unknown=EXCLUDE), data)
+    result = load(create_primitive_loader(schema), data)
+    assert result == expected
+    assert [type(v) for v in result[0].values()] == [type(v) for v in expected[0].values()]
+
+
+def test_primitive_loader():
+    assert create_primitive_loader(ParamsSchema()) is not None
+    assert create_primitive_loader(ParamsSchema(), RAISE) is None
+    assert create_primitive_loader(ItemSchema(many=True)) is None
+    assert create_primitive_loader(PrimitiveSchema()) is None
+    assert create_primitive_loader(ValidateSchema()) is None
+    assert create_primitive_loader(ValidatesSchema()) is None
+    assert create_primitive_loader(HookSchema()) is None
+
+
+def test_primitive_parsers():
+    class GetItem(Method):
+        async def execute(self, item: path(ItemSchema), params: query(ParamsSchema)):
+            return {'item': item, 'id': params['id'], 'uid': str(params['uid'])}
+
+    parsers = [parser for (_, parser) in GetItem.__parser__.parsers]
+    assert all(parser.loader.func.__name__ == '_load_primitives' for parser in parsers)
+
+    app = Starlette()
+    app.add_route('/items/{id:int}', GetItem.as_endpoint())
+    client = TestClient(app)
+    uid = uuid.UUID(int=1)
+    response = client.get('/items/1', params={'id': '2', 'uid': str(uid)})
+    assert response.status_code == 200
+    assert response.json() == {'item': {'id': 1}, 'id': 2, 'uid': str(uid)}
+
+    with pytest.raises(ValidationError) as exc_info:
+        client.get('/items/1', params={'uid': 'uid'})
+    assert exc_info.value.messages == {'id': ['Missing data for required field.'], 'uid': ['Not a valid UUID.']}
@@ -0,0 +1,131 @@
+import re
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from star_resty import CachePolicy, Method, Operation
+from star_resty.cache import ResponseCache
+from star_resty.compression import Compression
+from star_resty.metrics import Histogram, MetricsRegistry, configure, default_registry, setup_metrics
+from .utils.method import CreateUser
+
+
+class Timed(Method):
+    meta = Operation(tag='default', metrics=True, server_timing=True)
+
+    async def execute(self):
+        return {'pong': True}
+
+
+class TimedRaw(Method):
+    meta = Operation(tag='default', server_timing=True)
+    serializer = None
+
+    async def execute(self):
+        return Response(b'raw')
+
+
+class TimedCached(Method):
+    meta = Operation(tag='default', server_timing=True, cache=CachePolicy(store=ResponseCache()),
+                     compression=Compression(min_size=0))
+
+    async def execute(self):
+        return {'items': list(range(100))}
+
+
+class TimedStream(Method):
+    meta = Operation(tag='default', metrics=True, server_timing=True)
+
+    async def execute(self):
+        for i in range(3):
+            yield {'id': i}
+
+
+class TimedRawStream(Method):
+    meta = Operation(tag='default', metrics=True)
+    serializer = None
+
+    async def execute(self):
+        yield b'raw'
+
+
+def test_metrics_disabled_by_default():
+    source = CreateUser.__dispatch__.__source__
+    assert '_perf' not in source
+    assert '_observe' not in source
+
+
+def test_metrics_configure():
+    registry = MetricsRegistry()
+    configure(enabled=True, registry=registry)
+    try:
+        class Configured(Method):
+            async def execute(self):
+                return {}
+    finally:
+        configure(enabled=False)
+
+    source = Configured.__dispatch__.__source__
+    assert '_observe_execute(_d_execute)' in source
+    assert '_timing' not in source
+    assert len(registry._histograms) == 4
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert list(histogram.cumulative()) == [('0.1', 2), ('1.0', 3), ('+Inf', 4)]
+    assert histogram.sum == 2.65
+    assert histogram.count == 4
+
+
+def test_metrics_endpoint():
+    app = Starlette(routes=[Route('/timed', Timed.as_endpoint())])
+    setup_metrics(app)
+    client = TestClient(app)
+    resp = client.get('/timed')
+    assert resp.status_code == 200
+    timing = resp.headers['server-timing']
+    assert re.fullmatch(r'parse;dur=[\d.]+, execute;dur=[\d.]+, serialize;dur=[\d.]+', timing)
+
+    resp = client.get('/metrics')
+    assert resp.status_code == 200
+    assert resp.headers['content-type'].startswith('text/plain; version=0.0.4')
+    name = f'{__name__}.Timed'
+    assert f'star_resty_phase_seconds_count{{endpoint="{name}",phase="execute"}} 1' in resp.text
+    assert f'star_resty_phase_seconds_bucket{{endpoint="{name}",phase="parse",le="+Inf"}} 1' in resp.text
+    assert f'star_resty_phase_seconds_count{{endpoint="{name}",phase="dump"}} 0' in resp.text
+    assert default_registry.histogram(name, 'serialize').count == 1
+
+
+def test_server_timing_without_serializer():
+    app = Starlette(routes=[Route('/raw', TimedRaw.as_endpoint())])
+    resp = TestClient(app).get('/raw')
+    assert resp.content == b'raw'
+    assert re.fullmatch(r'parse;dur=[\d.]+, execute;dur=[\d.]+', resp.headers['server-timing'])
+    assert '_observe' not in TimedRaw.__dispatch__.__source__
+
+
+def test_server_timing_cached_compressed():
+    app = Starlette(routes=[Route('/items', TimedCached.as_endpoint())])
+    resp = TestClient(app).get('/items', headers={'accept-encoding': 'gzip'})
+    assert resp.headers['content-encoding'] == 'gzip'
+    assert re.fullmatch(r'parse;dur=[\d.]+, execute;dur=[\d.]+, serialize;dur=[\d.]+', resp.headers['server-timing'])
+
+
+def test_metrics_stream():
+    app = Starlette(routes=[Route('/stream', TimedStream.as_endpoint()), Route('/raw', TimedRawStream.as_endpoint())])
+    client = TestClient(app)
+    resp = client.get('/stream')
+    assert resp.json() == [{'id': 0}, {'id': 1}, {'id': 2}]
+    assert re.fullmatch(r'parse;dur=[\d.]+', resp.headers['server-timing'])
+    assert default_registry.histogram(f'{__name__}.TimedStream', 'execute').count == 1
+
+    resp = client.get('/raw')
+    assert resp.content == b'raw'
+    assert 'server-timing' not in resp.headers
+    assert default_registry.histogram(f'{__name__}.TimedRawStream', 'execute').count == 1
@@ -0,0 +1,95 @@
+import datetime as dt
+import decimal
+import enum
+import json
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method
+from star_resty.serializers import NativeJsonSerializer, encode, native, register_encoder
+from star_resty.serializers.msgpack import MsgpackSerializer
+
+
+class Color(enum.Enum):
+    RED = 'red'
+
+
+class Level(enum.IntEnum):
+    HIGH = 1
+
+
+@dataclass
+class Owner:
+    __slots__ = ('id', 'email')
+    id: uuid.UUID
+    email: str
+
+
+@dataclass
+class Item:
+    name: str
+    price: decimal.Decimal
+    created: dt.datetime
+    color: Color
+    owner: Optional[Owner] = None
+    tags: List[str] = field(default_factory=list)
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Name(str):
+    pass
+
+
+def test_encode():
+    uid = uuid.UUID(int=1)
+    item = Item('item', decimal.Decimal('1.50'), dt.datetime(2020, 1, 2, 3, 4, 5), Color.RED,
+                Owner(uid, 'email@mail.com'), ['a'])
+    assert encode(item) == {
+        'name': 'item',
+        'price': '1.50',
+        'created': '2020-01-02T03:04:05',
+        'color': 'red',
+        'owner': {'id': str(uid), 'email': 'email@mail.com'},
+        'tags': ['a'],
+    }
+    assert encode({Level.HIGH: (dt.date(2020, 1, 2), {dt.time(1, 2)}), 'none': None, 'name': Name('n')}) == {
+        1: ['2020-01-02', ['01:02:00']], 'none': None, 'name': 'n'}
+    assert type(encode(Name('n'))) is str
+    assert encode(Level.HIGH) == 1 and type(encode(Level.HIGH)) is int
+
+
+def test_register_encoder():
+    point = Point(1, 2)
+    assert encode(point) is point
+    register_encoder(Point, lambda p: [p.x, p.y])
+    assert encode([point]) == [[1, 2]]
+
+
+class GetItems(Method):
+    serializer = NativeJsonSerializer
+    serializers = (native(MsgpackSerializer),)
+
+    async def execute(self):
+        return [Item('item', decimal.Decimal('1'), dt.datetime(2020, 1, 2), Color.RED)]
+
+
+def test_native_response():
+    app = Starlette()
+    app.add_route('/items', GetItems.as_endpoint())
+    client = TestClient(app)
+    expected = [{'name': 'item', 'price': '1', 'created': '2020-01-02T00:00:00', 'color': 'red',
+                 'owner': None, 'tags': []}]
+    resp = client.get('/items')
+    assert resp.status_code == 200
+    assert json.loads(resp.content) == expected
+    resp = client.get('/items', headers={'accept': 'application/msgpack'})
+    assert MsgpackSerializer.parse(resp.content) == expected
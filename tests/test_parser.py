@@ -0,0 +1,119 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+
+import pytest
+from asynctest import mock
+from marshmallow import Schema, fields
+from starlette.requests import Request
+
+from star_resty import Method, json_payload, json_schema
+from star_resty.method.parser import DataClassParser, create_parser
+from star_resty.payload.base import Parser
+from .utils.method import BodySchema
+
+
+class SlowParser(Parser):
+    __slots__ = ('started', 'release')
+
+    def __init__(self):
+        self.started = 0
+        self.release = asyncio.Event()
+
+    @property
+    def parser(self):
+        return self
+
+    async def parse(self, request: Request):
+        self.started += 1
+        await self.release.wait()
+        return self.started
+
+
+class NameSchema(Schema):
+    name = fields.String()
+
+
+@dataclass
+class Group:
+    name: json_schema(NameSchema, dict)
+    body: json_payload(BodySchema)
+
+
+def create_request(data) -> Request:
+    request = mock.MagicMock(spec_set=Request)
+    request.body.return_value = json.dumps(data).encode('utf8')
+    return request
+
+
+@pytest.mark.asyncio
+async def test_read_body_once():
+    async def execute(body: json_payload(BodySchema), group: Group):
+        pass
+
+    parser = create_parser(execute)
+    request = create_request({'name': 'Name', 'email': 'email@mail.com'})
+    params = await parser.parse(request)
+    assert params == {'body': {'name': 'Name', 'email': 'email@mail.com'},
+                      'group': Group(name={'name': 'Name'}, body={'name': 'Name', 'email': 'email@mail.com'})}
+    assert request.body.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_concurrently():
+    first = SlowParser()
+    second = SlowParser()
+
+    class TestMethod(Method):
+        serializer = None
+
+        async def execute(self, a: first, b: second):
+            return a, b
+
+    async def release():
+        while not (first.started and second.started):
+            await asyncio.sleep(0)
+        first.release.set()
+        second.release.set()
+
+    request = create_request({})
+    result, _ = await asyncio.wait_for(
+        asyncio.gather(TestMethod.as_endpoint()(request), release()), timeout=1)
+    assert result == (1, 1)
+    assert request.body.call_count == 0
+
+
+@dataclass
+class Owner:
+    __slots__ = ('name', 'group')
+    name: json_schema(NameSchema, dict)
+    group: Group
+
+
+@pytest.mark.asyncio
+async def test_parse_nested_dataclass():
+    slow_parser = SlowParser()
+    slow_parser.release.set()
+
+    @dataclass
+    class Project:
+        owner: Owner
+        body: json_payload(BodySchema)
+        slow: slow_parser
+        total: int = field(init=False, default=0)
+
+    async def execute(project: Project):
+        pass
+
+    parser = create_parser(execute)
+    (_, project_parser), = parser.async_parsers
+    assert not any(isinstance(p, DataClassParser) for (_, p) in project_parser.async_parsers)
+    assert [key for (key, _) in project_parser.loaders] == ['owner.name', 'owner.group.name',
+                                                            'owner.group.body', 'body']
+
+    request = create_request({'name': 'Name', 'email': 'email@mail.com'})
+    params = await parser.parse(request)
+    body = {'name': 'Name', 'email': 'email@mail.com'}
+    owner = Owner(name={'name': 'Name'}, group=Group(name={'name': 'Name'}, body=body))
+    assert params == {'project': Project(owner=owner, body=body, slow=1)}
+    assert request.body.call_count == 1
@@ -0,0 +1,105 @@
+import tracemalloc
+
+from marshmallow import Schema, fields
+from starlette.applications import Starlette
+from starlette.routing import Mount, Route, Router
+from starlette.testclient import TestClient
+
+from star_resty import Method, json_payload, prepare, setup_spec
+from star_resty.serializers import JsonEngine, JsonSerializer, register_engine
+from .utils.method import CreateUser, SearchUser
+
+
+class OwnerSchema(Schema):
+    name = fields.String()
+
+
+class ProjectSchema(Schema):
+    owner = fields.Nested('tests.test_prepare.OwnerSchema')
+    members = fields.List(fields.Nested(lambda: OwnerSchema()))
+
+
+class CreateProject(Method):
+    response_schema = ProjectSchema
+
+    async def execute(self, project: json_payload(ProjectSchema)):
+        return project
+
+
+def test_prepare():
+    app = Starlette(routes=[
+        Route('/projects', CreateProject.as_endpoint(), methods=['POST']),
+        Mount('/v1', Router([
+            Route('/users', CreateUser.as_endpoint(), methods=['POST']),
+            Route('/users', SearchUser.as_endpoint(), methods=['GET']),
+            Route('/projects', CreateProject.as_endpoint(), methods=['POST']),
+        ])),
+    ])
+    spec = setup_spec(app, title='test')
+    schema = CreateProject.__parser__.async_parsers[0][1].schema
+    assert schema.fields['owner']._schema is None
+
+    report = prepare(app)
+    assert [(item.path, item.endpoint) for item in report.endpoints] == [
+        ('/projects', 'tests.test_prepare.CreateProject'),
+        ('/v1/users', 'tests.utils.method.CreateUser'),
+        ('/v1/users', 'tests.utils.method.SearchUser'),
+    ]
+    assert all(item.seconds > 0 for item in report.endpoints)
+    assert all(item.compile_seconds > 0 for item in report.endpoints)
+    assert report.compile_seconds == sum(item.compile_seconds for item in report.endpoints)
+    assert report.memory > 0
+    assert report.seconds >= report.spec_seconds > 0
+    assert '/projects' in spec.to_dict()['paths']
+    assert 'tests.test_prepare.CreateProject' in report.format()
+    assert 'compile ms' in report.format()
+
+    assert schema.fields['owner']._schema is not None
+    assert schema.fields['members'].inner._schema is not None
+
+    response = TestClient(app).post('/projects', json={'owner': {'name': 'owner'}, 'members': [{'name': 'a'}]})
+    assert response.json() == {'owner': {'name': 'owner'}, 'members': [{'name': 'a'}]}
+
+
+def test_prepare_without_memory():
+    app = Starlette(routes=[Route('/users', SearchUser.as_endpoint())])
+    report = prepare(app, trace_memory=False)
+    assert report.memory == 0
+    assert len(report.endpoints) == 1
+
+
+def test_prepare_compile_memory():
+    tracemalloc.start()
+    try:
+        class Traced(Method):
+            async def execute(self, project: json_payload(ProjectSchema)):
+                return project
+    finally:
+        tracemalloc.stop()
+
+    assert Traced.__compile_seconds__ > 0
+    assert Traced.__compile_memory__ > 0
+    report = prepare(Starlette(routes=[Route('/traced', Traced.as_endpoint(), methods=['POST'])]))
+    assert report.endpoints[0].compile_memory == Traced.__compile_memory__
+
+
+def test_prepare_codecs():
+    calls = []
+
+    def create_engine():
+        calls.append('create')
+        return JsonEngine('counting', lambda value: calls.append('dumps') or b'{}',
+                          lambda value: calls.append('loads') or {})
+
+    register_engine('counting', create_engine)
+
+    class Counting(Method):
+        serializer = JsonSerializer.using('counting')
+
+        async def execute(self, project: json_payload(ProjectSchema)):
+            return project
+
+    assert calls == ['create']
+    prepare(Starlette(routes=[Route('/a', Counting.as_endpoint(), methods=['POST']),
+                              Route('/b', Counting.as_endpoint(), methods=['PUT'])]))
+    assert calls == ['create', 'dumps', 'loads']
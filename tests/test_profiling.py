@@ -0,0 +1,103 @@
+import marshal
+import pstats
+import time
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from star_resty import Method
+from star_resty.profiling import get_profile, setup_profiling, start_profiling, stop_profiling
+
+
+class Profiled(Method):
+    async def execute(self):
+        return {'items': sorted(range(1000), reverse=True)[:3]}
+
+
+class Sampled(Method):
+    async def execute(self):
+        time.sleep(0.05)
+        return {}
+
+
+def create_app() -> Starlette:
+    app = Starlette(routes=[Route('/profiled', Profiled.as_endpoint()), Route('/sampled', Sampled.as_endpoint())])
+    setup_profiling(app)
+    return app
+
+
+def test_profile_requests(tmp_path):
+    original = Profiled.__dispatch__
+    client = TestClient(create_app())
+    profile = start_profiling(Profiled, requests=2)
+    try:
+        assert Profiled.__dispatch__ is not original
+        for _ in range(3):
+            assert client.get('/profiled').json() == {'items': [999, 998, 997]}
+
+        assert profile.finished
+        assert profile.count == 2
+        assert Profiled.__dispatch__ is original
+
+        path = tmp_path / 'profile.pstats'
+        path.write_bytes(profile.pstats())
+        stats = pstats.Stats(str(path))
+        assert any(name == 'execute' and ncalls[0] == 2 for ((_, _, name), ncalls) in stats.stats.items())
+        with pytest.raises(ValueError):
+            profile.collapsed()
+    finally:
+        stop_profiling(Profiled)
+
+
+def test_profile_seconds():
+    original = Profiled.__dispatch__
+    profile = start_profiling(Profiled, seconds=0)
+    client = TestClient(create_app())
+    client.get('/profiled')
+    assert profile.finished
+    assert profile.count == 0
+    assert Profiled.__dispatch__ is original
+
+
+def test_profile_invalid():
+    with pytest.raises(ValueError):
+        start_profiling(Profiled)
+    with pytest.raises(ValueError):
+        start_profiling(Profiled, requests=1, mode='unknown')
+
+
+def test_profiling_api():
+    client = TestClient(create_app())
+    name = f'{__name__}.Sampled'
+    resp = client.post(f'/_profile/{name}', params={'requests': 2, 'mode': 'sampling'})
+    assert resp.status_code == 201
+    assert resp.json()['mode'] == 'sampling'
+
+    client.get('/sampled')
+    client.get('/sampled')
+    resp = client.get('/_profile')
+    assert resp.json()[-1]['requests'] == 2
+    assert resp.json()[-1]['finished']
+
+    resp = client.get(f'/_profile/{name}', params={'format': 'collapsed'})
+    assert resp.status_code == 200
+    assert 'execute (' in resp.text
+    line = resp.text.splitlines()[0]
+    assert int(line.rsplit(' ', 1)[1]) > 0
+
+    assert client.get(f'/_profile/{name}', params={'format': 'pstats'}).status_code == 400
+    assert client.delete(f'/_profile/{name}').status_code == 200
+    assert client.post('/_profile/unknown', params={'requests': 1}).status_code == 404
+    assert get_profile(Sampled).finished
+
+
+def test_profile_pstats_download():
+    client = TestClient(create_app())
+    name = f'{__name__}.Profiled'
+    assert client.post(f'/_profile/{name}', params={'requests': 1}).status_code == 201
+    client.get('/profiled')
+    resp = client.get(f'/_profile/{name}', params={'format': 'pstats'})
+    assert resp.status_code == 200
+    assert isinstance(marshal.loads(resp.content), dict)
@@ -31,3 +31,42 @@ def test_parse_query_args():
     parser = QueryParser.create(QuerySchema)
     params = parser.parse(request)
     assert params == {'limit': 1000, 'item_id': [1, 2], 'a': '2', 'n': 1}
+
+
+def create_request(query_string: bytes) -> Request:
+    return Request({'type': 'http', 'query_string': query_string, 'headers': []})
+
+
+class FilterSchema(Schema):
+    limit = fields.Integer(required=True)
+    q = fields.String()
+
+
+def test_parse_query_cache():
+    parser = QueryParser.create(QuerySchema, cache_size=2)
+    params = parser.parse(create_request(b'limit=10&item_id=1&item_id=2'))
+    assert params == {'limit': 10, 'item_id': [1, 2], 'n': 1}
+    params['item_id'].append(3)
+
+    assert parser.parse(create_request(b'limit=10&item_id=1&item_id=2')) == {'limit': 10, 'item_id': [1, 2], 'n': 1}
+    assert parser.parse(create_request(b'limit=20')) == {'limit': 20, 'n': 1}
+    assert parser.parse(create_request(b'limit=30')) == {'limit': 30, 'n': 1}
+    stats = parser.cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.count) == (1, 3, 1, 2)
+    assert stats.hit_rate == 0.25
+
+    with pytest.raises(ValidationError):
+        parser.parse(create_request(b'item_id=1'))
+    assert len(parser.cache) == 2
+
+
+def test_parse_query_cache_copy():
+    parser = QueryParser.create(FilterSchema, cache_size=10)
+    assert parser._copy is dict
+    assert QueryParser.create(QuerySchema, cache_size=10)._copy is not dict
+    assert QueryParser.create(FilterSchema, unknown='include', cache_size=10)._copy is not dict
+
+    first = parser.parse(create_request(b'limit=1&q=test'))
+    first['q'] = 'changed'
+    assert parser.parse(create_request(b'limit=1&q=test')) == {'limit': 1, 'q': 'test'}
+    assert QueryParser.create(FilterSchema).cache is None
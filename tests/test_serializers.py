@@ -1,7 +1,69 @@
-from star_resty.serializers import JsonSerializer
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method, json_payload
+from star_resty.serializers import JsonEngine, JsonSerializer, NdJsonSerializer, get_engine, set_json_engine
+from .utils.method import BodySchema
 
 
 def test_serialize_json():
     serializer = JsonSerializer()
     assert serializer.media_type == 'application/json'
     assert serializer.render({'items': [1, 2, 3]}) == b'{"items":[1,2,3]}'
+
+
+@pytest.mark.parametrize('engine', ['ujson', 'json', 'orjson'])
+def test_serialize_json_engine(engine):
+    serializer = JsonSerializer.using(engine)
+    assert serializer.media_type == 'application/json'
+    assert serializer.engine is get_engine(engine)
+    assert serializer.render({'items': [1, 2, 3], 'name': 'имя'}) == '{"items":[1,2,3],"name":"имя"}'.encode('utf-8')
+    assert serializer.parse(b'{"items":[1,2,3]}') == {'items': [1, 2, 3]}
+    assert JsonSerializer.engine is get_engine('ujson')
+
+
+def test_set_json_engine():
+    try:
+        set_json_engine('json')
+        assert JsonSerializer.render({'a': 1}) == b'{"a":1}'
+        assert JsonSerializer.engine.name == 'json'
+        assert NdJsonSerializer.parse(b'{"a":1}\n{"a":2}\n') == [{'a': 1}, {'a': 2}]
+    finally:
+        set_json_engine('ujson')
+
+
+def test_unknown_json_engine():
+    with pytest.raises(ValueError):
+        get_engine('unknown')
+
+
+@pytest.mark.parametrize('incremental', [False, True])
+def test_endpoint_json_engine(incremental):
+    parsed = []
+    json_engine = get_engine('json')
+
+    def loads(body):
+        parsed.append(body)
+        return json_engine.loads(body)
+
+    engine = JsonEngine('tracked', json_engine.dumps, loads)
+
+    class CreateUser(Method):
+        serializer = JsonSerializer.using(engine)
+
+        async def execute(self, user: json_payload(BodySchema, incremental=incremental)):
+            return user
+
+    class CreateUserDefault(Method):
+        async def execute(self, user: json_payload(BodySchema, incremental=incremental)):
+            return user
+
+    app = Starlette()
+    app.add_route('/users', CreateUser.as_endpoint(), methods=['POST'])
+    app.add_route('/users/default', CreateUserDefault.as_endpoint(), methods=['POST'])
+    client = TestClient(app)
+    assert client.post('/users/default', json={'name': 'Name'}).json() == {'name': 'Name'}
+    assert parsed == []
+    assert client.post('/users', json={'name': 'Name'}).json() == {'name': 'Name'}
+    assert parsed
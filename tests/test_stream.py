@@ -0,0 +1,65 @@
+import json
+
+from marshmallow import Schema, fields
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from star_resty import Method, query
+from star_resty.apidocs import setup_spec
+from star_resty.serializers import NdJsonSerializer
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+
+
+class LimitSchema(Schema):
+    limit = fields.Integer(required=True)
+
+
+class ExportItems(Method):
+    response_schema = ItemSchema
+    stream_batch_size = 2
+
+    async def execute(self, params: query(LimitSchema)):
+        for i in range(params['limit']):
+            yield {'id': i, 'name': 'skip'}
+
+
+class ExportLines(ExportItems):
+    serializer = NdJsonSerializer
+
+
+def create_client() -> TestClient:
+    app = Starlette()
+    app.add_route('/items', ExportItems.as_endpoint(), methods=['GET'])
+    app.add_route('/lines', ExportLines.as_endpoint(), methods=['GET'])
+    return TestClient(app)
+
+
+def test_stream_json_array():
+    client = create_client()
+    for limit in (0, 1, 2, 5):
+        resp = client.get(f'/items?limit={limit}')
+        assert resp.status_code == 200
+        assert resp.headers['content-type'] == 'application/json'
+        assert 'content-length' not in resp.headers
+        assert resp.json() == [{'id': i} for i in range(limit)]
+
+
+def test_stream_ndjson():
+    client = create_client()
+    resp = client.get('/lines?limit=3')
+    assert resp.status_code == 200
+    assert resp.headers['content-type'] == 'application/x-ndjson'
+    assert resp.content == b'{"id":0}\n{"id":1}\n{"id":2}\n'
+    assert [json.loads(line) for line in resp.text.splitlines()] == [{'id': 0}, {'id': 1}, {'id': 2}]
+
+
+def test_stream_api_docs():
+    app = Starlette()
+    setup_spec(app, title='test')
+    app.add_route('/items', ExportItems.as_endpoint(), methods=['GET'])
+    body = TestClient(app).get('/apidocs.json').json()
+    assert body['paths']['/items']['get']['responses']['200'] == {
+        'schema': {'type': 'array', 'items': {'$ref': '#/definitions/tests.test_stream.ItemSchema'}}}
@@ -0,0 +1,135 @@
+import hashlib
+
+import pytest
+from marshmallow import ValidationError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.testclient import TestClient
+
+from star_resty import Method, Operation, upload_stream
+from star_resty.exceptions import DecodeError, PayloadTooLarge
+from star_resty.payload.multipart import UploadStream
+from star_resty.payload.sinks import FileSink, HashSink
+
+BOUNDARY = 'boundary'
+DOC = b'document ' * 1000
+
+
+def create_body(*parts) -> bytes:
+    body = b''
+    for name, filename, data in parts:
+        disposition = f'form-data; name="{name}"'
+        if filename is not None:
+            disposition += f'; filename="{filename}"'
+        body += (f'--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n'
+                 f'Content-Type: application/octet-stream\r\n\r\n').encode() + data + b'\r\n'
+    return body + f'--{BOUNDARY}--\r\n'.encode()
+
+
+def create_request(body: bytes, size: int = 100) -> Request:
+    messages = [{'type': 'http.request', 'body': body[i:i + size], 'more_body': True}
+                for i in range(0, len(body), size)]
+    messages.append({'type': 'http.request', 'body': b'', 'more_body': False})
+
+    async def receive():
+        return messages.pop(0)
+
+    headers = [(b'content-type', f'multipart/form-data; boundary={BOUNDARY}'.encode())]
+    return Request({'type': 'http', 'method': 'POST', 'headers': headers}, receive)
+
+
+class SaveFiles(Method):
+    meta = Operation(max_body_size=50000)
+
+    async def execute(self, files: upload_stream('doc', 'selfie', max_file_size=20000)):
+        result = {}
+        async for part in files:
+            result[part.name] = {'filename': part.filename, 'sha256': await part.save(HashSink())}
+        return {'files': result, 'fields': files.fields}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('size', [1, 10, 100, 100000])
+async def test_upload_stream(size: int):
+    body = create_body(('skip', 'skip.bin', b'x' * 5000), ('doc', 'doc.txt', DOC),
+                       ('name', None, b'Name'), ('selfie', 'selfie.png', b''))
+    stream = UploadStream(create_request(body, size), frozenset(('doc', 'selfie')))
+    parts = []
+    async for part in stream:
+        parts.append((part.name, part.filename, part.content_type, await part.read()))
+
+    assert parts == [('doc', 'doc.txt', 'application/octet-stream', DOC),
+                     ('selfie', 'selfie.png', 'application/octet-stream', b'')]
+    assert stream.fields == {'name': 'Name'}
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_skip_unread_part():
+    body = create_body(('doc', 'doc.txt', DOC), ('selfie', 'selfie.png', b'selfie'))
+    stream = UploadStream(create_request(body, 10))
+    doc = await stream.__anext__()
+    assert len(await doc.read_chunk()) > 0
+    selfie = await stream.__anext__()
+    assert await doc.read_chunk() == b''
+    assert await selfie.read() == b'selfie'
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_errors():
+    body = create_body(('doc', 'doc.txt', DOC))
+    with pytest.raises(PayloadTooLarge):
+        async for part in UploadStream(create_request(body), max_file_size=1000):
+            await part.read()
+
+    with pytest.raises(PayloadTooLarge):
+        async for part in UploadStream(create_request(body), max_size=1000):
+            await part.read()
+
+    with pytest.raises(ValidationError):
+        async for _ in UploadStream(create_request(body), frozenset(('selfie',)), required=True):
+            pass
+
+    with pytest.raises(DecodeError):
+        async for part in UploadStream(create_request(body[:-100])):
+            await part.read()
+
+
+@pytest.mark.asyncio
+async def test_sinks(tmp_path):
+    body = create_body(('doc', 'doc.txt', DOC), ('selfie', 'selfie.png', b'selfie'))
+    stream = UploadStream(create_request(body))
+    path = tmp_path / 'doc.txt'
+    doc = await stream.__anext__()
+    assert await doc.save(HashSink('md5', FileSink(path))) == hashlib.md5(DOC).hexdigest()
+    assert path.read_bytes() == DOC
+
+    path = tmp_path / 'selfie.png'
+    selfie = await stream.__anext__()
+
+    class FailingSink(FileSink):
+        async def write(self, data: bytes):
+            await super().write(data)
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        await selfie.save(FailingSink(path))
+    assert not path.exists()
+
+
+def test_upload_stream_endpoint():
+    app = Starlette()
+    app.add_route('/files', SaveFiles.as_endpoint(), methods=['POST'])
+    client = TestClient(app)
+    resp = client.post('/files', data={'name': 'Name'},
+                       files={'doc': ('doc.txt', DOC), 'other': ('other.txt', b'other')})
+    assert resp.status_code == 200
+    assert resp.json() == {'files': {'doc': {'filename': 'doc.txt', 'sha256': hashlib.sha256(DOC).hexdigest()}},
+                           'fields': {'name': 'Name'}}
+
+    resp = client.post('/files', files={'doc': ('doc.txt', DOC * 3)})
+    assert resp.status_code == 413
+
+    resp = client.post('/files', files={'doc': ('doc.txt', DOC), 'other': ('other.txt', DOC * 5)})
+    assert resp.status_code == 413